@@ -1,4 +1,90 @@
 import os
 
 USER_DATA = os.path.join(os.path.dirname(__file__), ".." ,"database", "users.json")
-PORT = 8000
\ No newline at end of file
+PORT = 8000
+
+# users.json.journal 을 스냅샷에 합치는 주기(초)와 기준 항목 수
+USER_COMPACT_INTERVAL = float(os.environ.get("USER_COMPACT_INTERVAL", 60))
+USER_COMPACT_THRESHOLD = int(os.environ.get("USER_COMPACT_THRESHOLD", 1000))
+# 저널 기록마다 fsync 할지 여부 (끄면 빠르지만 전원 장애 시 마지막 기록이 유실될 수 있음)
+USER_JOURNAL_FSYNC = os.environ.get("USER_JOURNAL_FSYNC", "1") == "1"
+
+# 사용자 저장소 종류: "json" (users.json + 저널), "sharded" 또는 "sqlite"
+USER_STORE = os.environ.get("USER_STORE", "json")
+USER_DB = os.environ.get("USER_DB", os.path.join(os.path.dirname(__file__), "..", "database", "users.db"))
+USER_DB_POOL_SIZE = int(os.environ.get("USER_DB_POOL_SIZE", 4))
+
+# group commit: 첫 변경 이후 이 시간(초) 동안 들어온 변경을 한 번에 기록
+USER_COMMIT_WINDOW = float(os.environ.get("USER_COMMIT_WINDOW", 0.002))
+USER_COMMIT_MAX_BATCH = int(os.environ.get("USER_COMMIT_MAX_BATCH", 512))
+
+# USER_STORE="sharded" 일 때: email 해시로 나눈 샤드 파일 디렉토리와 샤드 개수
+USER_SHARD_DIR = os.environ.get("USER_SHARD_DIR", os.path.join(os.path.dirname(__file__), "..", "database", "users"))
+USER_SHARDS = int(os.environ.get("USER_SHARDS", 16))
+
+# bulk-register / bulk-delete: 이 행 수마다 한 번씩 저장소에 flush 하고 결과를 흘려보낸다
+BULK_CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE", 1000))
+
+# 비밀번호 해시(PBKDF2-SHA256) 비용과 해싱 풀 크기 / 대기열 제한
+# (대기열 제한은 요청이 anyio 스레드풀에 들어가기 전에 적용되므로 스레드풀 토큰 수와 무관하게 동작한다)
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", 600_000))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 64))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get("PASSWORD_HASH_QUEUE_TIMEOUT", 5.0))
+
+# 로그인 세션 토큰 캐시: 최대 세션 수(LRU)와 만료 시간(초)
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", 100_000))
+SESSION_TTL = float(os.environ.get("SESSION_TTL", 3600))
+# 서버 워커끼리 세션을 나눠 쓰는 디렉토리 (빈 문자열이면 워커 메모리에만 둔다)
+SESSION_DIR = os.environ.get("SESSION_DIR", os.path.join(os.path.dirname(__file__), "..", "database", "sessions"))
+
+# 켜면 사용자 API 응답을 response_model 재검증 없이 한 번만 직렬화한다
+FAST_RESPONSES = os.environ.get("FAST_RESPONSES", "0") == "1"
+
+# GET /api/user 목록 조회의 기본/최대 페이지 크기
+USER_PAGE_SIZE = int(os.environ.get("USER_PAGE_SIZE", 50))
+USER_PAGE_MAX_SIZE = int(os.environ.get("USER_PAGE_MAX_SIZE", 500))
+
+# /static: 브라우저 캐시 유지 시간(초)과 미리 압축할 최소 파일 크기(바이트)
+STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", 3600))
+STATIC_MIN_COMPRESS_SIZE = int(os.environ.get("STATIC_MIN_COMPRESS_SIZE", 256))
+
+# 리뷰 API가 읽는 전처리 결과 디렉토리 (preprocessed_reviews_*.csv)와 기본/최대 페이지 크기
+REVIEW_DATA_DIR = os.environ.get("REVIEW_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "database"))
+REVIEW_PAGE_SIZE = int(os.environ.get("REVIEW_PAGE_SIZE", 20))
+REVIEW_PAGE_MAX_SIZE = int(os.environ.get("REVIEW_PAGE_MAX_SIZE", 500))
+# /api/reviews/search 기본 결과 개수 (top-k)
+REVIEW_SEARCH_TOP_K = int(os.environ.get("REVIEW_SEARCH_TOP_K", 10))
+# 유사 리뷰 ANN: term마다 남기는 (가중치 상위) 리뷰 수, 질의에 쓰는 (가중치 상위) term 수
+REVIEW_ANN_MAX_POSTINGS = int(os.environ.get("REVIEW_ANN_MAX_POSTINGS", 1000))
+REVIEW_ANN_QUERY_TERMS = int(os.environ.get("REVIEW_ANN_QUERY_TERMS", 32))
+# /api/reviews/export: 한 번에 인코딩해서 내보내는 행 수 (메모리 사용량은 이 크기에 비례)
+REVIEW_EXPORT_CHUNK_ROWS = int(os.environ.get("REVIEW_EXPORT_CHUNK_ROWS", 1000))
+# POST /api/reviews/ingest: 이 행 수마다 한 번씩 수집 파일에 덧붙이고 결과를 흘려보낸다
+REVIEW_INGEST_CHUNK_SIZE = int(os.environ.get("REVIEW_INGEST_CHUNK_SIZE", 500))
+# /api/reviews/trending: 키(출처 x 월)마다 남기는 인기 term 수, Count-Min sketch 크기, 남기는 최근 달 수
+TRENDING_TOP_K = int(os.environ.get("TRENDING_TOP_K", 100))
+TRENDING_SKETCH_WIDTH = int(os.environ.get("TRENDING_SKETCH_WIDTH", 8192))
+TRENDING_SKETCH_DEPTH = int(os.environ.get("TRENDING_SKETCH_DEPTH", 4))
+TRENDING_MONTHS = int(os.environ.get("TRENDING_MONTHS", 12))
+# 리뷰를 수집한 뒤 인기 term 스냅샷을 다시 저장하는 최소 간격(초). 그 사이 리뷰는 시작할 때 수집 파일에서 다시 더한다
+TRENDING_SNAPSHOT_INTERVAL = float(os.environ.get("TRENDING_SNAPSHOT_INTERVAL", 60))
+# 전처리 CSV가 바뀌었는지(새 데이터셋 버전) 확인하는 주기(초). 0이면 확인하지 않는다
+REVIEW_RELOAD_INTERVAL = float(os.environ.get("REVIEW_RELOAD_INTERVAL", 5))
+# /api/reviews 응답 캐시: 최대 항목 수와 캐시할 응답 본문의 최대 크기(바이트)
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", 1024))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRY_BYTES", 1 << 20))
+
+# 파이프라인 job: 워커 프로세스 수, 대기+실행 중 job 최대 개수, 남겨 둘 끝난 job 기록 수, job 작업 디렉토리
+PIPELINE_WORKERS = int(os.environ.get("PIPELINE_WORKERS", 1))
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", 8))
+PIPELINE_JOB_HISTORY = int(os.environ.get("PIPELINE_JOB_HISTORY", 100))
+# 결과를 rename으로 반영하므로 REVIEW_DATA_DIR와 같은 파일시스템이어야 한다
+PIPELINE_JOB_DIR = os.environ.get("PIPELINE_JOB_DIR", os.path.join(REVIEW_DATA_DIR, "jobs"))
+
+# 운영 서버(python -m app.server): 바인드 주소, 워커 프로세스 수, 종료 시 열린 연결을 기다리는 시간(초), listen backlog
+# 세션(SESSION_DIR)과 job 상태(PIPELINE_JOB_DIR)는 파일로 워커끼리 공유한다
+SERVER_HOST = os.environ.get("SERVER_HOST", "0.0.0.0")
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", os.cpu_count() or 1))
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get("SERVER_GRACEFUL_TIMEOUT", 30))
+SERVER_BACKLOG = int(os.environ.get("SERVER_BACKLOG", 2048))
@@ -1,9 +1,130 @@
+import threading
+from typing import AsyncIterator, Dict, Optional, Type
+
 from fastapi import Depends
+from starlette.types import Scope
+from app.config import USER_STORE
+from app.user.base_user_repository import BaseUserRepository
 from app.user.user_repository import UserRepository
+from app.user.sharded_user_repository import ShardedUserRepository
+from app.user.sqlite_user_repository import SqliteUserRepository
+from app.user.password_hasher import PasswordHasher, get_password_hasher
+from app.user.session_cache import SessionCache, get_session_cache
 from app.user.user_service import UserService
+from app.review.review_repository import ReviewRepository
+from app.review.review_service import ReviewService
+from app.job.job_manager import JobManager
+from app.job.pipeline import publish
+
+# app.config의 USER_STORE 값으로 저장소 구현을 고른다
+USER_REPOSITORY_CLASSES: Dict[str, Type[BaseUserRepository]] = {
+    "json": UserRepository,
+    "sharded": ShardedUserRepository,
+    "sqlite": SqliteUserRepository,
+}
+
+# 프로세스 전체에서 공유하는 저장소 (lifespan에서 한 번만 로드)
+_user_repository: Optional[BaseUserRepository] = None
+
+def init_user_repository() -> BaseUserRepository:
+    global _user_repository
+    if _user_repository is None:
+        _user_repository = USER_REPOSITORY_CLASSES[USER_STORE]()
+    return _user_repository
+
+def after_fork() -> None:
+    """
+    python -m app.server 가 데이터를 미리 올린 뒤 fork한 워커에서 lifespan보다 먼저 호출한다.
+    사용자 dict와 리뷰 열 배열/색인은 부모 것을 copy-on-write로 그대로 쓰고,
+    파일 잠금/저널/DB 커넥션처럼 프로세스끼리 나눠 쓰면 안 되는 것만 워커마다 다시 연다.
+    """
+    if _user_repository is not None:
+        _user_repository.after_fork()
+
+def close_user_repository() -> None:
+    global _user_repository
+    if _user_repository is not None:
+        _user_repository.close()
+    _user_repository = None
+
+def get_user_repository() -> BaseUserRepository:
+    # lifespan 없이 앱을 띄운 경우(예: 테스트)에도 처음 요청 때 한 번만 로드된다
+    return init_user_repository()
+
+def get_user_service(
+    repo: BaseUserRepository = Depends(get_user_repository),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+    sessions: SessionCache = Depends(get_session_cache),
+) -> UserService:
+    return UserService(repo, hasher, sessions)
+
+async def admit_password_hashing(hasher: PasswordHasher = Depends(get_password_hasher)) -> AsyncIterator[None]:
+    # 해싱하는 엔드포인트가 스레드풀에 들어가기 전에 대기열 자리를 잡는다 (가득 차면 503)
+    async with hasher.admit():
+        yield
+
+
+# 전처리된 리뷰 열 배열 캐시 (lifespan에서 한 번만 로드, 읽기 전용)
+_review_repository: Optional[ReviewRepository] = None
+
+def init_review_repository() -> ReviewRepository:
+    global _review_repository
+    if _review_repository is None:
+        _review_repository = ReviewRepository()
+    return _review_repository
+
+# publish와 reload가 같은 잠금을 쓰므로 reload가 반쯤 바뀐 CSV 묶음을 읽지 않는다
+_review_reload_lock = threading.RLock()
+
+def reload_review_repository() -> ReviewRepository:
+    """
+    파이프라인이 새 CSV를 올렸으면(데이터셋 버전이 바뀌었으면) 새 저장소를 읽어서 바꿔 끼운다.
+    읽는 동안 들어온 요청은 이전 저장소를 그대로 쓴다.
+    """
+    global _review_repository
+    repo = init_review_repository()
+    with _review_reload_lock:
+        # ingest는 파일에 덧붙인 뒤 저장소 잠금 안에서 버전을 바꾸므로, 자기가 수집한 리뷰로는 다시 읽지 않는다
+        with repo.lock:
+            stale = repo.fingerprint() != repo.version
+        if stale:
+            _review_repository = repo = ReviewRepository(repo.root)
+    return repo
+
+def get_review_repository() -> ReviewRepository:
+    return init_review_repository()
+
+def publish_review_dataset(kind: str, output_dir: str) -> str:
+    """
+    파이프라인 job 결과를 새 데이터셋 릴리스로 올리고, 저장소를 그 릴리스로 다시 읽어 새 데이터셋 버전을 돌려준다.
+    - preprocess: 새 CSV라서 역색인/집계도 다시 만들어진다.
+    - embedding: CSV는 그대로 물려받으므로 저장해 둔 역색인/집계를 그대로 쓰고 유사 리뷰 색인만 바뀐다.
+    """
+    repo = init_review_repository()
+    with _review_reload_lock:
+        publish(output_dir, repo.root)
+        return reload_review_repository().version
+
+def review_dataset_version(scope: Scope) -> str:
+    # 미들웨어는 Depends를 거치지 않으므로 dependency_overrides(테스트)를 직접 따른다
+    provider = scope["app"].dependency_overrides.get(get_review_repository, get_review_repository)
+    return provider().version
+
+def get_review_service(repo: ReviewRepository = Depends(get_review_repository)) -> ReviewService:
+    return ReviewService(repo)
+
+
+# 파이프라인 job 프로세스 풀 (처음 요청 때 만들고 lifespan 종료 시 정리)
+_job_manager: Optional[JobManager] = None
 
-def get_user_repository() -> UserRepository:
-    return UserRepository()
+def get_job_manager() -> JobManager:
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(publish_review_dataset, data_dir=init_review_repository().root)
+    return _job_manager
 
-def get_user_service(repo: UserRepository = Depends(get_user_repository)) -> UserService:
-    return UserService(repo)
+def close_job_manager() -> None:
+    global _job_manager
+    if _job_manager is not None:
+        _job_manager.shutdown()
+    _job_manager = None
@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, List, Sequence
+
+from fastapi.responses import StreamingResponse
+
+from app.ndjson import NDJSON_MEDIA_TYPE
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+GZIP_MEDIA_TYPE = "application/gzip"
+
+
+def csv_chunks(header: Sequence[str], row_chunks: Iterable[List[Sequence]]) -> Iterator[bytes]:
+    """헤더 한 줄 + 행 묶음마다 CSV 바이트 한 덩어리."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header)
+    for rows in row_chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(record_chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    """레코드 묶음마다 NDJSON 바이트 한 덩어리."""
+    for records in record_chunks:
+        yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """바이트 덩어리를 받는 대로 하나의 gzip 스트림으로 압축한다 (전체를 모으지 않는다)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더/트레일러
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def download(chunks: Iterable[bytes], filename: str, media_type: str, compress: bool = False) -> StreamingResponse:
+    """첨부 파일로 내려받는 StreamingResponse. compress면 .gz 파일로 보낸다."""
+    if compress:
+        chunks, filename, media_type = gzip_chunks(chunks), f"{filename}.gz", GZIP_MEDIA_TYPE
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def media_type_for(fmt: str) -> str:
+    return NDJSON_MEDIA_TYPE if fmt == "ndjson" else CSV_MEDIA_TYPE
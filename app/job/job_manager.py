@@ -0,0 +1,253 @@
+import json
+import multiprocessing
+import os
+import secrets
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, List, Optional, Set
+
+from app.config import PIPELINE_JOB_DIR, PIPELINE_JOB_HISTORY, PIPELINE_QUEUE_SIZE, PIPELINE_WORKERS, REVIEW_DATA_DIR
+from app.job.job_schema import Job, JobProgress
+from app.job.pipeline import CANCEL_FILE, JOB_FILE, OUTPUT_DIR, JobCancelled, read_progress, run_job
+
+TERMINAL = ("succeeded", "failed", "cancelled")
+# 이 프로세스에서 살아 있는 JobManager id. 재시작한 서버가 예전 pid를 다시 받아도 이전 실행의 job을 살아 있는 것으로 보지 않는다
+_live_managers: Set[str] = set()
+
+
+class JobQueueFull(Exception):
+    """대기 + 실행 중인 job이 PIPELINE_QUEUE_SIZE 개에 이른 경우."""
+
+
+class JobRecord:
+    __slots__ = ("id", "kind", "status", "created_at", "finished_at", "error", "version", "progress", "job_dir", "future")
+
+    def __init__(self, job_id: str, kind: str, job_dir: str) -> None:
+        self.id = job_id
+        self.kind = kind
+        self.status = "queued"
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.version: Optional[str] = None
+        self.progress: Optional[dict] = None
+        self.job_dir = job_dir
+        self.future: Optional[Future] = None
+
+
+class JobManager:
+    """
+    전처리/임베딩 파이프라인을 크기가 정해진 프로세스 풀에서 돌리는 백그라운드 job 관리자.
+
+    - submit은 job을 풀의 대기열에 넣고 바로 돌아온다. API 이벤트 루프는 실행을 기다리지 않는다.
+    - 워커는 job 디렉토리의 output/ 에만 쓰고 progress.json으로 진행 상황을 남긴다.
+    - 성공하면 완료 콜백(풀의 관리 스레드)에서 publish(kind, output_dir)를 불러 데이터셋을 한 번에 반영한다.
+    - 대기 중인 job은 바로 취소되고, 실행 중인 job은 cancel 파일을 보고 다음 단계 전에 멈춘다.
+    - 서버 워커마다 JobManager가 따로 있으므로 job 상태를 job 디렉토리의 job.json에도 남긴다.
+      다른 워커가 만든 job은 그 파일과 progress.json으로 조회하고, cancel 파일을 써서 취소한다.
+      대기열 제한도 jobs_dir의 모든 job을 센다.
+    """
+    def __init__(
+        self,
+        publish: Callable[[str, str], str],
+        data_dir: str = REVIEW_DATA_DIR,
+        jobs_dir: str = PIPELINE_JOB_DIR,
+        workers: int = PIPELINE_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        target: Callable[[str, str, str], None] = run_job,
+    ) -> None:
+        self.publish = publish
+        self.data_dir = data_dir
+        self.jobs_dir = jobs_dir
+        self.queue_size = queue_size
+        self.target = target
+        self.workers = workers
+        self.executor = self._new_executor()
+        self._jobs: "OrderedDict[str, JobRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.owner_id = secrets.token_hex(8)
+        _live_managers.add(self.owner_id)
+
+    def submit(self, kind: str) -> Job:
+        with self._lock:
+            active = sum(1 for record in self._jobs.values() if record.status not in TERMINAL)
+            active += sum(1 for job in self._foreign() if job.status not in TERMINAL)
+            if active >= self.queue_size:
+                raise JobQueueFull(f"Job queue is full ({self.queue_size} jobs queued or running).")
+            job_id = secrets.token_hex(8)
+            record = JobRecord(job_id, kind, os.path.join(self.jobs_dir, job_id))
+            os.makedirs(record.job_dir)
+            self._save(record)
+            try:
+                record.future = self.executor.submit(self.target, kind, self.data_dir, record.job_dir)
+            except BrokenProcessPool:
+                # 워커가 비정상 종료되면 풀 전체가 못 쓰게 되므로 새 풀로 바꾼다
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._new_executor()
+                record.future = self.executor.submit(self.target, kind, self.data_dir, record.job_dir)
+            self._jobs[job_id] = record
+            self._trim()
+        record.future.add_done_callback(lambda future: self._finish(record, future))
+        return self._view(record)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # 서버 프로세스는 스레드를 쓰므로 fork 대신 spawn으로 워커를 띄운다
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def get(self, job_id: str) -> Job:
+        record = self._jobs.get(job_id)
+        if record is not None:
+            return self._view(record)
+        job = self._load(job_id)
+        if job is None:
+            raise ValueError("Job not Found.")
+        return job
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            records = list(self._jobs.values())
+        jobs = [self._view(record) for record in records] + self._foreign()
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Job:
+        record = self._jobs.get(job_id)
+        if record is None:
+            # 다른 서버 워커의 job: cancel 파일만 쓴다. 그 워커의 job 프로세스가 다음 단계(대기 중이면 첫 단계) 전에 멈추고
+            # 그 워커가 결과를 반영하지 않고 취소로 기록한다
+            job = self.get(job_id)
+            if job.status not in TERMINAL:
+                open(os.path.join(self.jobs_dir, job_id, CANCEL_FILE), "w").close()
+            return job
+        if record.status in TERMINAL or record.future.cancel():
+            return self._view(record)
+        # 이미 워커에 넘어간 job은 다음 단계로 넘어가기 전에 멈추도록 표시한다
+        open(os.path.join(record.job_dir, CANCEL_FILE), "w").close()
+        if read_progress(record.job_dir) is None:
+            # 풀이 호출 대기열로 미리 넘겨서 future는 취소할 수 없지만 아직 시작 전이다.
+            # 워커는 첫 단계에서 바로 멈추고 결과도 반영하지 않으므로 지금 취소된 것으로 본다
+            record.finished_at = datetime.now()
+            record.status = "cancelled"
+            self._save(record)
+        return self._view(record)
+
+    def shutdown(self) -> None:
+        for record in list(self._jobs.values()):
+            if record.status not in TERMINAL:
+                self.cancel(record.id)
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        _live_managers.discard(self.owner_id)
+
+    def _finish(self, record: JobRecord, future: Future) -> None:
+        """풀의 관리 스레드에서 불린다. 성공한 job의 결과를 반영하고 job 디렉토리를 지운다."""
+        record.progress = read_progress(record.job_dir)
+        try:
+            future.result()
+            # 마지막 단계가 끝난 뒤에 들어온 취소 요청도 반영하지 않는다
+            if os.path.exists(os.path.join(record.job_dir, CANCEL_FILE)):
+                raise JobCancelled("Cancelled before publish.")
+            record.version = self.publish(record.kind, os.path.join(record.job_dir, OUTPUT_DIR))
+            status = "succeeded"
+        except (CancelledError, JobCancelled):
+            status = "cancelled"
+        except Exception as e:
+            status = "failed"
+            record.error = f"{type(e).__name__}: {e}"
+        # 결과는 반영했거나 버렸으므로 지우고, 다른 워커가 볼 job.json만 남긴다
+        for name in os.listdir(record.job_dir):
+            if name != JOB_FILE:
+                path = os.path.join(record.job_dir, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+        record.finished_at = datetime.now()
+        # 상태는 마지막에 바꿔서, 끝난 것으로 보이는 job은 나머지 필드도 모두 채워져 있게 한다
+        record.status = status
+        self._save(record)
+
+    def _trim(self) -> None:
+        # 끝난 job 기록은 (다른 워커의 것까지 합쳐) 최근 PIPELINE_JOB_HISTORY 개만 남긴다
+        finished = [self._view(record) for record in self._jobs.values() if record.status in TERMINAL]
+        finished += [job for job in self._foreign() if job.status in TERMINAL]
+        finished.sort(key=lambda job: job.created_at)
+        for job in finished[:max(0, len(finished) - PIPELINE_JOB_HISTORY)]:
+            self._jobs.pop(job.id, None)
+            shutil.rmtree(os.path.join(self.jobs_dir, job.id), ignore_errors=True)
+
+    def _save(self, record: JobRecord) -> None:
+        """record의 지금 상태를 job.json에 쓴다. 만든 워커(owner)가 살아 있는지도 같이 남긴다."""
+        data = self._view(record).model_dump(mode="json")
+        data["owner"] = [os.getpid(), self.owner_id]
+        path = os.path.join(record.job_dir, JOB_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        """다른 서버 워커가 만든 job을 job.json과 progress.json으로 읽는다."""
+        # job id는 URL에서 오므로 jobs_dir 밖을 가리키지 않게 한다
+        if not job_id.isalnum():
+            return None
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        try:
+            with open(os.path.join(job_dir, JOB_FILE), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        owner = data.pop("owner", None)
+        job = Job(**data)
+        if job.status in TERMINAL:
+            return job
+        if not _alive(owner):
+            return job.model_copy(update={"status": "failed", "error": "Server worker exited before the job finished."})
+        progress = read_progress(job_dir)
+        return job.model_copy(update={
+            "status": "running" if progress is not None else "queued",
+            "progress": JobProgress(**(progress or {})),
+        })
+
+    def _foreign(self) -> List[Job]:
+        """jobs_dir에 있는 다른 서버 워커(또는 이전 실행)의 job."""
+        try:
+            names = os.listdir(self.jobs_dir)
+        except FileNotFoundError:
+            return []
+        jobs = (self._load(name) for name in names if name not in self._jobs)
+        return [job for job in jobs if job is not None]
+
+    def _view(self, record: JobRecord) -> Job:
+        status = record.status
+        progress = record.progress
+        if status not in TERMINAL:
+            progress = read_progress(record.job_dir)
+            status = "running" if progress is not None else "queued"
+        return Job(
+            id=record.id,
+            kind=record.kind,
+            status=status,
+            progress=JobProgress(**(progress or {})),
+            created_at=record.created_at,
+            finished_at=record.finished_at,
+            error=record.error,
+            version=record.version,
+        )
+
+
+def _alive(owner: Optional[list]) -> bool:
+    """job.json의 owner([pid, JobManager id])가 아직 살아 있는지."""
+    if not owner:
+        return False
+    pid, owner_id = owner
+    if pid == os.getpid():
+        return owner_id in _live_managers
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
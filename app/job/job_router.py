@@ -0,0 +1,90 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Depends, status
+from app.job.job_schema import Job, JobCreate
+from app.job.job_manager import JobManager, JobQueueFull
+from app.dependencies import get_job_manager
+from app.responses.base_response import BaseResponse, respond
+
+job = APIRouter(prefix="/api/jobs")
+
+
+@job.post("", response_model=BaseResponse[Job], status_code=status.HTTP_202_ACCEPTED)
+def create_job(job_create: JobCreate, manager: JobManager = Depends(get_job_manager)) -> BaseResponse[Job]:
+    """
+    전처리(preprocess) 또는 임베딩(embedding) 실행을 백그라운드 job으로 대기열에 넣습니다.
+    실행이 끝날 때까지 기다리지 않고 바로 돌아오며, 상태는 GET /api/jobs/{job_id}로 확인합니다.
+
+    Args:
+        job_create (JobCreate): 실행할 job 종류
+        manager (JobManager): job 관리자 객체
+
+    Returns:
+        BaseResponse[Job]: 대기열에 들어간 job 반환
+
+    Raises:
+        HTTPException: 대기열이 가득 찬 경우 429 상태 코드와 오류 메시지 반환
+    """
+    try:
+        created = manager.submit(job_create.kind)
+        return respond(BaseResponse(status="success", data=created, message="Job queued."), status.HTTP_202_ACCEPTED)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+@job.get("", response_model=BaseResponse[List[Job]], status_code=status.HTTP_200_OK)
+def list_jobs(manager: JobManager = Depends(get_job_manager)) -> BaseResponse[List[Job]]:
+    """
+    최근 job 목록을 최신순으로 조회합니다.
+
+    Args:
+        manager (JobManager): job 관리자 객체
+
+    Returns:
+        BaseResponse[List[Job]]: job 목록 반환
+    """
+    return respond(BaseResponse(status="success", data=manager.list(), message="Job list success."), status.HTTP_200_OK)
+
+
+@job.get("/{job_id}", response_model=BaseResponse[Job], status_code=status.HTTP_200_OK)
+def get_job(job_id: str, manager: JobManager = Depends(get_job_manager)) -> BaseResponse[Job]:
+    """
+    job의 상태와 진행 상황(끝난 단계 수 / 전체 단계 수)을 조회합니다.
+
+    Args:
+        job_id (str): job id
+        manager (JobManager): job 관리자 객체
+
+    Returns:
+        BaseResponse[Job]: job 반환
+
+    Raises:
+        HTTPException: job이 없으면 404 상태 코드와 오류 메시지 반환
+    """
+    try:
+        found = manager.get(job_id)
+        return respond(BaseResponse(status="success", data=found, message="Job found."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@job.delete("/{job_id}", response_model=BaseResponse[Job], status_code=status.HTTP_202_ACCEPTED)
+def cancel_job(job_id: str, manager: JobManager = Depends(get_job_manager)) -> BaseResponse[Job]:
+    """
+    job을 취소합니다. 대기 중이면 바로 취소되고, 실행 중이면 다음 단계로 넘어가기 전에 멈춥니다.
+
+    Args:
+        job_id (str): job id
+        manager (JobManager): job 관리자 객체
+
+    Returns:
+        BaseResponse[Job]: 취소를 요청한 job 반환
+
+    Raises:
+        HTTPException: job이 없으면 404 상태 코드와 오류 메시지 반환
+    """
+    try:
+        cancelled = manager.cancel(job_id)
+        return respond(BaseResponse(status="success", data=cancelled, message="Job cancel requested."), status.HTTP_202_ACCEPTED)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+JobKind = Literal["preprocess", "embedding"]
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+class JobCreate(BaseModel):
+    kind: JobKind
+
+class JobProgress(BaseModel):
+    done: int = 0
+    total: int = 0
+    step: Optional[str] = None
+
+class Job(BaseModel):
+    id: str
+    kind: JobKind
+    status: JobStatus
+    progress: JobProgress
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    # 성공한 job이 반영한 데이터셋 버전
+    version: Optional[str] = None
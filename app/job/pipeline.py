@@ -0,0 +1,171 @@
+import glob
+import json
+import os
+import shutil
+import time
+from typing import Callable, Dict, Optional
+
+# 워커 프로세스와 API 프로세스는 job 디렉토리의 파일로만 주고받는다
+PROGRESS_FILE = "progress.json"
+# job을 만든 서버 워커가 남기는 job 상태. 다른 서버 워커는 이 파일로 job을 조회/취소한다
+JOB_FILE = "job.json"
+CANCEL_FILE = "cancel"
+OUTPUT_DIR = "output"
+# publish 후에 남겨 두는 데이터셋 릴리스 수 (지금 릴리스 포함)
+RELEASES_KEPT = 2
+
+
+class JobCancelled(Exception):
+    """실행 중인 job에 취소 요청이 들어온 경우."""
+
+
+class JobProgress:
+    """
+    워커 프로세스에서 단계마다 progress.json을 갱신하는 진행 상황 기록기.
+    단계를 시작할 때마다 cancel 파일을 확인해서, 있으면 JobCancelled로 멈춘다.
+    """
+    def __init__(self, job_dir: str, total: int = 0) -> None:
+        self.job_dir = job_dir
+        self.total = total
+        self.done = 0
+        self.step_name: Optional[str] = None
+
+    def step(self, name: str) -> None:
+        if self.step_name is not None:
+            self.done += 1
+        if os.path.exists(os.path.join(self.job_dir, CANCEL_FILE)):
+            raise JobCancelled(f"Cancelled before: {name}")
+        self.step_name = name
+        self._write()
+
+    def finish(self) -> None:
+        self.done = self.total
+        self.step_name = None
+        self._write()
+
+    def _write(self) -> None:
+        path = os.path.join(self.job_dir, PROGRESS_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"done": self.done, "total": self.total, "step": self.step_name}, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+
+def read_progress(job_dir: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(job_dir, PROGRESS_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_preprocess(data_dir: str, output_dir: str, progress: JobProgress) -> None:
+    """database/reviews_*.csv 를 출처별 전처리 클래스로 처리해서 output_dir에 쓴다 (preprocessing/main.py --all 과 같은 결과)."""
+    from review_analysis.preprocessing.main import PREPROCESS_CLASSES
+
+    sources = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "reviews_*.csv"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in PREPROCESS_CLASSES:
+            sources.append((name, path))
+    progress.total = 3 * len(sources)
+    for name, path in sources:
+        processor = PREPROCESS_CLASSES[name](path, output_dir)
+        progress.step(f"{name}: preprocess")
+        processor.preprocess()
+        progress.step(f"{name}: feature_engineering")
+        processor.feature_engineering()
+        progress.step(f"{name}: save")
+        processor.save_to_database()
+    # 전처리 클래스들은 오류를 로그만 남기고 넘어가므로 결과 파일로 성공 여부를 판단한다
+    if not glob.glob(os.path.join(output_dir, "preprocessed_reviews_*.csv")):
+        raise RuntimeError("Preprocessing produced no preprocessed_reviews_*.csv.")
+
+
+def run_embedding(data_dir: str, output_dir: str, progress: JobProgress) -> None:
+    """지금 올라가 있는 전처리 CSV로 유사 리뷰 TF-IDF/ANN 색인을 만들어 output_dir에 쓴다."""
+    from app.config import REVIEW_ANN_MAX_POSTINGS
+    from app.review.review_repository import REVIEW_ANN_DIR, ReviewRepository
+    from utils.ann_index import SparseANNIndex
+
+    progress.total = 2
+    progress.step("load reviews")
+    repo = ReviewRepository(data_dir)
+    progress.step("fit index")
+    # 저장하는 색인은 전처리 CSV 행만 담는다 (수집한 리뷰는 색인을 열 때 고정된 어휘로 변환해서 붙인다)
+    index = SparseANNIndex.fit(repo.content[:repo.base_size], max_postings=REVIEW_ANN_MAX_POSTINGS,
+                               fingerprint=repo.base_version)
+    index.save(os.path.join(output_dir, REVIEW_ANN_DIR))
+
+
+RUNNERS: Dict[str, Callable[[str, str, JobProgress], None]] = {
+    "preprocess": run_preprocess,
+    "embedding": run_embedding,
+}
+
+
+def run_job(kind: str, data_dir: str, job_dir: str) -> None:
+    """워커 프로세스의 진입점. 결과는 job_dir/output 에만 쓰고, 데이터셋 반영(publish)은 API 프로세스가 한다."""
+    output_dir = os.path.join(job_dir, OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    progress = JobProgress(job_dir)
+    RUNNERS[kind](data_dir, output_dir, progress)
+    progress.finish()
+
+
+def _link_tree(source: str, target: str, copy: bool = False) -> None:
+    """
+    source를 target으로 하드링크해서 물려준다 (다른 파일시스템이거나 copy면 복사).
+    릴리스 안의 파일은 모두 임시 파일 + os.replace로 쓰므로 릴리스끼리는 공유해도 된다.
+    """
+    def link(src: str, dst: str) -> None:
+        if not copy:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+        shutil.copy2(src, dst)
+
+    if os.path.isdir(source):
+        shutil.copytree(source, target, copy_function=link)
+    else:
+        link(source, target)
+
+
+def publish(output_dir: str, data_dir: str, keep: int = RELEASES_KEPT) -> str:
+    """
+    job 결과를 새 데이터셋 릴리스(data_dir/releases/<이름>)로 만들고 포인터 파일(data_dir/CURRENT) 하나를
+    os.replace로 바꿔서 한 번에 반영한다. 새 릴리스는 지금 릴리스의 파일을 하드링크로 물려받고
+    (첫 릴리스가 data_dir 바로 아래 파일을 물려받을 때는 복사) output_dir의 파일/디렉토리로 덮어쓴다. 읽는 쪽은 포인터를 한 번 읽고 그 디렉토리만 보므로
+    CSV 일부만 바뀐 데이터셋을 볼 수 없다. 지금/직전 릴리스를 포함해 keep 개만 남기고 지운다. 새 릴리스 디렉토리를 돌려준다.
+    """
+    from app.review.review_repository import REVIEW_CURRENT_FILE, REVIEW_RELEASES_DIR, dataset_directory, is_dataset_file
+
+    releases = os.path.join(data_dir, REVIEW_RELEASES_DIR)
+    os.makedirs(releases, exist_ok=True)
+    current = dataset_directory(data_dir)
+    # 이름 순서가 만든 순서가 되도록 한다
+    name = f"{time.time_ns():020d}"
+    building = os.path.join(releases, f"{name}.tmp")
+    os.makedirs(building)
+    outputs = set(os.listdir(output_dir))
+    # 릴리스 밖의 파일은 다른 도구가 그 자리에서 다시 쓸 수 있어서 (to_csv는 같은 inode를 잘라 쓴다) 링크하면 릴리스가 같이 바뀐다
+    copy = current == data_dir
+    for entry in sorted(os.listdir(current)):
+        if is_dataset_file(entry) and entry not in outputs:
+            _link_tree(os.path.join(current, entry), os.path.join(building, entry), copy=copy)
+    for entry in sorted(outputs):
+        os.replace(os.path.join(output_dir, entry), os.path.join(building, entry))
+    release = os.path.join(releases, name)
+    os.rename(building, release)
+
+    pointer = os.path.join(data_dir, REVIEW_CURRENT_FILE)
+    with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+        f.write(name)
+    os.replace(f"{pointer}.tmp", pointer)
+
+    # 다른 워커가 아직 직전 릴리스를 읽고 있을 수 있으므로 최근 keep 개는 남긴다
+    for old in sorted(entry for entry in os.listdir(releases) if not entry.endswith(".tmp"))[:-keep]:
+        if old != name:
+            shutil.rmtree(os.path.join(releases, old), ignore_errors=True)
+    return release
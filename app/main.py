@@ -1,16 +1,84 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 import os
 
 from app.user.user_router import user
-from app.config import PORT
+from app.review.review_router import review
+from app.job.job_router import job
+from app.config import PORT, REVIEW_RELOAD_INTERVAL, USER_COMPACT_INTERVAL
+from app.dependencies import (
+    init_user_repository, close_user_repository, init_review_repository, reload_review_repository, review_dataset_version,
+    close_job_manager,
+)
+from app.metrics import MetricsMiddleware, metrics
+from app.response_cache import ResponseCacheMiddleware
+from app.static_files import PrecompressedStaticFiles
+from app.user.password_hasher import PasswordHasherBusy
+from app.user.session_cache import get_session_cache
+
+
+async def compact_periodically(repo) -> None:
+    # 저널이 일정 크기 이상 쌓이면 백그라운드에서 스냅샷에 합치고, 만료된 세션 파일도 같이 지운다
+    while True:
+        await asyncio.sleep(USER_COMPACT_INTERVAL)
+        await run_in_threadpool(repo.compact_if_needed)
+        await run_in_threadpool(get_session_cache().prune)
+
+
+async def reload_reviews_periodically() -> None:
+    # 전처리(job 또는 preprocessing/main.py)가 새 릴리스를 올리면 서버 재시작 없이 새 데이터셋으로 바꾼다
+    # (응답 캐시도 버전이 바뀌어 비워진다)
+    while True:
+        await asyncio.sleep(REVIEW_RELOAD_INTERVAL)
+        await run_in_threadpool(reload_review_repository)
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # users.json은 요청마다 읽지 않고 서버 시작 시 한 번만 메모리에 올린다
+    repo = init_user_repository()
+    # 리뷰 CSV도 시작할 때 한 번만 열 배열로 올려 둔다
+    init_review_repository()
+    tasks = [asyncio.create_task(compact_periodically(repo))]
+    if REVIEW_RELOAD_INTERVAL > 0:
+        tasks.append(asyncio.create_task(reload_reviews_periodically()))
+    yield
+    for task in tasks:
+        task.cancel()
+    # 실행 중인 파이프라인 job은 취소하고 워커 프로세스가 끝나기를 기다린다
+    await run_in_threadpool(close_job_manager)
+    close_user_repository()
+
+
+app = FastAPI(lifespan=lifespan)
+# 리뷰 응답은 데이터셋 버전이 바뀔 때만 달라지므로 버전별로 캐시하고 ETag/304로 재검증한다
+app.add_middleware(ResponseCacheMiddleware, version=review_dataset_version, prefix="/api/reviews")
+app.add_middleware(MetricsMiddleware)
 static_path = os.path.join(os.path.dirname(__file__), "static")
-app.mount("/static", StaticFiles(directory=static_path), name="static")
+# 정적 파일은 시작할 때 미리 압축해 메모리에 올려 두고 ETag/304로 재검증한다
+app.mount("/static", PrecompressedStaticFiles(directory=static_path), name="static")
 
 app.include_router(user)
+app.include_router(review)
+app.include_router(job)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics() -> str:
+    # Prometheus text format: 라우트/상태별 지연시간 히스토그램 + 저장소 I/O 타이밍
+    return metrics.render()
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+    # 해싱 풀이 포화 상태면 잠시 후 다시 시도하도록 503을 돌려준다
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": str(exc)})
 
 if __name__=="__main__":
+    # 개발용 (자동 reload). 운영 서버는 python -m app.server
     uvicorn.run("main:app", host="0.0.0.0", port=PORT, reload=True)
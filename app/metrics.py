@@ -0,0 +1,126 @@
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 요청/저장소 지연시간 버킷(초)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """
+    버킷 배열을 미리 할당해 두고 observe 때는 정수 하나만 올리는 히스토그램.
+
+    락을 잡지 않는다. GIL 아래에서 여러 스레드가 동시에 같은 칸을 올리면 드물게 한 번이
+    빠질 수 있지만, 모니터링 용도로는 그 정도 오차를 감수하고 요청 경로를 가볍게 유지한다.
+    """
+    __slots__ = ("buckets", "counts", "total", "bytes")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.total = 0.0
+        self.bytes = 0
+
+    def observe(self, seconds: float, nbytes: int = 0) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.bytes += nbytes
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        # (method, route, status) -> Histogram
+        self.requests: Dict[Tuple[str, str, int], Histogram] = {}
+        # (store, operation) -> Histogram  (operation: load / lookup / flush)
+        self.repository: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, status)
+        histogram = self.requests.get(key)
+        if histogram is None:
+            histogram = self.requests.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    def observe_repository(self, store: str, operation: str, seconds: float, nbytes: int = 0) -> None:
+        key = (store, operation)
+        histogram = self.repository.get(key)
+        if histogram is None:
+            histogram = self.repository.setdefault(key, Histogram())
+        histogram.observe(seconds, nbytes)
+
+    def render(self) -> str:
+        """Prometheus text exposition format으로 출력한다."""
+        lines = [
+            "# HELP http_request_duration_seconds HTTP request latency by route and status.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in sorted(self.requests.items()):
+            labels = f'method="{method}",route="{route}",status="{status}"'
+            lines.extend(_histogram_lines("http_request_duration_seconds", labels, histogram))
+
+        lines += [
+            "# HELP user_repository_duration_seconds User repository load/lookup/flush latency.",
+            "# TYPE user_repository_duration_seconds histogram",
+        ]
+        for (store, operation), histogram in sorted(self.repository.items()):
+            labels = f'store="{store}",operation="{operation}"'
+            lines.extend(_histogram_lines("user_repository_duration_seconds", labels, histogram))
+
+        lines += [
+            "# HELP user_repository_bytes_total Bytes read or written by the user repository.",
+            "# TYPE user_repository_bytes_total counter",
+        ]
+        for (store, operation), histogram in sorted(self.repository.items()):
+            if histogram.bytes:
+                lines.append(f'user_repository_bytes_total{{store="{store}",operation="{operation}"}} {histogram.bytes}')
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+    cumulative += histogram.counts[-1]
+    yield f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}'
+    yield f"{name}_sum{{{labels}}} {histogram.total}"
+    yield f"{name}_count{{{labels}}} {cumulative}"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """라우트(경로 템플릿)와 상태 코드별로 요청 지연시간을 기록하는 ASGI 미들웨어."""
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 라우팅이 끝나면 scope에 매칭된 route(또는 mount의 root_path)가 남는다
+            route = scope.get("route")
+            label = route.path if route is not None else (scope.get("root_path") or "unmatched")
+            metrics.observe_request(scope["method"], label, status, time.perf_counter() - start)
@@ -0,0 +1,41 @@
+from typing import AsyncIterator, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽으면서 동시에 응답을 흘려보내는 StreamingResponse.
+
+    기본 StreamingResponse는 연결 종료를 감지하려고 receive()를 따로 기다리는데,
+    그러면 아직 읽지 않은 요청 본문 메시지를 가로채 버린다. 여기서는 본문 iterator가
+    request.stream()으로 직접 receive()를 소비하므로 그 리스너를 띄우지 않는다.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    요청 본문을 받는 대로 한 줄씩 (줄 번호, 내용)으로 돌려준다.
+    본문 전체를 메모리에 올리지 않으며, 빈 줄은 건너뛴다.
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
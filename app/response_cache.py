@@ -0,0 +1,164 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import RESPONSE_CACHE_MAX_ENTRY_BYTES, RESPONSE_CACHE_SIZE
+from app.static_files import etag_matches
+
+# 캐시된 응답도 매번 재검증하게 해서 새 데이터셋 버전이 바로 보이도록 한다 (대신 304로 싸게 끝난다)
+CACHE_CONTROL = "no-cache"
+
+
+class CachedResponse:
+    __slots__ = ("status", "headers", "body", "etag", "route")
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, etag: str, route: Any) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.route = route
+
+
+class ResponseCache:
+    """
+    (경로, 정규화한 query string) -> 응답 본문 LRU 캐시. 모든 항목은 하나의 데이터셋 버전에 속한다.
+
+    - 크기 제한(max_size)을 넘으면 가장 오래 쓰지 않은 항목부터 버린다.
+    - 다른 버전으로 조회/저장하면 (= 새 데이터셋이 올라오면) 이전 버전의 항목을 모두 비운다.
+    """
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.version: Optional[str] = None
+        self._entries: "OrderedDict[Tuple[str, str], CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _switch(self, version: str) -> None:
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def get(self, version: str, key: Tuple[str, str]) -> Optional[CachedResponse]:
+        with self._lock:
+            self._switch(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, version: str, key: Tuple[str, str], entry: CachedResponse) -> None:
+        with self._lock:
+            self._switch(version)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.version = None
+
+
+_response_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def cache_key(scope: Scope) -> Tuple[str, str]:
+    # 같은 파라미터를 다른 순서로 보내도 같은 항목을 쓰도록 정렬한다
+    query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+    return scope["path"], urlencode(query)
+
+
+def make_etag(version: str, body: bytes) -> str:
+    return f'"{version[:12]}-{hashlib.sha1(body).hexdigest()[:16]}"'
+
+
+class ResponseCacheMiddleware:
+    """
+    prefix 아래 GET 요청의 200 응답을 데이터셋 버전별로 캐시하는 ASGI 미들웨어.
+
+    - 응답마다 (버전 + 본문 해시) ETag와 Cache-Control: no-cache를 붙이고, If-None-Match가 맞으면 304를 돌려준다.
+    - 캐시 적중이면 앱을 부르지 않고 저장된 본문(또는 304)을 바로 보낸다.
+    - Content-Length가 없는 스트리밍 응답(내보내기 등)과 max_entry_bytes보다 큰 응답은 그대로 흘려보낸다.
+    - version()은 요청마다 불리므로 가벼워야 한다.
+    """
+    def __init__(self, app: ASGIApp, version: Callable[[Scope], str], prefix: str, cache: Optional[ResponseCache] = None,
+                 max_entry_bytes: int = RESPONSE_CACHE_MAX_ENTRY_BYTES) -> None:
+        self.app = app
+        self.version = version
+        self.prefix = prefix
+        self.cache = cache if cache is not None else get_response_cache()
+        self.max_entry_bytes = max_entry_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        version = self.version(scope)
+        key = cache_key(scope)
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        entry = self.cache.get(version, key)
+        if entry is not None:
+            # 메트릭이 앱을 거친 요청과 같은 route로 집계되도록 한다
+            scope["route"] = entry.route
+            await self._send_entry(scope, send, entry, if_none_match)
+            return
+        if scope["method"] == "HEAD":
+            # HEAD 응답은 본문이 비어 있어 ETag를 만들 수 없으므로 캐시하지 않는다
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                length = Headers(raw=message["headers"]).get("content-length")
+                if message["status"] != 200 or length is None or int(length) > self.max_entry_bytes:
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=list(start["headers"]))
+            etag = make_etag(version, body)
+            headers["ETag"] = etag
+            headers["Cache-Control"] = CACHE_CONTROL
+            entry = CachedResponse(200, headers.raw, body, etag, scope.get("route"))
+            self.cache.put(version, key, entry)
+            await self._send_entry(scope, send, entry, if_none_match)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_entry(self, scope: Scope, send: Send, entry: CachedResponse, if_none_match: Optional[str]) -> None:
+        if if_none_match is not None and etag_matches(if_none_match, entry.etag):
+            headers = [(b"etag", entry.etag.encode("latin-1")), (b"cache-control", CACHE_CONTROL.encode("latin-1"))]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry.status, "headers": entry.headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else entry.body})
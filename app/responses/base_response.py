@@ -1,5 +1,8 @@
+from fastapi import Response
 from pydantic import BaseModel, Field
-from typing import TypeVar, Generic, Optional
+from typing import TypeVar, Generic, Optional, Union
+
+from app.config import FAST_RESPONSES
 
 T = TypeVar("T")
 
@@ -7,3 +10,25 @@ class BaseResponse(BaseModel, Generic[T]):
     status: str = Field("success", description="응답 상태 ('success' or 'failure')")
     data: Optional[T] = Field(None, description="응답 데이터")
     message: Optional[str] = Field(None, description="추가 메시지")
+
+
+class FastJSONResponse(Response):
+    """이미 검증된 pydantic 모델을 pydantic-core의 JSON 직렬화로 한 번만 직렬화하는 응답."""
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode("utf-8")
+
+
+def respond(body: BaseModel, status_code: int, response: Optional[Response] = None) -> Union[BaseModel, Response]:
+    """
+    FAST_RESPONSES가 켜져 있으면 Response를 직접 돌려줘서 FastAPI의 response_model
+    재검증/재직렬화를 건너뛴다. 꺼져 있으면 모델을 그대로 돌려준다 (기존 경로).
+    response 파라미터에 붙인 헤더는 직접 돌려주는 Response로 옮겨 준다.
+    """
+    if not FAST_RESPONSES:
+        return body
+    fast = FastJSONResponse(body, status_code=status_code)
+    if response is not None:
+        fast.headers.update(response.headers)
+    return fast
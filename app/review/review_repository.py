@@ -0,0 +1,542 @@
+import glob
+import hashlib
+import os
+import threading
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from app.review.review_schema import Review, ReviewFilter, ReviewIngest
+from app.review.review_stats import ALL_SOURCES, WEEKDAYS, ReviewStats
+from app.review.review_trending import TrendingTerms
+from app.config import REVIEW_DATA_DIR, REVIEW_ANN_MAX_POSTINGS, REVIEW_ANN_QUERY_TERMS, TRENDING_SNAPSHOT_INTERVAL
+from utils.ann_index import SparseANNIndex
+from utils.inverted_index import InvertedIndex
+from review_analysis.preprocessing.base_processor import clean_kakao_text, clean_text
+
+try:
+    import fcntl
+except ImportError:  # Windows: advisory lock 없이 단일 워커로만 사용
+    fcntl = None  # type: ignore
+
+REVIEW_FILE_PREFIX = "preprocessed_reviews_"
+# 전처리 CSV 옆에 저장하는 content 역색인
+REVIEW_INDEX_FILE = "reviews_inverted_index.npz"
+# 유사 리뷰 ANN 색인 디렉토리 (python -m app.review.review_repository 로 오프라인 빌드)
+REVIEW_ANN_DIR = "reviews_ann"
+# 출처별/전체 집계 테이블
+REVIEW_STATS_FILE = "review_stats.json"
+# 출처별/월별 인기 term (Count-Min sketch + top-k) 스냅샷
+REVIEW_TRENDING_FILE = "review_trending.npz"
+# 온라인으로 수집한 리뷰 (append-only). 전처리 CSV와 따로 두어서 저장해 둔 색인/집계의 버전을 바꾸지 않는다
+REVIEW_INGEST_FILE = "ingested_reviews.csv"
+# 파이프라인이 올린 데이터셋 릴리스 디렉토리들과, 지금 쓰는 릴리스 이름을 담은 포인터 파일.
+# 전처리 CSV와 거기서 만든 색인/집계는 릴리스 안에 두고, 수집 파일과 원본 CSV는 REVIEW_DATA_DIR 바로 아래에 둔다
+REVIEW_RELEASES_DIR = "releases"
+REVIEW_CURRENT_FILE = "CURRENT"
+INGEST_FIELDS = ("source", "rating", "date", "content", "content_length", "is_positive", "month", "weekday")
+SORT_COLUMNS = ("date", "rating")
+COLUMNS = ("source", "rating", "date", "month", "weekday", "content_length", "is_positive", "ids")
+# 출처별 전처리 클래스와 같은 텍스트 정제 규칙 (없는 출처는 clean_text)
+TEXT_CLEANERS: Dict[str, Callable[[str], str]] = {"kakao": clean_kakao_text}
+
+
+def dataset_directory(root: str) -> str:
+    """root의 포인터 파일이 가리키는 릴리스 디렉토리. 아직 릴리스를 올린 적이 없으면 root 자체."""
+    try:
+        with open(os.path.join(root, REVIEW_CURRENT_FILE), encoding="utf-8") as f:
+            return os.path.join(root, REVIEW_RELEASES_DIR, f.read().strip())
+    except FileNotFoundError:
+        return root
+
+
+def is_dataset_file(name: str) -> bool:
+    """릴리스에 담기는 파일/디렉토리 이름인지 (전처리 CSV와 거기서 만든 색인/집계)."""
+    if name.endswith(".tmp"):
+        return False
+    return (name.startswith(REVIEW_FILE_PREFIX) and name.endswith(".csv")) or name in (
+        REVIEW_INDEX_FILE, REVIEW_ANN_DIR, REVIEW_STATS_FILE, REVIEW_TRENDING_FILE,
+    )
+
+
+def _extend(buffer: np.ndarray, size: int, values: np.ndarray) -> np.ndarray:
+    """buffer[:size] 뒤에 values를 쓴다. 자리가 모자라면 두 배 크기의 새 버퍼로 옮긴다 (행마다 분할 상환 O(1))."""
+    needed = size + len(values)
+    if needed > len(buffer):
+        grown = np.empty(max(needed, 2 * len(buffer)), dtype=buffer.dtype)
+        grown[:size] = buffer[:size]
+        buffer = grown
+    buffer[size:needed] = values
+    return buffer
+
+
+class ReviewIndexNotBuilt(Exception):
+    """유사 리뷰 색인이 없거나 지금 CSV와 맞지 않는 경우."""
+
+
+class ReviewRepository:
+    """
+    database/preprocessed_reviews_*.csv 를 서버 시작 시 한 번 읽어 열(column) 배열로 들고 있는 읽기 전용 저장소.
+
+    - 리뷰 id는 (출처 이름 순으로 이어 붙인) 행 위치다.
+    - source / month / weekday 는 값마다 bool 비트맵을 미리 만들어 두고 AND로 거른다.
+    - rating / date 는 정렬 순서(argsort)와 정렬된 값을 미리 만들어 두고,
+      범위 필터는 searchsorted로 구간을 찾아 비트맵으로 바꾼다.
+    - 요청 처리 중에는 CSV를 다시 읽지 않는다.
+    - content 역색인은 reviews_inverted_index.npz 로 저장해 두고, CSV가 바뀌었을 때만 다시 만든다.
+    - 유사 리뷰 ANN 색인(reviews_ann/)은 오프라인으로 만들어 두고 memmap으로 연다.
+    - 출처별 집계(review_stats.json)는 전처리가 끝날 때 만들어지고, CSV가 바뀌었을 때만 열 배열에서 다시 만든다.
+    - ingest()로 들어온 리뷰는 ingested_reviews.csv 에 덧붙이고 열 배열/역색인/집계/ANN 색인에 그 행들만 더한다.
+      저장해 둔 색인/집계는 전처리 CSV 행만 담고, 시작할 때 ingested_reviews.csv 를 다시 더한다.
+    - 인기 term 표(review_trending.npz)는 스냅샷이 담은 행 수(rows)를 기억해서, 시작할 때 그 뒤의 행만 더한다.
+    - 파이프라인이 데이터셋을 올렸으면 root/CURRENT가 가리키는 릴리스 디렉토리(directory)를 읽는다.
+      포인터는 시작할 때 한 번만 읽으므로 읽는 도중 새 릴리스가 올라가도 두 릴리스의 CSV가 섞이지 않는다.
+    """
+    def __init__(self, directory: str = REVIEW_DATA_DIR) -> None:
+        self.root = directory
+        self.directory = dataset_directory(directory)
+        self.sources: List[str] = []
+        self.paths = sorted(glob.glob(os.path.join(self.directory, f"{REVIEW_FILE_PREFIX}*.csv")))
+        self.ingest_path = os.path.join(directory, REVIEW_INGEST_FILE)
+        # ingest와 정렬 순서 합치기를 조회와 겹치지 않게 한다
+        self.lock = threading.RLock()
+        # 읽기 전에 찍어 둔 버전들. 저장해 두는 색인/집계는 전처리 CSV만의 base_version에,
+        # 응답 캐시는 수집한 리뷰까지 포함한 version에 묶인다
+        self.base_version = self.fingerprint(self.paths)
+        self.version = self.fingerprint()
+        frames = []
+        for path in self.paths:
+            source = os.path.basename(path)[len(REVIEW_FILE_PREFIX):-len(".csv")]
+            frame = pd.read_csv(path, encoding="utf-8-sig")
+            frame["source"] = len(self.sources)
+            self.sources.append(source)
+            frames.append(frame)
+        self._build(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame())
+        self.base_size = len(self)
+        self.index = self._load_index()
+        self.ann = self._load_ann()
+        self.stats = self._load_stats()
+        self.trending: Optional[TrendingTerms] = None
+        self._replay()
+        self.trending = self._load_trending()
+
+    def _build(self, df: pd.DataFrame) -> None:
+        # 출처마다 있는 열이 달라서(google: month/weekday 없음, tripdotcom: is_positive 없음)
+        # 공통 열만 쓰고 나머지는 전처리와 같은 규칙으로 다시 만든다
+        n = len(df)
+        if n:
+            df = df.dropna(subset=["rating", "date"]).reset_index(drop=True)
+            n = len(df)
+        dates = pd.to_datetime(df["date"]) if n else pd.Series([], dtype="datetime64[ns]")
+
+        self.source = df["source"].to_numpy(np.int8) if n else np.zeros(0, np.int8)
+        self.rating = df["rating"].to_numpy(np.float32) if n else np.zeros(0, np.float32)
+        self.date = dates.to_numpy().astype("datetime64[D]")
+        self.month = dates.dt.month.to_numpy(np.int8)
+        self.weekday = dates.dt.weekday.to_numpy(np.int8)
+        self.content: List[str] = df["content"].fillna("").astype(str).tolist() if n else []
+        self.content_length = np.fromiter((len(text) for text in self.content), np.int32, n)
+        self.is_positive = self.rating >= 4
+        self.ids = np.arange(n, dtype=np.int64)
+
+        self._bitmaps: Dict[str, List[np.ndarray]] = {
+            "source": [self.source == i for i in range(len(self.sources))],
+            "month": [self.month == m for m in range(13)],
+            "weekday": [self.weekday == d for d in range(7)],
+        }
+        # append 할 때 채워 넣는 여유 공간 있는 버퍼. 열 배열/비트맵은 이 버퍼의 앞부분 view다
+        self._buffers: Dict[str, np.ndarray] = {name: getattr(self, name) for name in COLUMNS}
+        self._bitmap_buffers: Dict[str, List[np.ndarray]] = {name: list(maps) for name, maps in self._bitmaps.items()}
+        # 정렬 순서에 아직 끼워 넣지 않은 수집 행 id
+        self._pending: List[int] = []
+        self._orders: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        for column in SORT_COLUMNS:
+            values = getattr(self, column)
+            keys = values.astype(np.int64) if column == "date" else values
+            # 같은 값끼리는 id 순서로 고정한다
+            self._orders[column] = np.lexsort((self.ids, keys))
+            self._orders[f"-{column}"] = np.lexsort((self.ids, -keys))
+            self._sorted[column] = values[self._orders[column]]
+
+    def _append_rows(self, sources: np.ndarray, ratings: np.ndarray, dates: pd.DatetimeIndex, content: List[str]) -> np.ndarray:
+        """열 배열/비트맵 끝에 행을 붙이고 새 id들을 돌려준다. 정렬 순서는 다음 정렬 조회 때 합친다."""
+        size, n = len(self), len(content)
+        rows = np.arange(size, size + n, dtype=np.int64)
+        values = {
+            "source": sources,
+            "rating": ratings,
+            "date": dates.to_numpy().astype("datetime64[D]"),
+            "month": dates.month.to_numpy(np.int8),
+            "weekday": dates.weekday.to_numpy(np.int8),
+            "content_length": np.fromiter((len(text) for text in content), np.int32, n),
+            "is_positive": ratings >= 4,
+            "ids": rows,
+        }
+        for name, column in (("source", sources), ("month", values["month"]), ("weekday", values["weekday"])):
+            buffers = self._bitmap_buffers[name]
+            for i, buffer in enumerate(buffers):
+                buffers[i] = _extend(buffer, size, column == i)
+        for name in COLUMNS:
+            self._buffers[name] = _extend(self._buffers[name], size, values[name])
+        self.content.extend(content)
+        self._bitmaps = {name: [buffer[:size + n] for buffer in buffers] for name, buffers in self._bitmap_buffers.items()}
+        # ids를 마지막에 바꿔서 len(self)가 늘어났으면 다른 열도 모두 늘어나 있게 한다
+        for name in COLUMNS:
+            setattr(self, name, self._buffers[name][:size + n])
+        self._pending.extend(rows.tolist())
+        return rows
+
+    def _sort_pending(self) -> None:
+        """수집한 행들을 정렬 순서에 끼워 넣는다. ingest 때가 아니라 다음 정렬 조회 때 한 번 한다."""
+        if not self._pending:
+            return
+        rows = np.array(self._pending, dtype=np.int64)
+        self._pending = []
+        for column in SORT_COLUMNS:
+            values = getattr(self, column)
+            keys = values.astype(np.int64) if column == "date" else values
+            for name, sign in ((column, 1), (f"-{column}", -1)):
+                order = self._orders[name]
+                new = rows[np.argsort(sign * keys[rows], kind="stable")]
+                # 새 행의 id가 가장 크므로 같은 값끼리는 기존 행 뒤에 온다
+                at = np.searchsorted(sign * keys[order], sign * keys[new], side="right")
+                self._orders[name] = np.insert(order, at, new)
+            self._sorted[column] = values[self._orders[column]]
+
+    def _append(self, sources: np.ndarray, ratings: np.ndarray, dates: pd.DatetimeIndex, content: List[str]) -> np.ndarray:
+        """새 리뷰들을 열 배열, 역색인, 집계, ANN 색인에 더한다. 비용은 추가하는 행 수에만 비례한다."""
+        rows = self._append_rows(sources, ratings, dates, content)
+        self.index.add(content)
+        for i in np.unique(sources).tolist():
+            selected = rows[sources == i]
+            self.stats.add(self.sources[i], self.rating[selected], self.month[selected], self.weekday[selected],
+                           self.content_length[selected])
+        if self.ann is not None:
+            for text in content:
+                self.ann.append(*self.ann.transform(text))
+        if self.trending is not None:
+            self.trending.add(*self._trending_rows(rows))
+        return rows
+
+    def _trending_rows(self, rows: np.ndarray) -> Tuple[List[str], List[str], List[str]]:
+        """TrendingTerms.add에 넘길 (출처, "YYYY-MM", 본문) 목록."""
+        return (
+            [self.sources[source] for source in self.source[rows].tolist()],
+            np.datetime_as_string(self.date[rows], unit="M").tolist(),
+            [self.content[row] for row in rows.tolist()],
+        )
+
+    def _replay(self) -> None:
+        """ingested_reviews.csv 의 행들을 (전처리 CSV 행 뒤에) 다시 더한다."""
+        if not os.path.exists(self.ingest_path) or os.path.getsize(self.ingest_path) == 0:
+            return
+        # content가 "NA" 같은 글자여도 결측치로 읽지 않도록 한다
+        df = pd.read_csv(self.ingest_path, encoding="utf-8", keep_default_na=False)
+        # 전처리 CSV가 없어진 출처의 행은 건너뛴다
+        df = df[df["source"].isin(self.sources)]
+        if len(df):
+            sources = np.array([self.sources.index(source) for source in df["source"]], dtype=np.int8)
+            self._append(sources, df["rating"].to_numpy(np.float32), pd.DatetimeIndex(pd.to_datetime(df["date"])),
+                         df["content"].astype(str).tolist())
+
+    def ingest(self, reviews: List[ReviewIngest]) -> List[int]:
+        """
+        새 리뷰들을 전처리 클래스와 같은 규칙으로 정제하고 파생 변수를 만들어
+        ingested_reviews.csv 에 덧붙인 뒤 메모리의 열 배열/색인/집계에 더한다. 새 id들을 돌려준다.
+        알 수 없는 출처면 ValueError, 고정된 TF-IDF 어휘(ANN 색인)가 없으면 ReviewIndexNotBuilt.
+        """
+        with self.lock:
+            self.require_ann()
+            for review in reviews:
+                if review.source not in self.sources:
+                    raise ValueError(f"Unknown Source: {review.source}")
+            dates = pd.DatetimeIndex([pd.Timestamp(review.date) for review in reviews])
+            content = [TEXT_CLEANERS.get(review.source, clean_text)(review.content) for review in reviews]
+            ratings = np.array([review.rating for review in reviews], dtype=np.float32)
+            frame = pd.DataFrame({
+                "source": [review.source for review in reviews],
+                "rating": ratings,
+                "date": dates.strftime("%Y-%m-%d"),
+                "content": content,
+                "content_length": [len(text) for text in content],
+                "is_positive": (ratings >= 4).astype(int),
+                "month": dates.month,
+                "weekday": dates.day_name(),
+            }, columns=INGEST_FIELDS)
+            sources = np.array([self.sources.index(review.source) for review in reviews], dtype=np.int8)
+            with self._ingest_file_lock() as f:
+                # 다른 워커가 먼저 덧붙인 행은 이 프로세스 메모리에 없다. 그때는 버전을 새로 찍지 않아서
+                # reload가 파일 전체를 다시 읽게 한다
+                current = self.fingerprint() == self.version
+                # 파일에 먼저 남긴다. 서버가 다시 시작하면 이 파일로 메모리 상태를 되살린다
+                f.write(frame.to_csv(header=os.fstat(f.fileno()).st_size == 0, index=False).encode("utf-8"))
+                f.flush()
+                rows = self._append(sources, ratings, dates, content)
+                # 파일이 바뀐 만큼 버전도 바꿔서 응답 캐시는 비우고, reload는 다시 읽지 않게 한다
+                if current:
+                    self.version = self.fingerprint()
+            if time.monotonic() - self._trending_saved >= TRENDING_SNAPSHOT_INTERVAL:
+                self._save_trending()
+            return rows.tolist()
+
+    @contextmanager
+    def _ingest_file_lock(self) -> Iterator:
+        """ingested_reviews.csv 를 덧붙이기 모드로 열고 워커 사이 advisory lock(flock)을 잡는다."""
+        with open(self.ingest_path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield f
+
+    def fingerprint(self, paths: Optional[List[str]] = None) -> str:
+        """
+        CSV 파일 이름/크기/수정 시각으로 만든 버전 스탬프. 전처리를 다시 돌리거나 리뷰를 수집하면 바뀐다.
+        paths를 주지 않으면 전처리 CSV와 ingested_reviews.csv 를 모두 보고, 새 릴리스가 올라갔는지(포인터)도 본다.
+        """
+        digest = hashlib.sha1()
+        if paths is None:
+            # 빈 수집 파일(잠금용으로 막 만든 파일)은 리뷰가 없는 것과 같다
+            ingested = os.path.exists(self.ingest_path) and os.path.getsize(self.ingest_path) > 0
+            paths = self.paths + ([self.ingest_path] if ingested else [])
+            digest.update(f"{os.path.relpath(dataset_directory(self.root), self.root)};".encode("utf-8"))
+        for path in paths:
+            st = os.stat(path)
+            digest.update(f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load_index(self) -> InvertedIndex:
+        path = os.path.join(self.directory, REVIEW_INDEX_FILE)
+        fingerprint = self.base_version
+        try:
+            index = InvertedIndex.load(path)
+            if index.fingerprint == fingerprint and len(index) == len(self):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        index = InvertedIndex.build(self.content, fingerprint)
+        try:
+            index.save(path)
+        except OSError:
+            # 쓰기 권한이 없으면 메모리에만 들고 있는다
+            pass
+        return index
+
+    def build_stats(self) -> ReviewStats:
+        """전처리 CSV 행들의 열 배열을 한 번 훑어 출처별/전체 집계를 만든다."""
+        stats = ReviewStats(fingerprint=self.base_version)
+        for i, source in enumerate(self.sources):
+            rows = self._bitmaps["source"][i][:self.base_size]
+            stats.add(source, self.rating[rows], self.month[rows], self.weekday[rows], self.content_length[rows])
+        return stats
+
+    def _load_stats(self) -> ReviewStats:
+        path = os.path.join(self.directory, REVIEW_STATS_FILE)
+        try:
+            stats = ReviewStats.load(path)
+            if stats.fingerprint == self.base_version and stats.aggregates[ALL_SOURCES].count == self.base_size:
+                return stats
+        except (OSError, ValueError, KeyError):
+            pass
+        stats = self.build_stats()
+        try:
+            stats.save(path)
+        except OSError:
+            pass
+        return stats
+
+    def build_trending(self) -> TrendingTerms:
+        """모든 행의 본문을 한 번 훑어 인기 term 표를 만든다."""
+        trending = TrendingTerms(fingerprint=self.base_version)
+        # 한 번에 모으는 term 목록이 너무 커지지 않도록 나눠서 더한다
+        for start in range(0, len(self), 10_000):
+            trending.add(*self._trending_rows(self.ids[start:start + 10_000]))
+        return trending
+
+    def _load_trending(self) -> TrendingTerms:
+        path = os.path.join(self.directory, REVIEW_TRENDING_FILE)
+        try:
+            trending = TrendingTerms.load(path)
+            # 스냅샷은 전처리 CSV 행 + 수집 파일 앞부분 행을 담는다. 나머지 수집 행만 더한다
+            if trending.fingerprint == self.base_version and self.base_size <= trending.rows <= len(self):
+                self.trending = trending
+                if trending.rows < len(self):
+                    trending.add(*self._trending_rows(self.ids[trending.rows:]))
+                    self._save_trending()
+                self._trending_saved = time.monotonic()
+                return trending
+        except (OSError, ValueError, KeyError):
+            pass
+        self.trending = self.build_trending()
+        self._save_trending()
+        return self.trending
+
+    def _save_trending(self) -> None:
+        self._trending_saved = time.monotonic()
+        try:
+            self.trending.save(os.path.join(self.directory, REVIEW_TRENDING_FILE))
+        except OSError:
+            pass
+
+    def _load_ann(self) -> Optional[SparseANNIndex]:
+        path = os.path.join(self.directory, REVIEW_ANN_DIR)
+        try:
+            ann = SparseANNIndex.load(path, mmap=True)
+        except (OSError, ValueError, KeyError):
+            return None
+        if ann.fingerprint != self.base_version or len(ann) != self.base_size:
+            return None
+        # 수집한 행들은 색인의 (고정된) 어휘/idf로 변환해서 붙인다
+        for text in self.content[self.base_size:]:
+            ann.append(*ann.transform(text))
+        return ann
+
+    def reload_ann(self) -> Optional[SparseANNIndex]:
+        """새로 만든 색인 디렉토리를 다시 연다 (지금 CSV와 맞지 않으면 None)."""
+        with self.lock:
+            self.ann = self._load_ann()
+            return self.ann
+
+    def build_ann(self, max_postings: int = REVIEW_ANN_MAX_POSTINGS) -> SparseANNIndex:
+        """모든 출처의 전처리 CSV content로 TF-IDF + ANN 색인을 만들어 CSV 옆에 저장하고 memmap으로 다시 연다."""
+        path = os.path.join(self.directory, REVIEW_ANN_DIR)
+        SparseANNIndex.fit(self.content[:self.base_size], max_postings=max_postings, fingerprint=self.base_version).save(path)
+        return self.reload_ann()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _range(self, column: str, low, high) -> np.ndarray:
+        """low <= column <= high 인 행의 비트맵."""
+        self._sort_pending()
+        values = self._sorted[column]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        end = len(values) if high is None else np.searchsorted(values, high, side="right")
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self._orders[column][start:end]] = True
+        return mask
+
+    def mask(self, filters: ReviewFilter) -> np.ndarray:
+        """필터에 맞는 행의 bool 비트맵. 알 수 없는 출처면 ValueError."""
+        with self.lock:
+            return self._mask(filters)
+
+    def _mask(self, filters: ReviewFilter) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if filters.source:
+            source_mask = np.zeros(len(self), dtype=bool)
+            for source in filters.source:
+                if source not in self.sources:
+                    raise ValueError(f"Unknown Source: {source}")
+                source_mask |= self._bitmaps["source"][self.sources.index(source)]
+            mask &= source_mask
+        if filters.month is not None:
+            mask &= self._bitmaps["month"][filters.month]
+        if filters.weekday is not None:
+            mask &= self._bitmaps["weekday"][WEEKDAYS.index(filters.weekday)]
+        if filters.min_rating is not None or filters.max_rating is not None:
+            mask &= self._range("rating", filters.min_rating, filters.max_rating)
+        if filters.date_from is not None or filters.date_to is not None:
+            mask &= self._range(
+                "date",
+                None if filters.date_from is None else np.datetime64(filters.date_from, "D"),
+                None if filters.date_to is None else np.datetime64(filters.date_to, "D"),
+            )
+        return mask
+
+    def ordered(self, filters: ReviewFilter, sort: str = "-date") -> np.ndarray:
+        """필터에 맞는 모든 행 id를 정렬 순서로."""
+        with self.lock:
+            mask = self._mask(filters)
+            self._sort_pending()
+            order = self._orders[sort]
+            return order[mask[order]]
+
+    def query(self, filters: ReviewFilter, sort: str = "-date", offset: int = 0, limit: int = 20) -> Tuple[int, np.ndarray]:
+        """필터에 맞는 전체 개수와, 정렬 순서로 offset부터 limit 개의 행 id를 돌려준다."""
+        rows = self.ordered(filters, sort)
+        return len(rows), rows[offset:offset + limit]
+
+    def search(self, query: str, filters: ReviewFilter, k: int = 10) -> List[Tuple[int, float]]:
+        """역색인으로 query의 모든 단어를 포함한 리뷰를 찾아 BM25 점수 순 (id, score) 상위 k 개."""
+        # mask와 색인 검색을 같은 잠금 안에서 한다. 사이에 ingest가 끼면 색인에는 mask보다 긴 id가 생긴다
+        with self.lock:
+            return self.index.search(query, k, self.mask(filters))
+
+    def trending_terms(self, source: str, month: str, k: int) -> Tuple[List[Tuple[str, int]], List[str]]:
+        """source/month의 인기 term 상위 k 개와, 그 출처에 남아 있는 달 목록. 알 수 없는 출처/달이면 ValueError."""
+        # ingest가 heap을 고치는 도중에 읽지 않도록 한다
+        with self.lock:
+            return self.trending.top(source, month, k), self.trending.month_buckets(source)
+
+    def require_ann(self) -> SparseANNIndex:
+        if self.ann is None:
+            raise ReviewIndexNotBuilt("Similar-review index is not built. Run: python -m app.review.review_repository")
+        return self.ann
+
+    def similar(self, row: int, k: int = 10) -> List[Tuple[int, float]]:
+        """row와 코사인 유사도가 높은 리뷰 (자기 자신 제외) 상위 k 개 (id, score). 출처는 가리지 않는다."""
+        if not 0 <= row < len(self):
+            raise ValueError("Review not Found.")
+        return self.require_ann().query(row, k, REVIEW_ANN_QUERY_TERMS)
+
+    def get(self, row: int) -> Review:
+        if not 0 <= row < len(self):
+            raise ValueError("Review not Found.")
+        return Review(
+            id=int(row),
+            source=self.sources[self.source[row]],
+            rating=float(self.rating[row]),
+            date=self.date[row].item(),
+            content=self.content[row],
+            content_length=int(self.content_length[row]),
+            is_positive=bool(self.is_positive[row]),
+            month=int(self.month[row]),
+            weekday=WEEKDAYS[self.weekday[row]],
+        )
+
+    def get_many(self, rows) -> List[Review]:
+        return [self.get(row) for row in rows]
+
+    def records(self, rows: np.ndarray) -> List[dict]:
+        """rows 행들을 Review와 같은 필드의 dict로. 내보내기용이라 Review 모델을 거치지 않고 열 배열에서 바로 만든다."""
+        columns = zip(
+            rows.tolist(),
+            self.source[rows].tolist(),
+            self.rating[rows].tolist(),
+            self.date[rows].astype(str).tolist(),
+            self.content_length[rows].tolist(),
+            self.is_positive[rows].tolist(),
+            self.month[rows].tolist(),
+            self.weekday[rows].tolist(),
+        )
+        return [
+            {"id": row, "source": self.sources[source], "rating": rating, "date": date, "content": self.content[row],
+             "content_length": length, "is_positive": positive, "month": month, "weekday": WEEKDAYS[weekday]}
+            for row, source, rating, date, length, positive, month, weekday in columns
+        ]
+
+    def embeddings(self, rows: np.ndarray) -> List[Tuple[int, Dict[str, float]]]:
+        """rows 행들의 (L2 정규화된) TF-IDF 벡터를 (id, {term: weight})로. 유사 리뷰 색인의 벡터를 쓴다."""
+        ann = self.require_ann()
+        result = []
+        for row in rows.tolist():
+            indices, data = ann.row(row)
+            result.append((row, {ann.vocabulary[i]: round(w, 6) for i, w in zip(indices.tolist(), data.tolist())}))
+        return result
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Build the similar-review ANN index next to the preprocessed review CSVs.")
+    parser.add_argument('-d', '--data_dir', type=str, default=REVIEW_DATA_DIR, help="Directory with preprocessed_reviews_*.csv. Example: database")
+    parser.add_argument('-p', '--max_postings', type=int, default=REVIEW_ANN_MAX_POSTINGS, help="Highest-weight reviews kept per term.")
+    return parser
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    repo = ReviewRepository(args.data_dir)
+    ann = repo.build_ann(args.max_postings)
+    print(f"Built similar-review index for {len(ann)} reviews ({len(ann.vocabulary)} terms, {ann.max_postings} postings/term) in {os.path.join(args.data_dir, REVIEW_ANN_DIR)}")
@@ -0,0 +1,288 @@
+from typing import Annotated, AsyncIterator, List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.export import download, media_type_for
+from app.ndjson import DuplexStreamingResponse, iter_ndjson_lines
+from app.review.review_schema import (
+    Review, ReviewExportQuery, ReviewHit, ReviewIngest, ReviewIngestResult, ReviewPage, ReviewQuery, ReviewSearchQuery,
+    ReviewStatsSummary, ReviewTrending,
+)
+from app.review.review_stats import ALL_SOURCES
+from app.review.review_trending import ALL_MONTHS
+from app.review.review_repository import ReviewIndexNotBuilt
+from app.review.review_service import ReviewService
+from app.dependencies import get_review_service
+from app.responses.base_response import BaseResponse, respond
+from app.config import REVIEW_INGEST_CHUNK_SIZE, REVIEW_PAGE_MAX_SIZE, REVIEW_SEARCH_TOP_K, TRENDING_TOP_K
+
+review = APIRouter(prefix="/api/reviews")
+
+
+@review.get("", response_model=BaseResponse[ReviewPage], status_code=status.HTTP_200_OK)
+def list_reviews(
+    query: Annotated[ReviewQuery, Query()],
+    service: ReviewService = Depends(get_review_service),
+) -> BaseResponse[ReviewPage]:
+    """
+    전처리된 리뷰를 필터/정렬해서 한 페이지씩 조회합니다.
+
+    Args:
+        query (ReviewQuery): source(여러 개 가능), 별점 범위, 날짜 범위, 월, 요일 필터와
+            정렬 기준("date", "-date", "rating", "-rating"), offset, limit
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        BaseResponse[ReviewPage]: 전체 개수와 해당 페이지의 리뷰 목록 반환
+
+    Raises:
+        HTTPException: 알 수 없는 출처인 경우 400 상태 코드와 오류 메시지 반환
+    """
+    try:
+        page = service.list_reviews(query, query.sort, query.offset, query.limit)
+        return respond(BaseResponse(status="success", data=page, message="Review list success."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@review.get("/stats", response_model=BaseResponse[ReviewStatsSummary], status_code=status.HTTP_200_OK)
+def review_stats(
+    source: str = Query(ALL_SOURCES, description="리뷰 출처. 기본값 all은 모든 출처를 합친 집계"),
+    service: ReviewService = Depends(get_review_service),
+) -> BaseResponse[ReviewStatsSummary]:
+    """
+    미리 만들어 둔 집계 테이블에서 리뷰 수, 별점 분포, 월/요일별 리뷰 수, 평균 별점, 긍정 비율을 조회합니다.
+
+    Args:
+        source (str): 리뷰 출처 (기본값: all)
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        BaseResponse[ReviewStatsSummary]: 해당 출처의 집계 반환
+
+    Raises:
+        HTTPException: 알 수 없는 출처인 경우 400 상태 코드와 오류 메시지 반환
+    """
+    try:
+        stats = service.get_stats(source)
+        return respond(BaseResponse(status="success", data=stats, message="Review stats success."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@review.get("/trending", response_model=BaseResponse[ReviewTrending], status_code=status.HTTP_200_OK)
+def trending_terms(
+    source: str = Query(ALL_SOURCES, description="리뷰 출처. 기본값 all은 모든 출처를 합친 집계"),
+    month: str = Query(ALL_MONTHS, description='"YYYY-MM" 형식의 달. 기본값 all은 전체 기간'),
+    k: int = Query(20, ge=1, le=TRENDING_TOP_K),
+    service: ReviewService = Depends(get_review_service),
+) -> BaseResponse[ReviewTrending]:
+    """
+    수집/전처리된 리뷰마다 갱신되는 Count-Min sketch + top-k 표에서 출처/달별 인기 단어를 조회합니다.
+
+    Args:
+        source (str): 리뷰 출처 (기본값: all)
+        month (str): 달 (기본값: all)
+        k (int): 결과 개수
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        BaseResponse[ReviewTrending]: 추정 문서 빈도 순 단어 목록과 조회할 수 있는 달 목록 반환
+
+    Raises:
+        HTTPException: 알 수 없는 출처이거나 남아 있지 않은 달인 경우 400 상태 코드와 오류 메시지 반환
+    """
+    try:
+        trending = service.trending_terms(source, month, k)
+        return respond(BaseResponse(status="success", data=trending, message="Trending terms success."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@review.get("/export", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+def export_reviews(
+    query: Annotated[ReviewExportQuery, Query()],
+    service: ReviewService = Depends(get_review_service),
+) -> StreamingResponse:
+    """
+    필터에 맞는 전처리된 리뷰 전체를 CSV 또는 NDJSON 파일로 흘려보냅니다. 메모리에는 한 묶음씩만 올라갑니다.
+
+    Args:
+        query (ReviewExportQuery): 리뷰 목록과 같은 필터와 정렬, format("csv", "ndjson"), gzip 압축 여부
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        StreamingResponse: reviews.csv / reviews.ndjson 첨부 파일 (gzip이면 .gz)
+
+    Raises:
+        HTTPException: 알 수 없는 출처인 경우 400 상태 코드와 오류 메시지 반환
+    """
+    try:
+        chunks = service.export_reviews(query, query.sort, query.format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return download(chunks, f"reviews.{query.format}", media_type_for(query.format), query.gzip)
+
+
+@review.get("/embeddings/export", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+def export_embeddings(
+    query: Annotated[ReviewExportQuery, Query()],
+    service: ReviewService = Depends(get_review_service),
+) -> StreamingResponse:
+    """
+    필터에 맞는 리뷰들의 TF-IDF 벡터(0이 아닌 값만)를 CSV 또는 NDJSON 파일로 흘려보냅니다.
+
+    Args:
+        query (ReviewExportQuery): 리뷰 목록과 같은 필터와 정렬, format("csv", "ndjson"), gzip 압축 여부
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        StreamingResponse: CSV는 (id, term, weight) 행, NDJSON은 리뷰마다 {"id", "terms"} 한 줄
+
+    Raises:
+        HTTPException: 알 수 없는 출처면 400, 유사 리뷰 색인이 아직 없으면 503 상태 코드와 오류 메시지 반환
+    """
+    try:
+        chunks = service.export_embeddings(query, query.sort, query.format)
+    except ReviewIndexNotBuilt as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return download(chunks, f"review_embeddings.{query.format}", media_type_for(query.format), query.gzip)
+
+
+@review.get("/search", response_model=BaseResponse[List[ReviewHit]], status_code=status.HTTP_200_OK)
+def search_reviews(
+    query: Annotated[ReviewSearchQuery, Query()],
+    service: ReviewService = Depends(get_review_service),
+) -> BaseResponse[List[ReviewHit]]:
+    """
+    리뷰 본문을 역색인으로 검색해 BM25 점수가 높은 순으로 상위 k개를 돌려줍니다.
+
+    Args:
+        query (ReviewSearchQuery): 검색어 q, 결과 개수 k, 그리고 목록 조회와 같은 필터
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        BaseResponse[List[ReviewHit]]: 점수와 리뷰 목록 반환 (검색어의 모든 단어를 포함한 리뷰만)
+
+    Raises:
+        HTTPException: 알 수 없는 출처인 경우 400 상태 코드와 오류 메시지 반환
+    """
+    try:
+        hits = service.search_reviews(query.q, query, query.k)
+        return respond(BaseResponse(status="success", data=hits, message="Review search success."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def stream_ingest_results(request: Request, service: ReviewService) -> AsyncIterator[bytes]:
+    """
+    NDJSON 본문을 한 줄씩 ReviewIngest로 검증하고, REVIEW_INGEST_CHUNK_SIZE 행마다 한 번씩 수집해서
+    (= 수집 파일에 한 번 덧붙이기) 행별 결과를 NDJSON으로 흘려보낸다.
+    """
+    pending: List[Tuple[int, Optional[ReviewIngest], Optional[str]]] = []
+
+    async def flush() -> AsyncIterator[bytes]:
+        valid = [row for _, row, _ in pending if row is not None]
+        try:
+            results = iter(await run_in_threadpool(service.ingest_reviews, valid) if valid else [])
+        except ReviewIndexNotBuilt as e:
+            # 스트림 도중에 색인이 없어진 경우: 상태 코드는 바꿀 수 없으므로 이 묶음의 행들을 실패로 보낸다
+            results = iter([(None, str(e))] * len(valid))
+        for line_no, row, error in pending:
+            review_id = None
+            if row is not None:
+                review_id, error = next(results)
+            result = ReviewIngestResult(line=line_no, status="failure" if error else "success", id=review_id, message=error)
+            yield result.model_dump_json().encode("utf-8") + b"\n"
+        pending.clear()
+
+    async for line_no, line in iter_ndjson_lines(request):
+        try:
+            pending.append((line_no, ReviewIngest.model_validate_json(line), None))
+        except ValidationError as e:
+            message = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'body'}: {err['msg']}" for err in e.errors())
+            pending.append((line_no, None, message))
+        if len(pending) >= REVIEW_INGEST_CHUNK_SIZE:
+            async for out in flush():
+                yield out
+    async for out in flush():
+        yield out
+
+
+@review.post("/ingest", status_code=status.HTTP_200_OK)
+async def ingest_reviews(request: Request, service: ReviewService = Depends(get_review_service)) -> DuplexStreamingResponse:
+    """
+    NDJSON(한 줄에 ReviewIngest 하나)으로 새 리뷰를 수집합니다.
+    전처리 클래스와 같은 규칙으로 정제하고 content_length / is_positive / month / weekday를 만든 뒤,
+    유사 리뷰 색인의 고정된 TF-IDF 어휘로 변환해서 목록/검색/집계/유사 리뷰에 바로 반영합니다.
+
+    Args:
+        request (Request): 한 줄에 하나씩 {"source", "rating", "date", "content"} JSON이 담긴 스트리밍 본문
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        DuplexStreamingResponse: 행별 결과(ReviewIngestResult, 성공하면 새 리뷰 id)를 담은 NDJSON 스트림
+
+    Raises:
+        HTTPException: 유사 리뷰 색인(고정된 TF-IDF 어휘)이 아직 없으면 503 상태 코드와 오류 메시지 반환
+    """
+    try:
+        service.ingest_ready()
+    except ReviewIndexNotBuilt as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return DuplexStreamingResponse(stream_ingest_results(request, service))
+
+
+@review.get("/{review_id}", response_model=BaseResponse[Review], status_code=status.HTTP_200_OK)
+def get_review(review_id: int, service: ReviewService = Depends(get_review_service)) -> BaseResponse[Review]:
+    """
+    id로 리뷰 하나를 조회합니다.
+
+    Args:
+        review_id (int): 리뷰 id
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        BaseResponse[Review]: 리뷰 정보 반환
+
+    Raises:
+        HTTPException: 리뷰가 없으면 404 상태 코드와 오류 메시지 반환
+    """
+    try:
+        result = service.get_review(review_id)
+        return respond(BaseResponse(status="success", data=result, message="Review found."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@review.get("/{review_id}/similar", response_model=BaseResponse[List[ReviewHit]], status_code=status.HTTP_200_OK)
+def similar_reviews(
+    review_id: int,
+    k: int = Query(REVIEW_SEARCH_TOP_K, ge=1, le=REVIEW_PAGE_MAX_SIZE),
+    service: ReviewService = Depends(get_review_service),
+) -> BaseResponse[List[ReviewHit]]:
+    """
+    주어진 리뷰와 본문이 비슷한 리뷰를 모든 출처에서 찾아 유사도 순으로 k개 돌려줍니다.
+
+    Args:
+        review_id (int): 기준 리뷰 id
+        k (int): 결과 개수
+        service (ReviewService): 리뷰 서비스 객체
+
+    Returns:
+        BaseResponse[List[ReviewHit]]: 코사인 유사도와 리뷰 목록 반환
+
+    Raises:
+        HTTPException: 리뷰가 없으면 404, 유사 리뷰 색인이 아직 없으면 503 상태 코드와 오류 메시지 반환
+    """
+    try:
+        hits = service.similar_reviews(review_id, k)
+        return respond(BaseResponse(status="success", data=hits, message="Similar reviews found."), status.HTTP_200_OK)
+    except ReviewIndexNotBuilt as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,89 @@
+from datetime import date
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.config import REVIEW_PAGE_SIZE, REVIEW_PAGE_MAX_SIZE, REVIEW_SEARCH_TOP_K
+
+Weekday = Literal["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+ReviewSort = Literal["date", "-date", "rating", "-rating"]
+ExportFormat = Literal["csv", "ndjson"]
+
+class Review(BaseModel):
+    id: int
+    source: str
+    rating: float
+    date: date
+    content: str
+    content_length: int
+    is_positive: bool
+    month: int
+    weekday: str
+
+class ReviewFilter(BaseModel):
+    source: Optional[List[str]] = Field(None, description="리뷰 출처 (여러 개 가능). 예: kakao")
+    min_rating: Optional[float] = Field(None, ge=1, le=5)
+    max_rating: Optional[float] = Field(None, ge=1, le=5)
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    month: Optional[int] = Field(None, ge=1, le=12)
+    weekday: Optional[Weekday] = None
+
+class ReviewQuery(ReviewFilter):
+    # FastAPI는 query parameter 모델이 하나뿐일 때만 필드를 펼쳐 주므로 정렬/페이지도 같은 모델에 둔다
+    sort: ReviewSort = "-date"
+    offset: int = Field(0, ge=0)
+    limit: int = Field(REVIEW_PAGE_SIZE, ge=1, le=REVIEW_PAGE_MAX_SIZE)
+
+class ReviewExportQuery(ReviewFilter):
+    sort: ReviewSort = "-date"
+    format: ExportFormat = "csv"
+    gzip: bool = Field(False, description="true면 .gz 파일로 압축해서 보낸다")
+
+class ReviewIngest(BaseModel):
+    # 전처리 전의 원본 리뷰 한 건. 정제/파생 변수는 서버가 전처리 클래스와 같은 규칙으로 만든다
+    source: str = Field(..., description="리뷰 출처. 예: kakao")
+    rating: float = Field(..., ge=1, le=5)
+    date: date
+    content: str
+
+class ReviewIngestResult(BaseModel):
+    line: int
+    status: str
+    id: Optional[int] = None
+    message: Optional[str] = None
+
+class ReviewPage(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    reviews: List[Review]
+
+class ReviewSearchQuery(ReviewFilter):
+    q: str = Field(..., min_length=1, description="검색어. 모든 단어를 포함한 리뷰만 찾는다")
+    k: int = Field(REVIEW_SEARCH_TOP_K, ge=1, le=REVIEW_PAGE_MAX_SIZE)
+
+class ReviewHit(BaseModel):
+    score: float
+    review: Review
+
+class ReviewStatsSummary(BaseModel):
+    source: str
+    count: int
+    mean_rating: Optional[float] = None
+    positive_ratio: Optional[float] = None
+    mean_content_length: Optional[float] = None
+    rating_histogram: Dict[str, int]
+    by_month: Dict[str, int]
+    by_weekday: Dict[str, int]
+
+class TrendingTerm(BaseModel):
+    term: str
+    # Count-Min sketch 추정 문서 빈도 (실제보다 작지 않다)
+    count: int
+
+class ReviewTrending(BaseModel):
+    source: str
+    month: str
+    months: List[str]
+    terms: List[TrendingTerm]
@@ -0,0 +1,120 @@
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import REVIEW_EXPORT_CHUNK_ROWS
+from app.export import csv_chunks, ndjson_chunks
+from app.review.review_repository import ReviewRepository
+from app.review.review_schema import (
+    Review, ReviewFilter, ReviewHit, ReviewIngest, ReviewPage, ReviewStatsSummary, ReviewTrending, TrendingTerm,
+)
+from app.review.review_stats import ALL_SOURCES
+from app.review.review_trending import ALL_MONTHS
+
+EXPORT_FIELDS = tuple(Review.model_fields)
+
+
+def _chunks(rows: np.ndarray) -> Iterator[np.ndarray]:
+    for start in range(0, len(rows), REVIEW_EXPORT_CHUNK_ROWS):
+        yield rows[start:start + REVIEW_EXPORT_CHUNK_ROWS]
+
+
+class ReviewService:
+    def __init__(self, reviewRepository: ReviewRepository) -> None:
+        self.repo = reviewRepository
+
+    def list_reviews(self, filters: ReviewFilter, sort: str = "-date", offset: int = 0, limit: int = 20) -> ReviewPage:
+        '''
+        List reviews matching the filters in the given sort order
+        only the rows of the requested page are materialized
+        if a source is unknown, raise an ValueError
+        '''
+        total, rows = self.repo.query(filters, sort, offset, limit)
+        return ReviewPage(total=total, offset=offset, limit=limit, reviews=self.repo.get_many(rows))
+
+    def search_reviews(self, query: str, filters: ReviewFilter, k: int = 10) -> List[ReviewHit]:
+        '''
+        Full-text search over review content ranked by BM25
+        only reviews containing every query term are returned
+        if a source is unknown, raise an ValueError
+        '''
+        hits = self.repo.search(query, filters, k)
+        return [ReviewHit(score=round(score, 4), review=self.repo.get(row)) for row, score in hits]
+
+    def similar_reviews(self, review_id: int, k: int = 10) -> List[ReviewHit]:
+        '''
+        Find reviews across all sources whose TF-IDF vectors are closest (cosine) to the given review
+        if the id does not exist, raise an ValueError
+        if the similar-review index has not been built, raise ReviewIndexNotBuilt
+        '''
+        hits = self.repo.similar(review_id, k)
+        return [ReviewHit(score=round(score, 4), review=self.repo.get(row)) for row, score in hits]
+
+    def get_stats(self, source: str = ALL_SOURCES) -> ReviewStatsSummary:
+        '''
+        Read the materialized rating/month/weekday aggregates of one source (or of all sources)
+        if the source is unknown, raise an ValueError
+        '''
+        return ReviewStatsSummary(**self.repo.stats.summary(source))
+
+    def trending_terms(self, source: str = ALL_SOURCES, month: str = ALL_MONTHS, k: int = 20) -> ReviewTrending:
+        '''
+        Read the top-k terms (estimated document frequency) of one source and month from the streaming sketches
+        if the source is unknown or the month is no longer kept, raise an ValueError
+        '''
+        top, months = self.repo.trending_terms(source, month, k)
+        return ReviewTrending(source=source, month=month, months=months,
+                              terms=[TrendingTerm(term=term, count=count) for term, count in top])
+
+    def export_reviews(self, filters: ReviewFilter, sort: str = "-date", fmt: str = "csv") -> Iterator[bytes]:
+        '''
+        Stream every review matching the filters as CSV or NDJSON, REVIEW_EXPORT_CHUNK_ROWS rows at a time
+        if a source is unknown, raise an ValueError (before the stream starts)
+        '''
+        rows = self.repo.ordered(filters, sort)  # 알 수 없는 출처면 여기서 바로 ValueError
+        chunks = (self.repo.records(part) for part in _chunks(rows))
+        if fmt == "ndjson":
+            return ndjson_chunks(chunks)
+        return csv_chunks(EXPORT_FIELDS, ([list(record.values()) for record in records] for records in chunks))
+
+    def export_embeddings(self, filters: ReviewFilter, sort: str = "-date", fmt: str = "csv") -> Iterator[bytes]:
+        '''
+        Stream the TF-IDF vectors of every review matching the filters
+        CSV is one (id, term, weight) row per non-zero weight, NDJSON is one {"id", "terms"} object per review
+        if a source is unknown, raise an ValueError
+        if the similar-review index has not been built, raise ReviewIndexNotBuilt
+        '''
+        rows = self.repo.ordered(filters, sort)
+        # 스트림이 시작된 뒤에는 상태 코드를 바꿀 수 없으므로 색인이 있는지 먼저 확인한다
+        self.repo.require_ann()
+        chunks = (self.repo.embeddings(part) for part in _chunks(rows))
+        if fmt == "ndjson":
+            return ndjson_chunks([{"id": row, "terms": terms} for row, terms in vectors] for vectors in chunks)
+        triples = ([(row, term, weight) for row, terms in vectors for term, weight in terms.items()] for vectors in chunks)
+        return csv_chunks(("id", "term", "weight"), triples)
+
+    def ingest_ready(self) -> None:
+        '''
+        Check that new reviews can be ingested before a stream starts
+        if the similar-review index (the frozen TF-IDF vocabulary) has not been built, raise ReviewIndexNotBuilt
+        '''
+        self.repo.require_ann()
+
+    def ingest_reviews(self, reviews: List[ReviewIngest]) -> List[Tuple[Optional[int], Optional[str]]]:
+        '''
+        Clean, featurize and vectorize a batch of new reviews and append them with one write to the ingested store
+        Returns (id, error) per row, rows with an unknown source are skipped
+        if the similar-review index has not been built, raise ReviewIndexNotBuilt
+        '''
+        accepted = [review for review in reviews if review.source in self.repo.sources]
+        ids = iter(self.repo.ingest(accepted) if accepted else [])
+        return [
+            (next(ids), None) if review.source in self.repo.sources else (None, f"Unknown Source: {review.source}")
+            for review in reviews
+        ]
+
+    def get_review(self, review_id: int) -> Review:
+        '''
+        Get a review by id, if the id does not exist, raise an ValueError
+        '''
+        return self.repo.get(review_id)
@@ -0,0 +1,103 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+# 출처 전체를 합친 집계의 이름
+ALL_SOURCES = "all"
+
+
+class Aggregate:
+    """리뷰 묶음 하나의 합계/개수 카운터. 평균과 비율은 읽을 때 나눠서 구한다."""
+    __slots__ = ("count", "rating_sum", "positive", "content_length_sum", "ratings", "months", "weekdays")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.rating_sum = 0.0
+        self.positive = 0
+        self.content_length_sum = 0
+        self.ratings = [0] * 5   # 별점 1 ~ 5
+        self.months = [0] * 12   # 1월 ~ 12월
+        self.weekdays = [0] * 7  # 월 ~ 일
+
+    def add(self, ratings: np.ndarray, months: np.ndarray, weekdays: np.ndarray, content_lengths: np.ndarray) -> None:
+        """같은 길이의 열 배열로 들어온 리뷰들을 더한다. month는 1 ~ 12, weekday는 0(월) ~ 6(일)."""
+        ratings = np.asarray(ratings, dtype=np.float64)
+        self.count += len(ratings)
+        self.rating_sum += float(ratings.sum())
+        self.positive += int((ratings >= 4).sum())
+        self.content_length_sum += int(np.asarray(content_lengths).sum())
+        buckets = np.clip(np.floor(ratings + 0.5), 1, 5).astype(np.int64) - 1
+        for counts, values, size in ((self.ratings, buckets, 5), (self.months, np.asarray(months, np.int64) - 1, 12),
+                                     (self.weekdays, np.asarray(weekdays, np.int64), 7)):
+            for i, n in enumerate(np.bincount(values, minlength=size).tolist()):
+                counts[i] += n
+
+    def summary(self, source: str) -> dict:
+        return {
+            "source": source,
+            "count": self.count,
+            "mean_rating": round(self.rating_sum / self.count, 4) if self.count else None,
+            "positive_ratio": round(self.positive / self.count, 4) if self.count else None,
+            "mean_content_length": round(self.content_length_sum / self.count, 2) if self.count else None,
+            "rating_histogram": {str(i + 1): n for i, n in enumerate(self.ratings)},
+            "by_month": {str(i + 1): n for i, n in enumerate(self.months)},
+            "by_weekday": dict(zip(WEEKDAYS, self.weekdays)),
+        }
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Aggregate":
+        aggregate = cls()
+        for name in cls.__slots__:
+            setattr(aggregate, name, data[name])
+        return aggregate
+
+
+class ReviewStats:
+    """
+    출처별 + 전체 리뷰 집계 테이블 (materialized aggregate).
+
+    - 전처리 결과로 한 번 만들어 review_stats.json 으로 저장해 두고, 새 리뷰가 들어오면 add()로 카운터만 더한다.
+    - 조회는 카운터 몇 개를 나누는 것뿐이라 리뷰 수와 상관없이 O(1)이다.
+    """
+    def __init__(self, aggregates: Optional[Dict[str, Aggregate]] = None, fingerprint: str = "") -> None:
+        self.aggregates: Dict[str, Aggregate] = aggregates if aggregates is not None else {}
+        self.aggregates.setdefault(ALL_SOURCES, Aggregate())
+        self.fingerprint = fingerprint
+
+    @property
+    def sources(self) -> List[str]:
+        return [source for source in self.aggregates if source != ALL_SOURCES]
+
+    def add(self, source: str, ratings, months, weekdays, content_lengths) -> None:
+        """source의 새 리뷰들을 출처별 집계와 전체 집계에 더한다."""
+        for name in (source, ALL_SOURCES):
+            self.aggregates.setdefault(name, Aggregate()).add(ratings, months, weekdays, content_lengths)
+
+    def summary(self, source: str = ALL_SOURCES) -> dict:
+        """source(기본: 전체)의 요약. 알 수 없는 출처면 ValueError."""
+        if source not in self.aggregates:
+            raise ValueError(f"Unknown Source: {source}")
+        return self.aggregates[source].summary(source)
+
+    def save(self, path: str) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 바꾼다."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "fingerprint": self.fingerprint,
+                "aggregates": {name: aggregate.to_dict() for name, aggregate in self.aggregates.items()},
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ReviewStats":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        aggregates = {name: Aggregate.from_dict(value) for name, value in data["aggregates"].items()}
+        return cls(aggregates, data.get("fingerprint", ""))
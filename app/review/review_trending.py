@@ -0,0 +1,105 @@
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import TRENDING_MONTHS, TRENDING_SKETCH_DEPTH, TRENDING_SKETCH_WIDTH, TRENDING_TOP_K
+from app.review.review_stats import ALL_SOURCES
+from utils.count_min import CountMinSketch, HeavyHitters, sketch_columns
+from utils.inverted_index import tokenize
+
+# 월 구분 없이 전체 기간을 세는 버킷
+ALL_MONTHS = "all"
+
+
+class TrendingTerms:
+    """
+    출처별 + 전체, 월별 + 전체 기간의 인기 term (heavy hitter) 표.
+
+    - 키는 (출처 또는 all, "YYYY-MM" 또는 all)이고 키마다 Count-Min sketch + 상위 k개 heap을 둔다.
+    - 리뷰 하나의 term은 한 번만 센다 (문서 빈도).
+    - 출처마다 최근 months 개 달만 남기고 더 오래된 달은 버려서, 메모리가 리뷰 수와 상관없이
+      (출처 수 + 1) x (months + 1) 개 sketch 크기로 고정된다.
+    - rows는 지금까지 더한 리뷰 수다. 스냅샷을 열면 그 뒤의 리뷰만 더 더하면 된다.
+    """
+    def __init__(self, k: int = TRENDING_TOP_K, width: int = TRENDING_SKETCH_WIDTH, depth: int = TRENDING_SKETCH_DEPTH,
+                 months: int = TRENDING_MONTHS, fingerprint: str = "", rows: int = 0,
+                 hitters: Optional[Dict[Tuple[str, str], HeavyHitters]] = None) -> None:
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.months = months
+        self.fingerprint = fingerprint
+        self.rows = rows
+        self.hitters: Dict[Tuple[str, str], HeavyHitters] = hitters if hitters is not None else {}
+
+    def _hitter(self, key: Tuple[str, str]) -> HeavyHitters:
+        if key not in self.hitters:
+            self.hitters[key] = HeavyHitters(self.k, self.width, self.depth)
+        return self.hitters[key]
+
+    def add(self, sources: List[str], months: List[str], contents: List[str]) -> None:
+        """리뷰들(출처, "YYYY-MM", 정제된 본문)을 더한다. 같은 키의 term은 모아서 sketch에 한 번에 넣는다."""
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for source, month, text in zip(sources, months, contents):
+            terms = set(tokenize(text))
+            for name in (source, ALL_SOURCES):
+                for key in ((name, ALL_MONTHS), (name, month)):
+                    groups.setdefault(key, []).extend(terms)
+        # 출처마다 가장 최근 months 개 달만 남긴다 (이번에 들어온 달 포함)
+        for name in {name for name, _ in groups}:
+            incoming = {month for key, month in groups if key == name and month != ALL_MONTHS}
+            buckets = sorted(set(self.month_buckets(name)) | incoming)
+            for month in buckets[:max(0, len(buckets) - self.months)]:
+                self.hitters.pop((name, month), None)
+                groups.pop((name, month), None)
+        # 모든 키의 sketch 크기가 같으므로 term마다 해시는 한 번만 한다
+        counters = {key: Counter(terms) for key, terms in groups.items()}
+        distinct = list(set().union(*counters.values())) if counters else []
+        position = {term: i for i, term in enumerate(distinct)}
+        columns = sketch_columns(distinct, self.width, self.depth)
+        for key, counter in counters.items():
+            self._hitter(key).add(counter, columns[:, [position[term] for term in counter]])
+        self.rows += len(contents)
+
+    def month_buckets(self, source: str) -> List[str]:
+        return sorted(month for name, month in self.hitters if name == source and month != ALL_MONTHS)
+
+    def top(self, source: str = ALL_SOURCES, month: str = ALL_MONTHS, k: Optional[int] = None) -> List[Tuple[str, int]]:
+        """source/month의 (term, 추정 문서 빈도) 상위 k 개. 알 수 없는 출처나 남아 있지 않은 달이면 ValueError."""
+        if (source, ALL_MONTHS) not in self.hitters and source != ALL_SOURCES:
+            raise ValueError(f"Unknown Source: {source}")
+        hitter = self.hitters.get((source, month))
+        if hitter is None:
+            if month != ALL_MONTHS:
+                raise ValueError(f"Unknown Month: {month}")
+            return []
+        return hitter.most_common(k)
+
+    def save(self, path: str) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 바꾼다. sketch 표는 한 배열로 쌓아서 저장한다."""
+        keys = list(self.hitters)
+        tables = np.stack([self.hitters[key].sketch.table for key in keys]) if keys \
+            else np.zeros((0, self.depth, self.width), dtype=np.uint32)
+        meta = {
+            "k": self.k, "width": self.width, "depth": self.depth, "months": self.months,
+            "fingerprint": self.fingerprint, "rows": self.rows,
+            "keys": keys, "top": [self.hitters[key].top for key in keys],
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, tables=tables, meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TrendingTerms":
+        with np.load(path, allow_pickle=False) as data:
+            tables = data["tables"]
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+        hitters = {
+            tuple(key): HeavyHitters(meta["k"], sketch=CountMinSketch(meta["width"], meta["depth"], table), top=top)
+            for key, table, top in zip(meta["keys"], tables, meta["top"])
+        }
+        return cls(meta["k"], meta["width"], meta["depth"], meta["months"], meta["fingerprint"], meta["rows"], hitters)
@@ -0,0 +1,157 @@
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from argparse import ArgumentParser, Namespace
+from importlib.util import find_spec
+from typing import Dict
+
+import uvicorn
+
+from app.config import PORT, SERVER_BACKLOG, SERVER_GRACEFUL_TIMEOUT, SERVER_HOST, SERVER_WORKERS
+
+logger = logging.getLogger("uvicorn.error")
+
+# 워커가 시작한 뒤 이 시간(초) 안에 죽으면 잠깐 기다렸다가 다시 띄운다 (시작하자마자 죽을 때 fork가 폭주하지 않게)
+RESPAWN_DELAY = 1.0
+# graceful timeout이 지나고도 이만큼(초) 더 끝나지 않는 워커는 SIGKILL로 정리한다 (lifespan 종료 작업 여유)
+KILL_GRACE = 10.0
+
+
+def event_loop() -> str:
+    # uvloop/httptools가 설치돼 있으면 쓰고, 없으면 표준 asyncio/h11로 동작한다
+    return "uvloop" if find_spec("uvloop") is not None else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if find_spec("httptools") is not None else "h11"
+
+
+def create_config(args: Namespace) -> uvicorn.Config:
+    # app.main을 import하면 정적 파일도 이때 미리 압축돼 메모리에 올라간다
+    from app.main import app
+
+    return uvicorn.Config(
+        app, host=args.host, port=args.port, loop=event_loop(), http=http_protocol(),
+        backlog=SERVER_BACKLOG, timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+def preload() -> None:
+    """
+    워커를 fork하기 전에 부모 프로세스에서 사용자 저장소와 리뷰 열 배열/색인을 한 번 올려 둔다.
+    워커는 이 페이지들을 copy-on-write로 나눠 쓰므로 워커 수만큼 따로 읽거나 메모리를 쓰지 않는다.
+    """
+    from app.dependencies import init_review_repository, init_user_repository
+
+    init_user_repository()
+    init_review_repository()
+    # 올려 둔 객체를 GC 추적에서 빼 둔다. 워커의 GC가 객체 헤더를 건드려 공유 페이지가 복사되는 것을 줄인다
+    gc.collect()
+    gc.freeze()
+
+
+class PreforkServer:
+    """
+    하나의 listen 소켓을 물려받은 워커 프로세스 N개를 fork로 띄우고 지켜보는 부모 프로세스.
+
+    - 워커는 uvicorn.Server로 같은 소켓에서 accept 한다. 죽은 워커는 다시 fork한다.
+    - SIGTERM/SIGINT를 받으면 워커들에 SIGTERM을 보낸다. 워커는 새 연결을 받지 않고
+      처리 중인 요청을 graceful timeout까지 마친 뒤 lifespan 종료 작업을 하고 끝난다.
+      두 번째 신호는 워커에 SIGINT로 보내서 바로 끝낸다.
+    """
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        # pid -> 시작 시각
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+        # 워커: 부모의 신호 처리기를 지우고, 프로세스마다 따로 가져야 하는 핸들만 다시 연다
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            from app.dependencies import after_fork
+
+            after_fork()
+            uvicorn.Server(self.config).run(sockets=[sock])
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def signal_children(self, sig: int) -> None:
+        for pid in list(self.children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def handle_exit(self, sig: int, frame) -> None:
+        if self.stopping:
+            self.signal_children(signal.SIGINT)
+            return
+        self.stopping = True
+        logger.info("Shutting down %d workers (graceful timeout %ss)", len(self.children), self.config.timeout_graceful_shutdown)
+        self.signal_children(signal.SIGTERM)
+
+    def run(self, sock: socket.socket) -> None:
+        signal.signal(signal.SIGINT, self.handle_exit)
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        for _ in range(self.workers):
+            self.spawn(sock)
+        logger.info("Started %d workers (loop=%s, http=%s)", self.workers, self.config.loop, self.config.http)
+        deadline = None
+        while self.children:
+            if self.stopping and deadline is None:
+                deadline = time.monotonic() + (self.config.timeout_graceful_shutdown or 0) + KILL_GRACE
+            if deadline is not None and time.monotonic() > deadline:
+                logger.warning("Killing %d workers that did not stop in time", len(self.children))
+                self.signal_children(signal.SIGKILL)
+                deadline = float("inf")
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            logger.warning("Worker %d exited with status %d, restarting", pid, os.waitstatus_to_exitcode(status))
+            if time.monotonic() - started < RESPAWN_DELAY:
+                time.sleep(RESPAWN_DELAY)
+            self.spawn(sock)
+        sock.close()
+
+
+def serve(args: Namespace) -> None:
+    config = create_config(args)
+    preload()
+    if args.workers <= 1 or not hasattr(os, "fork"):
+        # 워커가 하나면(또는 fork가 없으면) 이 프로세스가 바로 요청을 받는다. 종료 처리는 uvicorn이 한다
+        uvicorn.Server(config).run()
+        return
+    # 부모가 소켓을 한 번만 열고 워커들은 물려받은 소켓에서 함께 accept 한다
+    sock = config.bind_socket()
+    PreforkServer(config, args.workers).run(sock)
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Run the API with preforked workers that share data preloaded in the parent process.")
+    parser.add_argument('--host', type=str, default=SERVER_HOST, help="Bind address. Example: 0.0.0.0")
+    parser.add_argument('-p', '--port', type=int, default=PORT, help="Bind port. Example: 8000")
+    parser.add_argument('-w', '--workers', type=int, default=SERVER_WORKERS, help="Number of worker processes (sessions and jobs are per worker). Example: 1")
+    parser.add_argument('--graceful-timeout', type=int, default=SERVER_GRACEFUL_TIMEOUT,
+                        help="Seconds to let in-flight requests finish on shutdown. Example: 30")
+    return parser
+
+if __name__ == "__main__":
+    serve(create_parser().parse_args())
@@ -0,0 +1,129 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.config import STATIC_MAX_AGE, STATIC_MIN_COMPRESS_SIZE
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 만든다
+    brotli = None  # type: ignore
+
+# 이미 압축된 형식은 다시 압축해도 작아지지 않는다
+COMPRESSIBLE_PREFIXES = ("text/",)
+COMPRESSIBLE_TYPES = {"application/javascript", "application/json", "application/xml", "image/svg+xml"}
+
+
+class StaticAsset:
+    """파일 하나의 인코딩별(identity / gzip / br) 본문과 strong ETag."""
+    __slots__ = ("media_type", "variants")
+
+    def __init__(self, media_type: str, body: bytes) -> None:
+        self.media_type = media_type
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # encoding -> (body, etag). 인코딩마다 바이트가 다르므로 ETag도 달라야 한다
+        self.variants: Dict[str, Tuple[bytes, str]] = {"identity": (body, f'"{digest}"')}
+        if len(body) < STATIC_MIN_COMPRESS_SIZE or not is_compressible(media_type):
+            return
+        compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(body, quality=11)
+        for encoding, data in compressed.items():
+            if len(data) < len(body):
+                self.variants[encoding] = (data, f'"{digest}-{encoding}"')
+
+
+def is_compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_PREFIXES) or media_type in COMPRESSIBLE_TYPES
+
+
+def accepted_encodings(header: str) -> List[str]:
+    """Accept-Encoding에서 q=0이 아닌 인코딩 목록."""
+    encodings = []
+    for part in header.split(","):
+        name, *params = part.split(";")
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    pass
+        if name.strip() and q > 0:
+            encodings.append(name.strip().lower())
+    return encodings
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match는 weak 비교: W/ 접두어를 무시한다
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class PrecompressedStaticFiles:
+    """
+    디렉터리의 파일을 시작할 때 한 번 읽어 gzip(+brotli) 본문까지 미리 만들어 두고
+    메모리에서 바로 내보내는 ASGI 앱. StaticFiles 대신 /static 에 마운트한다.
+
+    - Accept-Encoding에 맞춰 br > gzip > identity 순으로 고르고 Vary: Accept-Encoding을 붙인다.
+    - 인코딩별 strong ETag + Cache-Control을 붙이고, If-None-Match가 맞으면 304를 돌려준다.
+    - 파일을 고치면 서버를 다시 시작해야 반영된다.
+    """
+    def __init__(self, directory: str, max_age: int = STATIC_MAX_AGE) -> None:
+        self.directory = directory
+        self.cache_control = f"public, max-age={max_age}"
+        self.assets: Dict[str, StaticAsset] = {}
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                with open(path, "rb") as f:
+                    self.assets["/" + os.path.relpath(path, directory).replace(os.sep, "/")] = StaticAsset(media_type, f.read())
+
+    def lookup(self, scope: Scope) -> Optional[StaticAsset]:
+        # Mount가 root_path에 마운트 경로를 붙여 주므로 그 뒤만 파일 경로다
+        path: str = scope["path"]
+        root_path: str = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        return self.assets.get(path or "/")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["method"] not in ("GET", "HEAD"):
+            response: Response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+            await response(scope, receive, send)
+            return
+        asset = self.lookup(scope)
+        if asset is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = "identity"
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for candidate in ("br", "gzip"):
+            if candidate in asset.variants and (candidate in accepted or "*" in accepted):
+                encoding = candidate
+                break
+        body, etag = asset.variants[encoding]
+
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        response = Response(b"" if scope["method"] == "HEAD" else body, headers=headers, media_type=asset.media_type)
+        await response(scope, receive, send)
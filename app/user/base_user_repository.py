@@ -0,0 +1,94 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from app.user.user_schema import User
+
+# 목록 조회에서 정렬/접두어 검색에 쓸 수 있는 필드
+USER_SORT_FIELDS = ("email", "username")
+
+# 조건부 변경이 writer 안의 확인에서 실패했을 때의 ValueError 메시지
+USER_EXISTS = "User already Exists."
+USERNAME_EXISTS = "Username already Exists."
+USER_NOT_FOUND = "User not Found."
+PASSWORD_CHANGED = "Password Changed."
+
+
+def sort_key(user: User, by: str) -> Tuple[str, ...]:
+    """정렬 인덱스의 키. username은 중복될 수 있어서 email을 붙여 순서를 고정한다."""
+    return (user.email,) if by == "email" else (user.username, user.email)
+
+class BaseUserRepository(ABC):
+    """UserService가 의존하는 사용자 저장소 인터페이스."""
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    def save_user(self, user: User) -> User:
+        pass
+
+    @abstractmethod
+    def delete_user(self, user: User) -> User:
+        """사용자가 있을 때만 지운다. 확인은 writer 안에서 한다. 이미 없으면 ValueError(USER_NOT_FOUND)."""
+        pass
+
+    @abstractmethod
+    def create_user(self, user: User) -> User:
+        """
+        email과 username이 모두 비어 있을 때만 저장한다. 확인과 저장을 writer 안에서 한 번에 해서
+        같은 email/username으로 동시에 들어온 등록 중 하나만 성공한다. 아니면 ValueError(USER_EXISTS / USERNAME_EXISTS).
+        """
+        pass
+
+    @abstractmethod
+    def update_user(self, user: User, expected_password: Optional[str] = None) -> User:
+        """
+        이미 있는 사용자만 바꾼다 (동시에 지워진 사용자를 되살리지 않는다). 없으면 ValueError(USER_NOT_FOUND).
+        expected_password를 주면 저장된 비밀번호 해시가 그 값일 때만 바꾼다 (compare-and-swap, 아니면 PASSWORD_CHANGED).
+        """
+        pass
+
+    def create_users(self, users: List[User]) -> List[Optional[str]]:
+        """create_user를 여러 명에게. 행별 오류 메시지(성공이면 None). 가능한 구현은 한 번의 flush로 기록하도록 override 한다."""
+        errors: List[Optional[str]] = []
+        for user in users:
+            try:
+                self.create_user(user)
+                errors.append(None)
+            except ValueError as e:
+                errors.append(str(e))
+        return errors
+
+    @abstractmethod
+    def list_users(
+        self, prefix: str = "", by: str = "email", after: Optional[Tuple[str, ...]] = None, limit: int = 50
+    ) -> List[User]:
+        """by 필드가 prefix로 시작하는 사용자를 sort_key 순서로, after 다음부터 최대 limit 명 돌려준다."""
+        pass
+
+    @abstractmethod
+    def username_exists(self, username: str) -> bool:
+        pass
+
+    def save_users(self, users: List[User]) -> List[User]:
+        """여러 사용자를 저장한다. 가능한 구현은 한 번의 flush로 기록하도록 override 한다."""
+        for user in users:
+            self.save_user(user)
+        return users
+
+    def delete_users(self, users: List[User]) -> List[User]:
+        for user in users:
+            self.delete_user(user)
+        return users
+
+    def compact_if_needed(self) -> None:
+        """주기적으로 호출되는 정리 작업. 필요 없는 저장소는 아무것도 하지 않는다."""
+        pass
+
+    def after_fork(self) -> None:
+        """부모 프로세스에서 연 저장소를 fork된 워커가 쓰기 전에 호출한다. 프로세스끼리 나눠 쓰면 안 되는 핸들을 다시 연다."""
+        pass
+
+    def close(self) -> None:
+        pass
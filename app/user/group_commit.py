@@ -0,0 +1,95 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.config import USER_COMMIT_WINDOW, USER_COMMIT_MAX_BATCH
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    모든 변경을 하나의 writer 스레드로 보내는 group commit 큐.
+
+    writer는 첫 변경을 받은 뒤 window(초) 동안 들어온 변경을 더 모아서
+    flush(batch)를 한 번만 호출하고, flush가 끝나면 각 요청의 Future를 완료한다.
+    flush가 op별 결과 목록을 돌려주면 (조건부 변경) 예외가 담긴 op의 Future만 그 예외로 끝내고,
+    나머지 Future는 그 결과 값(행별 오류 목록 등)으로 끝낸다.
+    요청 핸들러는 threadpool에서 돌기 때문에 asyncio task가 아니라 스레드를 쓴다.
+    """
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], Optional[List[Any]]],
+        window: float = USER_COMMIT_WINDOW,
+        max_batch: int = USER_COMMIT_MAX_BATCH,
+    ) -> None:
+        self._flush = flush
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+
+    def _ensure_started(self) -> None:
+        # 스레드는 fork 후 자식 프로세스에 복제되지 않으므로 pid가 바뀌면 새로 띄운다
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, op: Any) -> "Future[Any]":
+        self._ensure_started()
+        future: "Future[Any]" = Future()
+        self._queue.put((op, future))
+        return future
+
+    def _collect(self, first: Tuple[Any, Future]) -> Tuple[List[Tuple[Any, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stop = self._collect(item)
+            try:
+                results = self._flush([op for op, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results or [None] * len(batch)):
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            self.batches += 1
+
+    def close(self) -> None:
+        """남은 변경을 모두 flush한 뒤 writer 스레드를 멈춘다."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+
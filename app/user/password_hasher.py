@@ -0,0 +1,152 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.config import (
+    PASSWORD_HASH_ITERATIONS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_QUEUE_TIMEOUT,
+)
+
+ALGORITHM = "pbkdf2_sha256"
+# admit()가 자리를 다시 확인하는 간격(초)
+ADMIT_POLL_INTERVAL = 0.01
+
+
+class PasswordHasherBusy(Exception):
+    """해싱 풀의 대기열이 가득 차서 queue timeout 안에 자리를 얻지 못한 경우."""
+
+
+class PasswordHasher:
+    """
+    PBKDF2-SHA256 비밀번호 해시. 저장 형식: pbkdf2_sha256$<iterations>$<salt>$<hash>
+
+    해싱/검증은 크기가 정해진 스레드 풀에서 실행한다. hashlib.pbkdf2_hmac은 계산 중 GIL을
+    놓기 때문에 스레드로도 코어를 나눠 쓸 수 있다. 풀에 들어가려는 요청은 max_pending 개로
+    제한하고, queue_timeout 초 안에 자리가 나지 않으면 PasswordHasherBusy를 던진다.
+
+    동기 엔드포인트는 anyio 스레드풀(기본 40 토큰)에서 실행되므로 _run의 제한만으로는 토큰을
+    기다리는 요청에 시간 제한이 걸리지 않는다. 그래서 해싱하는 엔드포인트는 스레드풀에 넣기 전에
+    이벤트 루프에서 admit()으로 max_pending 자리를 먼저 얻는다.
+    """
+    def __init__(
+        self,
+        iterations: int = PASSWORD_HASH_ITERATIONS,
+        max_workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        queue_timeout: float = PASSWORD_HASH_QUEUE_TIMEOUT,
+    ) -> None:
+        self.iterations = iterations
+        self.queue_timeout = queue_timeout
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # 스레드풀에 들어가기 전에 잡는 요청 단위 자리 (admit)
+        self._admission = threading.BoundedSemaphore(max_pending)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        이벤트 루프에서 요청 하나의 자리를 얻는다. 스레드/토큰을 잡지 않고 기다리며,
+        queue_timeout 안에 자리가 나지 않으면 PasswordHasherBusy를 던진다.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        while not self._admission.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                raise PasswordHasherBusy("Password hashing queue is full.")
+            await asyncio.sleep(ADMIT_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            self._admission.release()
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy("Password hashing queue is full.")
+        try:
+            return self._pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def is_hashed(stored: str) -> bool:
+        return stored.startswith(ALGORITHM + "$")
+
+    def _hash(self, password: str, salt: bytes, iterations: int) -> str:
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+        return "$".join([
+            ALGORITHM,
+            str(iterations),
+            base64.b64encode(salt).decode("ascii"),
+            base64.b64encode(digest).decode("ascii"),
+        ])
+
+    def hash(self, password: str) -> str:
+        return self._run(self._hash, password, os.urandom(16), self.iterations)
+
+    @staticmethod
+    def _parse(stored: str) -> Optional[Tuple[int, bytes]]:
+        """저장된 해시에서 (iterations, salt). 형식이 깨졌으면 None."""
+        parts = stored.split("$")
+        if len(parts) != 4 or not parts[1].isdigit() or int(parts[1]) < 1:
+            return None
+        try:
+            return int(parts[1]), base64.b64decode(parts[2], validate=True)
+        except binascii.Error:
+            return None
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        여러 비밀번호(bulk 등록 한 chunk)를 풀에 함께 넣고 모은다. 대기열 자리는 하나만 쓰고,
+        한 번에 max_workers 개씩만 넣어서 그 사이 들어온 로그인 해싱이 chunk 전체 뒤로 밀리지 않게 한다.
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy("Password hashing queue is full.")
+        try:
+            hashes: List[str] = []
+            for start in range(0, len(passwords), self.max_workers):
+                futures = [
+                    self._pool.submit(self._hash, password, os.urandom(16), self.iterations)
+                    for password in passwords[start:start + self.max_workers]
+                ]
+                hashes.extend(future.result() for future in futures)
+            return hashes
+        finally:
+            self._slots.release()
+
+    def verify(self, password: str, stored: str) -> bool:
+        if not self.is_hashed(stored):
+            # 해시 도입 전에 저장된 평문 비밀번호
+            return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        parsed = self._parse(stored)
+        if parsed is None:
+            # 접두어만 맞고 형식이 깨진 기록은 어떤 비밀번호로도 통과시키지 않는다
+            return False
+        iterations, salt = parsed
+        candidate = self._run(self._hash, password, salt, iterations)
+        return hmac.compare_digest(candidate.encode("ascii"), stored.encode("ascii"))
+
+    def needs_rehash(self, stored: str) -> bool:
+        parsed = self._parse(stored) if self.is_hashed(stored) else None
+        return parsed is None or parsed[0] != self.iterations
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+_password_hasher: Optional[PasswordHasher] = None
+
+def get_password_hasher() -> PasswordHasher:
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = PasswordHasher()
+    return _password_hasher
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import secrets
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.user.user_schema import User
+from app.config import SESSION_CACHE_SIZE, SESSION_DIR, SESSION_TTL
+
+
+def _email_key(email: str) -> str:
+    # 토큰 앞부분과 세션 디렉토리 이름으로 쓴다. email을 그대로 파일 이름에 넣지 않는다
+    return hashlib.sha256(email.encode("utf-8")).hexdigest()[:16]
+
+
+class SessionCache:
+    """
+    로그인 세션 토큰 -> User 를 들고 있는 메모리 캐시.
+
+    - 크기 제한(max_size)을 넘으면 가장 오래 쓰지 않은 세션부터 버린다 (LRU).
+    - 발급 후 ttl 초가 지난 세션은 조회 시 만료 처리한다.
+    - 비밀번호 변경/탈퇴 시 revoke_email로 해당 사용자의 세션을 모두 폐기한다.
+    - directory가 주어지면 세션을 <directory>/<email 해시>/<토큰> 파일로도 남겨서 서버 워커끼리 나눠 쓴다.
+      다른 워커가 발급한 토큰은 파일에서 읽어 캐시에 올리고, 캐시에 있는 세션도 조회할 때마다 파일이 남아 있는지
+      확인하므로 어느 워커에서 폐기해도 모든 워커에서 바로 무효가 된다. 이때 캐시에서 밀려난 세션은 파일에서 다시 읽는다.
+    """
+    def __init__(self, max_size: int = SESSION_CACHE_SIZE, ttl: float = SESSION_TTL, directory: Optional[str] = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.directory = directory
+        # 만료 시각은 워커끼리 비교할 수 있도록 monotonic이 아니라 time.time() 기준이다
+        self._sessions: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._tokens_by_email: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _path(self, token: str) -> Optional[str]:
+        key, _, secret = token.partition(".")
+        # 토큰은 요청 헤더에서 오므로 경로가 세션 디렉토리 밖을 가리키지 않게 글자를 제한한다
+        if not key or not secret or not (key + secret).replace("-", "").replace("_", "").isalnum():
+            return None
+        return os.path.join(self.directory, key, secret)
+
+    def issue(self, user: User) -> str:
+        token = f"{_email_key(user.email)}.{secrets.token_urlsafe(32)}"
+        expires_at = time.time() + self.ttl
+        if self.directory is not None:
+            path = self._path(token)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 세션 파일에는 비밀번호 해시를 남기지 않는다
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "email": user.email, "username": user.username}, f)
+            os.replace(f"{path}.tmp", path)
+        with self._lock:
+            self._remember(token, expires_at, user.model_copy())
+        return token
+
+    def _remember(self, token: str, expires_at: float, user: User) -> None:
+        self._sessions[token] = (expires_at, user)
+        self._tokens_by_email.setdefault(user.email, set()).add(token)
+        while len(self._sessions) > self.max_size:
+            self._drop(next(iter(self._sessions)))
+
+    def _load(self, token: str) -> Optional[Tuple[float, User]]:
+        """다른 워커가 발급했거나 캐시에서 밀려난 세션을 파일에서 읽는다."""
+        path = self._path(token)
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        user = User.model_construct(email=data["email"], password="", username=data["username"])
+        with self._lock:
+            self._remember(token, data["expires_at"], user)
+        return data["expires_at"], user
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is not None:
+                self._sessions.move_to_end(token)
+        if entry is None and self.directory is not None:
+            entry = self._load(token)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.time():
+            self.revoke(token)
+            return None
+        if self.directory is not None and not os.path.exists(self._path(token)):
+            # 다른 워커에서 폐기된 세션
+            with self._lock:
+                self._drop(token)
+            return None
+        return user.model_copy()
+
+    def revoke(self, token: str) -> None:
+        with self._lock:
+            self._drop(token)
+        path = self._path(token) if self.directory is not None else None
+        if path is not None:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def revoke_email(self, email: str) -> None:
+        with self._lock:
+            for token in list(self._tokens_by_email.get(email, ())):
+                self._drop(token)
+        if self.directory is not None:
+            shutil.rmtree(os.path.join(self.directory, _email_key(email)), ignore_errors=True)
+
+    def prune(self) -> None:
+        """만료된 세션 파일을 지운다. 다시 조회되지 않고 만료된 세션 파일이 쌓이지 않게 주기적으로 부른다."""
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        # 세션 파일은 발급할 때 한 번만 쓰므로 수정 시각 + ttl이 만료 시각이다
+        deadline = time.time() - self.ttl
+        for key in os.listdir(self.directory):
+            user_dir = os.path.join(self.directory, key)
+            for name in os.listdir(user_dir) if os.path.isdir(user_dir) else ():
+                path = os.path.join(user_dir, name)
+                try:
+                    if os.stat(path).st_mtime < deadline:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _drop(self, token: str) -> None:
+        entry = self._sessions.pop(token, None)
+        if entry is None:
+            return
+        email = entry[1].email
+        tokens = self._tokens_by_email.get(email)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_email[email]
+
+
+_session_cache: Optional[SessionCache] = None
+
+def get_session_cache() -> SessionCache:
+    global _session_cache
+    if _session_cache is None:
+        _session_cache = SessionCache(directory=SESSION_DIR or None)
+    return _session_cache
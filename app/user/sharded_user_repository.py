@@ -0,0 +1,276 @@
+import heapq
+import json
+import os
+import threading
+import zlib
+from argparse import ArgumentParser
+from typing import Dict, List, Optional, Tuple
+
+from app.user.base_user_repository import BaseUserRepository, sort_key
+from app.user.user_repository import UserRepository
+from app.user.user_schema import User
+from app.config import USER_DATA, USER_SHARD_DIR, USER_SHARDS
+
+META_FILE = "shards.json"
+# 이전 버전의 전역 색인. 열 때 username 파티션으로 옮기고 지운다
+LEGACY_INDEX_FILE = "index.json"
+
+
+def shard_index(key: str, shards: int) -> int:
+    # hash()는 프로세스마다 달라지므로 워커/재시작 간에 고정된 crc32를 쓴다
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+def shard_path(directory: str, index: int) -> str:
+    return os.path.join(directory, f"users-{index:03d}.json")
+
+
+def username_path(directory: str, index: int) -> str:
+    return os.path.join(directory, f"usernames-{index:03d}.json")
+
+
+def username_entry(user: User) -> User:
+    # username 파티션에는 (email, username)만 두고 비밀번호는 두지 않는다
+    return User.model_construct(email=user.email, password="", username=user.username)
+
+
+class ShardedUserRepository(BaseUserRepository):
+    """
+    email 해시로 나눈 N개의 UserRepository(스냅샷 + 저널)를 묶은 저장소.
+
+    변경은 해당 email의 샤드 저널에만 기록되고, 샤드는 처음 접근할 때 로드한다.
+    샤드 개수는 shards.json에 기록해 두고, 다르면 reshard 후에만 열 수 있다.
+
+    username은 username 해시로 나눈 N개의 파티션(usernames-NNN.json, (email, username)만 담은
+    UserRepository)에 따로 둔다. 등록은 username 파티션에 조건부로 먼저 기록해서 username을 선점한 뒤
+    email 샤드에 조건부로 쓰므로, 한 변경이 잠그는 파일은 많아야 두 개(email 샤드와 username 파티션)다.
+    삭제는 샤드에서 지운 뒤 파티션에서 뺀다. 그 사이에 죽으면 파티션에만 남은 항목은 목록에서 건너뛰고
+    그 username은 reshard로 파티션을 다시 만들 때까지 쓸 수 없다 (중복은 생기지 않는다).
+    """
+    def __init__(self, directory: str = USER_SHARD_DIR, shards: int = USER_SHARDS) -> None:
+        self.directory = directory
+        self.num_shards = shards
+        os.makedirs(directory, exist_ok=True)
+        self._shards: List[Optional[UserRepository]] = [None] * shards
+        self._usernames: List[Optional[UserRepository]] = [None] * shards
+        self._lock = threading.Lock()
+        self._check_meta()
+
+    def _check_meta(self) -> None:
+        meta_path = os.path.join(self.directory, META_FILE)
+        if not os.path.exists(meta_path):
+            write_usernames(self.directory, {}, self.num_shards)
+            write_meta(self.directory, self.num_shards)
+            return
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta["shards"] != self.num_shards:
+            raise ValueError(f"Shard count mismatch: store has {meta['shards']}, config has {self.num_shards}")
+        if not meta.get("usernames"):
+            # username 파티션이 생기기 전에 만든 저장소: 샤드를 한 번 모두 읽어서 파티션을 만든다
+            users: Dict[str, User] = {}
+            for index in range(self.num_shards):
+                users.update(self._shard_at(index).users)
+            write_usernames(self.directory, users, self.num_shards)
+            for suffix in ("", ".journal", ".lock"):
+                path = os.path.join(self.directory, LEGACY_INDEX_FILE + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+            write_meta(self.directory, self.num_shards)
+
+    def _open(self, repos: List[Optional[UserRepository]], path: str, index: int) -> UserRepository:
+        repo = repos[index]
+        if repo is None:
+            with self._lock:
+                repo = repos[index]
+                if repo is None:
+                    if not os.path.exists(path):
+                        with open(path, "w") as f:
+                            json.dump({}, f)
+                    repo = repos[index] = UserRepository(path)
+        return repo
+
+    def _shard(self, email: str) -> UserRepository:
+        return self._shard_at(shard_index(email, self.num_shards))
+
+    def _shard_at(self, index: int) -> UserRepository:
+        return self._open(self._shards, shard_path(self.directory, index), index)
+
+    def _usernames_for(self, username: str) -> UserRepository:
+        return self._usernames_at(shard_index(username, self.num_shards))
+
+    def _usernames_at(self, index: int) -> UserRepository:
+        return self._open(self._usernames, username_path(self.directory, index), index)
+
+    def loaded_shards(self) -> List[UserRepository]:
+        return [shard for shard in self._shards if shard is not None]
+
+    def loaded_repositories(self) -> List[UserRepository]:
+        return self.loaded_shards() + [part for part in self._usernames if part is not None]
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        return self._shard(email).get_user_by_email(email)
+
+    def list_users(
+        self, prefix: str = "", by: str = "email", after: Optional[Tuple[str, ...]] = None, limit: int = 50
+    ) -> List[User]:
+        # username 파티션들의 정렬된 페이지를 합쳐서 한 페이지를 만들고 그 사용자들의 샤드만 연다.
+        # 파티션에만 남은 항목은 건너뛰고 그만큼 더 읽는다
+        users: List[User] = []
+        while len(users) < limit:
+            wanted = limit - len(users)
+            pages = [self._usernames_at(i).list_users(prefix, by, after, wanted) for i in range(self.num_shards)]
+            entries = list(heapq.merge(*pages, key=lambda u: sort_key(u, by)))[:wanted]
+            for entry in entries:
+                user = self._shard(entry.email).get_user_by_email(entry.email)
+                if user is not None and user.username == entry.username:
+                    users.append(user)
+            if len(entries) < wanted:
+                break
+            after = sort_key(entries[-1], by)
+        return users
+
+    def username_exists(self, username: str) -> bool:
+        return self._usernames_for(username).username_exists(username)
+
+    def _claim(self, old: Dict[str, Optional[User]], users: List[User]) -> List[User]:
+        # 무조건 쓰는 경로(save_user/save_users/update_user)는 username이 바뀌었을 수 있다.
+        # 샤드에 쓰기 전에 새 username을 파티션에 넣고, 다른 파티션에 남은 예전 항목(샤드에 쓴 뒤 뺄 것)을 돌려준다
+        changed = [user for user in users if getattr(old.get(user.email), "username", None) != user.username]
+        for index, group in self._group_by(changed, lambda user: user.username).items():
+            self._usernames_at(index).save_users([username_entry(user) for user in group])
+        return [
+            old[user.email] for user in changed
+            if old.get(user.email) is not None
+            and shard_index(old[user.email].username, self.num_shards) != shard_index(user.username, self.num_shards)
+        ]
+
+    def _release(self, users: List[User]) -> None:
+        # 파티션 삭제는 조건 없이 한다 (이미 빠진 항목이면 아무 일도 없다)
+        for index, group in self._group_by(users, lambda user: user.username).items():
+            self._usernames_at(index).delete_users([username_entry(user) for user in group])
+
+    def save_user(self, user: User) -> User:
+        return self.save_users([user])[0]
+
+    def delete_user(self, user: User) -> User:
+        self._shard(user.email).delete_user(user)
+        self._release([user])
+        return user
+
+    def create_user(self, user: User) -> User:
+        # username 파티션에 먼저 써서 username을 선점한다. 이미 있으면 여기서 ValueError
+        self._usernames_for(user.username).create_user(username_entry(user))
+        try:
+            return self._shard(user.email).create_user(user)
+        except BaseException:
+            self._release([user])
+            raise
+
+    def update_user(self, user: User, expected_password: Optional[str] = None) -> User:
+        shard = self._shard(user.email)
+        old = shard.get_user_by_email(user.email)
+        moved = self._claim({user.email: old}, [user])
+        shard.update_user(user, expected_password)
+        self._release(moved)
+        return user
+
+    def create_users(self, users: List[User]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = [None] * len(users)
+        # username 파티션마다, 그다음 email 샤드마다 한 번씩만 flush 한다
+        for index, group in self._group_by(list(enumerate(users)), lambda row: row[1].username).items():
+            results = self._usernames_at(index).create_users([username_entry(user) for _, user in group])
+            for (i, _), error in zip(group, results):
+                errors[i] = error
+        reserved = [(i, user) for i, user in enumerate(users) if errors[i] is None]
+        for group in self._group_by(reserved, lambda row: row[1].email).values():
+            results = self._shard(group[0][1].email).create_users([user for _, user in group])
+            for (i, _), error in zip(group, results):
+                errors[i] = error
+            failed = [user for (_, user), error in zip(group, results) if error is not None]
+            if failed:
+                self._release(failed)
+        return errors
+
+    def _group_by(self, items: list, key) -> Dict[int, list]:
+        groups: Dict[int, list] = {}
+        for item in items:
+            groups.setdefault(shard_index(key(item), self.num_shards), []).append(item)
+        return groups
+
+    def save_users(self, users: List[User]) -> List[User]:
+        moved = self._claim({user.email: self.get_user_by_email(user.email) for user in users}, users)
+        # 샤드마다 한 번씩만 flush 한다
+        for group in self._group_by(users, lambda user: user.email).values():
+            self._shard(group[0].email).save_users(group)
+        self._release(moved)
+        return users
+
+    def delete_users(self, users: List[User]) -> List[User]:
+        for group in self._group_by(users, lambda user: user.email).values():
+            self._shard(group[0].email).delete_users(group)
+        self._release(users)
+        return users
+
+    def compact_if_needed(self) -> None:
+        for repo in self.loaded_repositories():
+            repo.compact_if_needed()
+
+    def after_fork(self) -> None:
+        for repo in self.loaded_repositories():
+            repo.after_fork()
+
+    def close(self) -> None:
+        for repo in self.loaded_repositories():
+            repo.close()
+
+
+def write_meta(directory: str, shards: int) -> None:
+    tmp_path = os.path.join(directory, f"{META_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"shards": shards, "usernames": True}, f)
+    os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+
+def write_buckets(directory: str, prefix: str, path, buckets: List[Dict[str, dict]]) -> None:
+    """prefix로 시작하는 예전 파일(저널 포함)을 지우고 bucket마다 스냅샷 파일을 새로 쓴다."""
+    for name in os.listdir(directory):
+        if name.startswith(prefix):
+            os.remove(os.path.join(directory, name))
+    for index, bucket in enumerate(buckets):
+        with open(f"{path(directory, index)}.tmp", "w") as f:
+            json.dump(bucket, f)
+        os.replace(f"{path(directory, index)}.tmp", path(directory, index))
+
+
+def write_usernames(directory: str, users: Dict[str, User], shards: int) -> None:
+    """username 파티션들을 users로 새로 쓴다."""
+    buckets: List[Dict[str, dict]] = [{} for _ in range(shards)]
+    for email, user in users.items():
+        buckets[shard_index(user.username, shards)][email] = username_entry(user).model_dump()
+    write_buckets(directory, "usernames-", username_path, buckets)
+
+
+def reshard(users: Dict[str, User], directory: str, shards: int) -> None:
+    """사용자 전체를 shards개의 스냅샷 파일로 다시 나눠 쓴다."""
+    os.makedirs(directory, exist_ok=True)
+    buckets: List[Dict[str, dict]] = [{} for _ in range(shards)]
+    for email, user in users.items():
+        buckets[shard_index(email, shards)][email] = user.model_dump()
+    write_buckets(directory, "users-", shard_path, buckets)
+    write_usernames(directory, users, shards)
+    write_meta(directory, shards)
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Split users.json (snapshot + journal) into hash-sharded files.")
+    parser.add_argument('-i', '--input', type=str, default=USER_DATA, help="users.json path. Example: database/users.json")
+    parser.add_argument('-o', '--output_dir', type=str, default=USER_SHARD_DIR, help="Shard directory. Example: database/users")
+    parser.add_argument('-n', '--shards', type=int, default=USER_SHARDS, help="Number of shards.")
+    return parser
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    source = UserRepository(args.input)
+    reshard(source.users, args.output_dir, args.shards)
+    print(f"Resharded {len(source.users)} users from {args.input} into {args.shards} shards in {args.output_dir}")
@@ -0,0 +1,60 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+Key = Tuple[str, ...]
+
+
+class SortedIndex:
+    """
+    정렬된 키(튜플) 리스트로 만든 보조 인덱스.
+
+    키의 첫 원소가 검색 대상(email 또는 username)이고, 중복을 허용해야 하면 뒤에 email을 붙인다.
+    존재 확인/범위 시작점 찾기는 bisect로 O(log n), 삽입/삭제는 리스트 memmove 한 번이다.
+    페이지 조회는 시작점부터 limit 개만 읽으므로 전체를 훑지 않는다.
+    """
+    __slots__ = ("_keys",)
+
+    def __init__(self, keys: Iterable[Key] = ()) -> None:
+        self._keys: List[Key] = sorted(keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Key) -> None:
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            self._keys.insert(i, key)
+
+    def remove(self, key: Key) -> None:
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def contains_first(self, value: str) -> bool:
+        """첫 원소가 value인 키가 있는지 확인한다."""
+        i = bisect_left(self._keys, (value,))
+        return i < len(self._keys) and self._keys[i][0] == value
+
+    def with_first(self, value: str) -> List[Key]:
+        """첫 원소가 value인 키들 (예: 같은 username을 쓰는 (username, email) 키)."""
+        keys = self._keys
+        i = bisect_left(keys, (value,))
+        result: List[Key] = []
+        while i < len(keys) and keys[i][0] == value:
+            result.append(keys[i])
+            i += 1
+        return result
+
+    def page(self, prefix: str = "", after: Optional[Key] = None, limit: int = 50) -> List[Key]:
+        """첫 원소가 prefix로 시작하고 after보다 큰 키를 정렬 순서대로 최대 limit 개 돌려준다."""
+        keys = self._keys
+        if after is not None and after >= (prefix,):
+            start = bisect_right(keys, after)
+        else:
+            start = bisect_left(keys, (prefix,))
+        result: List[Key] = []
+        for i in range(start, min(start + limit, len(keys))):
+            if not keys[i][0].startswith(prefix):
+                break
+            result.append(keys[i])
+        return result
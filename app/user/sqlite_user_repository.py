@@ -0,0 +1,241 @@
+import queue
+import sqlite3
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+
+from app.metrics import metrics
+from app.user.base_user_repository import (
+    BaseUserRepository, PASSWORD_CHANGED, USER_EXISTS, USER_NOT_FOUND, USERNAME_EXISTS,
+)
+from app.user.group_commit import GroupCommitWriter
+from app.user.user_schema import User
+from app.config import USER_DATA, USER_DB, USER_DB_POOL_SIZE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT NOT NULL,
+    password TEXT NOT NULL,
+    username TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username, email);
+"""
+
+# 쿼리 문자열을 고정해 두면 sqlite3 모듈의 statement cache가 prepared statement를 재사용한다
+SELECT_USER = "SELECT email, password, username FROM users WHERE email = ?"
+UPSERT_USER = (
+    "INSERT INTO users (email, password, username) VALUES (?, ?, ?) "
+    "ON CONFLICT (email) DO UPDATE SET password = excluded.password, username = excluded.username"
+)
+DELETE_USER = "DELETE FROM users WHERE email = ?"
+USERNAME_EXISTS_QUERY = "SELECT 1 FROM users WHERE username = ? LIMIT 1"
+USERNAME_TAKEN = "SELECT 1 FROM users WHERE username = ? AND email != ? LIMIT 1"
+# 조건부 변경: op 맨 앞에 (조건, 인자)를 두면 writer가 같은 트랜잭션 안에서 확인하고, 맞지 않으면 그 op만 건너뛴다
+EXPECT_NEW = "expect_new"            # (email, username): email도 username도 아직 없어야 한다
+EXPECT_EXISTS = "expect_exists"      # (email,): 사용자가 있어야 한다
+EXPECT_PASSWORD = "expect_password"  # (email, password): 저장된 비밀번호 해시가 password여야 한다
+# (EACH, [op, ...]): 여러 op를 한 번에 넣되 조건은 op마다 따로 확인하고, op별 오류 메시지 목록을 돌려받는다
+EACH = "each"
+# 접두어 검색은 [prefix, prefix + U+10FFFF) 범위 조회로 바꿔서 인덱스를 탄다
+LIST_BY_EMAIL = (
+    "SELECT email, password, username FROM users "
+    "WHERE email >= ? AND email < ? AND email > ? ORDER BY email LIMIT ?"
+)
+LIST_BY_USERNAME = (
+    "SELECT email, password, username FROM users "
+    "WHERE username >= ? AND username < ? AND (username, email) > (?, ?) ORDER BY username, email LIMIT ?"
+)
+PREFIX_END = "\U0010ffff"
+
+
+class SqliteUserRepository(BaseUserRepository):
+    """
+    SQLite 기반 사용자 저장소. UserRepository와 같은 인터페이스를 제공한다.
+
+    WAL 모드라 여러 reader가 writer를 기다리지 않고, email 인덱스로 조회한다.
+    커넥션은 작은 풀에서 빌려 쓰고 돌려준다. 쓰기는 GroupCommitWriter로 모아
+    한 트랜잭션으로 커밋한다.
+    """
+    def __init__(self, path: str = USER_DB, pool_size: int = USER_DB_POOL_SIZE) -> None:
+        self.path = path
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+        self._writer = GroupCommitWriter(self._write_batch)
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: 문장 단위 autocommit, 배치는 BEGIN/COMMIT으로 직접 묶는다
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        start = time.perf_counter()
+        with self._connection() as conn:
+            row = conn.execute(SELECT_USER, (email,)).fetchone()
+        metrics.observe_repository("sqlite", "lookup", time.perf_counter() - start)
+        return User.model_construct(email=row[0], password=row[1], username=row[2]) if row else None
+
+    def list_users(
+        self, prefix: str = "", by: str = "email", after: Optional[Tuple[str, ...]] = None, limit: int = 50
+    ) -> List[User]:
+        bounds = (prefix, prefix + PREFIX_END)
+        with self._connection() as conn:
+            if by == "email":
+                rows = conn.execute(LIST_BY_EMAIL, (*bounds, after[0] if after else "", limit)).fetchall()
+            else:
+                rows = conn.execute(LIST_BY_USERNAME, (*bounds, *(after or ("", "")), limit)).fetchall()
+        return [User.model_construct(email=row[0], password=row[1], username=row[2]) for row in rows]
+
+    def username_exists(self, username: str) -> bool:
+        with self._connection() as conn:
+            return conn.execute(USERNAME_EXISTS_QUERY, (username,)).fetchone() is not None
+
+    @staticmethod
+    def _check(conn: sqlite3.Connection, condition: str, params: tuple) -> Optional[str]:
+        """조건부 변경의 조건을 확인한다. 맞지 않으면 오류 메시지."""
+        row = conn.execute(SELECT_USER, params[:1]).fetchone()
+        if condition == EXPECT_NEW:
+            if row is not None:
+                return USER_EXISTS
+            if conn.execute(USERNAME_TAKEN, (params[1], params[0])).fetchone() is not None:
+                return USERNAME_EXISTS
+            return None
+        if row is None:
+            return USER_NOT_FOUND
+        if condition == EXPECT_PASSWORD and row[1] != params[1]:
+            return PASSWORD_CHANGED
+        return None
+
+    def _execute(self, conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]) -> Tuple[Optional[str], int]:
+        """batch의 조건을 모두 확인하고 통과하면 실행한다 (전부 아니면 전무). 조건이 맞지 않으면 오류 메시지."""
+        conditions = [(sql, params) for sql, params in batch if sql in (EXPECT_NEW, EXPECT_EXISTS, EXPECT_PASSWORD)]
+        error = next((e for e in (self._check(conn, *c) for c in conditions) if e), None)
+        if error:
+            return error, 0
+        nbytes = 0
+        for sql, params in batch[len(conditions):]:
+            conn.execute(sql, params)
+            nbytes += sum(len(p) for p in params)
+        return None, nbytes
+
+    def _write_batch(self, batches: List[Any]) -> List[Any]:
+        # op는 (sql, params) 목록(전부 아니면 전무, 결과는 ValueError 또는 None)이거나
+        # (EACH, [op, ...])(op마다 따로 확인, 결과는 op별 오류 메시지 목록)이다
+        start = time.perf_counter()
+        nbytes = 0
+        results: List[Any] = []
+        with self._connection() as conn:
+            # IMMEDIATE: 처음부터 쓰기 잠금을 잡아서, 다른 프로세스의 쓰기가 조건 확인과 기록 사이에 끼지 않는다
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for batch in batches:
+                    if isinstance(batch, tuple) and batch[0] == EACH:
+                        errors = []
+                        for op in batch[1]:
+                            error, written = self._execute(conn, op)
+                            errors.append(error)
+                            nbytes += written
+                        results.append(errors)
+                    else:
+                        error, written = self._execute(conn, batch)
+                        results.append(ValueError(error) if error else None)
+                        nbytes += written
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        metrics.observe_repository("sqlite", "flush", time.perf_counter() - start, nbytes)
+        return results
+
+    def save_user(self, user: User) -> User:
+        self._writer.submit([(UPSERT_USER, (user.email, user.password, user.username))]).result()
+        return user
+
+    def delete_user(self, user: User) -> User:
+        self._writer.submit([(EXPECT_EXISTS, (user.email,)), (DELETE_USER, (user.email,))]).result()
+        return user
+
+    def create_user(self, user: User) -> User:
+        self._writer.submit(self._create_op(user)).result()
+        return user
+
+    @staticmethod
+    def _create_op(user: User) -> List[Tuple[str, tuple]]:
+        return [(EXPECT_NEW, (user.email, user.username)), (UPSERT_USER, (user.email, user.password, user.username))]
+
+    def update_user(self, user: User, expected_password: Optional[str] = None) -> User:
+        condition = (EXPECT_EXISTS, (user.email,)) if expected_password is None \
+            else (EXPECT_PASSWORD, (user.email, expected_password))
+        self._writer.submit([condition, (UPSERT_USER, (user.email, user.password, user.username))]).result()
+        return user
+
+    def create_users(self, users: List[User]) -> List[Optional[str]]:
+        # 행마다 따로 확인하되 하나의 op로 넣어서 한 트랜잭션에 기록된다
+        return self._writer.submit((EACH, [self._create_op(u) for u in users])).result()
+
+    def save_users(self, users: List[User]) -> List[User]:
+        self._writer.submit([(UPSERT_USER, (u.email, u.password, u.username)) for u in users]).result()
+        return users
+
+    def delete_users(self, users: List[User]) -> List[User]:
+        self._writer.submit([(DELETE_USER, (u.email,)) for u in users]).result()
+        return users
+
+    def import_users(self, users) -> int:
+        """여러 사용자를 한 트랜잭션으로 저장한다."""
+        rows = [(u.email, u.password, u.username) for u in users]
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(UPSERT_USER, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def after_fork(self) -> None:
+        # SQLite 커넥션은 fork를 넘겨 쓰면 안 된다 (닫는 것도 포함). 물려받은 커넥션은 닫지 않고 쥐고만 있고 새 풀을 만든다
+        inherited = []
+        while not self._pool.empty():
+            inherited.append(self._pool.get_nowait())
+        self._inherited = inherited
+        for _ in range(len(inherited)):
+            self._pool.put(self._connect())
+
+    def close(self) -> None:
+        self._writer.close()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Import users.json (snapshot + journal) into the SQLite user store.")
+    parser.add_argument('-i', '--input', type=str, default=USER_DATA, help="users.json path. Example: database/users.json")
+    parser.add_argument('-o', '--output', type=str, default=USER_DB, help="SQLite database path. Example: database/users.db")
+    return parser
+
+if __name__ == "__main__":
+    from app.user.user_repository import UserRepository
+
+    args = create_parser().parse_args()
+    source = UserRepository(args.input)
+    target = SqliteUserRepository(args.output)
+    count = target.import_users(source.users.values())
+    target.close()
+    print(f"Imported {count} users from {args.input} into {args.output}")
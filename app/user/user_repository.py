@@ -1,33 +1,308 @@
 import json
+import os
+import threading
+import time
+from contextlib import contextmanager
 
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from app.metrics import metrics
+from app.user.base_user_repository import (
+    BaseUserRepository, PASSWORD_CHANGED, USER_EXISTS, USER_NOT_FOUND, USERNAME_EXISTS,
+)
+from app.user.group_commit import GroupCommitWriter
+from app.user.sorted_index import SortedIndex
 from app.user.user_schema import User
-from app.config import USER_DATA
+from app.config import USER_DATA, USER_COMPACT_THRESHOLD, USER_JOURNAL_FSYNC
 
-class UserRepository:
-    def __init__(self) -> None:
-        self.users: Dict[str, dict] = self._load_users()
+try:
+    import fcntl
+except ImportError:  # Windows: advisory lock 없이 단일 워커로만 사용
+    fcntl = None  # type: ignore
 
-    def _load_users(self) -> Dict[str, Dict]:
+class UserRepository(BaseUserRepository):
+    """
+    users.json(스냅샷) + users.json.journal(append-only 로그) 기반 저장소.
+
+    - 변경(register / update-password / delete)은 저널에 한 줄씩 추가만 한다.
+      모든 변경은 GroupCommitWriter 한 곳을 거치며, 함께 들어온 변경은 한 번의 fsync로 기록된다.
+    - compact()가 저널을 스냅샷에 합친다 (임시 파일에 쓴 뒤 os.replace).
+    - 시작 시 스냅샷을 읽고 저널을 재생한다. 마지막 줄이 중간에 끊겼다면 버린다.
+
+    uvicorn 워커가 여러 개일 때:
+    - 쓰기와 compaction은 users.json.lock 에 대한 advisory lock(flock) 안에서만 한다.
+    - 저널 파일의 (inode, 크기)가 버전 스탬프다. 읽기 전에 stat 한 번으로 확인해서
+      크기만 늘었으면 새로 추가된 줄만 읽고, compaction으로 inode가 바뀌었으면 전체를 다시 읽는다.
+
+    email / (username, email) 정렬 인덱스를 함께 들고 있다가 변경이 반영될 때마다 갱신한다.
+    """
+    def __init__(self, path: str = USER_DATA) -> None:
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.lock_path = f"{path}.lock"
+        self._lock = threading.RLock()
+        self._lock_file = open(self.lock_path, "a")
+        self._journal = None
+        # email -> User, 한 프로세스에서 한 번만 로드해서 계속 재사용
+        self.users: Dict[str, User] = {}
+        # 목록/접두어 검색용 정렬 인덱스. 전체 로드 중에는 None (다 읽은 뒤 한 번에 정렬)
+        self._indexes: Optional[Dict[str, SortedIndex]] = None
+        with self._file_lock():
+            self._reload(truncate_torn=True)
+        self._writer = GroupCommitWriter(self._write_batch)
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
         try:
-            with open(USER_DATA, "r") as f:
-                return json.load(f)
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load_users(self) -> Dict[str, User]:
+        try:
+            with open(self.path, "r") as f:
+                raw = json.load(f)
         except FileNotFoundError:
             raise ValueError("File not found")
+        # 저장된 데이터는 이미 검증을 거쳤으므로 재검증 없이 모델만 구성
+        return {email: User.model_construct(**data) for email, data in raw.items()}
+
+    def _reload(self, truncate_torn: bool = False) -> None:
+        """스냅샷 + 저널 전체를 다시 읽는다. 호출하는 쪽에서 file lock을 잡고 있어야 한다."""
+        start = time.perf_counter()
+        self._indexes = None
+        self.users = self._load_users()
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, "a+b")
+        self._journal_ino = os.fstat(self._journal.fileno()).st_ino
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._read_journal_tail(truncate_torn)
+        # 저널 재생 중에 한 줄씩 끼워 넣지 않고, 최종 상태를 한 번에 정렬한다
+        self._indexes = {
+            "email": SortedIndex((email,) for email in self.users),
+            "username": SortedIndex((user.username, email) for email, user in self.users.items()),
+        }
+        nbytes = os.path.getsize(self.path) + self._journal_offset
+        metrics.observe_repository("json", "load", time.perf_counter() - start, nbytes)
+
+    def _read_journal_tail(self, truncate_torn: bool = False) -> None:
+        self._journal.seek(self._journal_offset)
+        data = self._journal.read()
+        # 다른 워커가 아직 쓰고 있는 마지막 줄은 완성될 때까지 건너뛴다
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.splitlines(keepends=True):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            self._apply(entry)
+            self._journal_entries += 1
+            self._journal_offset += len(line)
+        if truncate_torn and self._journal_offset != os.fstat(self._journal.fileno()).st_size:
+            # 쓰다가 죽어서 끊긴 마지막 줄: 여기까지만 유효
+            self._journal.truncate(self._journal_offset)
+
+    def _refresh(self, locked: bool = False) -> None:
+        """버전 스탬프를 확인하고 다른 워커의 변경분만 반영한다."""
+        try:
+            st = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return
+        if st.st_ino == self._journal_ino and st.st_size == self._journal_offset:
+            return
+        with self._lock:
+            if st.st_ino != self._journal_ino:
+                if locked:
+                    self._reload()
+                else:
+                    with self._file_lock(shared=True):
+                        self._reload()
+            else:
+                self._read_journal_tail()
+
+    def _apply(self, entry: dict) -> None:
+        if entry["op"] == "put":
+            user = User.model_construct(**entry["user"])
+            old = self.users.get(user.email)
+            self.users[user.email] = user
+            if self._indexes is not None:
+                if old is None:
+                    self._indexes["email"].add((user.email,))
+                elif old.username != user.username:
+                    self._indexes["username"].remove((old.username, old.email))
+                self._indexes["username"].add((user.username, user.email))
+        elif entry["op"] == "del":
+            old = self.users.pop(entry["email"], None)
+            if old is not None and self._indexes is not None:
+                self._indexes["email"].remove((old.email,))
+                self._indexes["username"].remove((old.username, old.email))
+
+    def _username_taken(self, username: str, email: str, staged: Dict[str, Optional[User]]) -> bool:
+        """email이 아닌 다른 사용자가 username을 쓰고 있는지. staged(같은 flush의 앞선 변경)를 먼저 본다."""
+        if any(user is not None and user.username == username and key != email for key, user in staged.items()):
+            return True
+        return any(owner != email and owner not in staged for _, owner in self._indexes["username"].with_first(username))
+
+    def _check(self, entry: dict, staged: Dict[str, Optional[User]]) -> Optional[str]:
+        """조건부 변경(expect)을 지금 상태 + staged에 대해 확인한다. 조건이 맞지 않으면 오류 메시지."""
+        expect = entry.get("expect")
+        if expect is None:
+            return None
+        email = entry["user"]["email"] if entry["op"] == "put" else entry["email"]
+        current = staged[email] if email in staged else self.users.get(email)
+        if expect == "new":
+            if current is not None:
+                return USER_EXISTS
+            if self._username_taken(entry["user"]["username"], email, staged):
+                return USERNAME_EXISTS
+            return None
+        if current is None:
+            return USER_NOT_FOUND
+        if "expect_password" in entry and current.password != entry["expect_password"]:
+            return PASSWORD_CHANGED
+        return None
+
+    def _stage(self, batch: List[dict], staged: Dict[str, Optional[User]], entries: List[dict]) -> Optional[str]:
+        """batch의 조건을 모두 확인하고 통과하면 entries에 넣는다 (전부 아니면 전무). 조건이 맞지 않으면 오류 메시지."""
+        error = next((e for e in (self._check(entry, staged) for entry in batch) if e), None)
+        if error:
+            return error
+        for entry in batch:
+            entry = {key: value for key, value in entry.items() if key not in ("expect", "expect_password")}
+            if entry["op"] == "put":
+                staged[entry["user"]["email"]] = User.model_construct(**entry["user"])
+            else:
+                staged[entry["email"]] = None
+            entries.append(entry)
+        return None
+
+    def _write_batch(self, batches: List[Any]) -> List[Any]:
+        # writer 스레드에서만 호출된다. 다른 워커의 변경까지 읽은 뒤 파일 잠금 안에서 조건을 확인하므로
+        # 확인과 기록 사이에 끼어드는 변경이 없다. 통과한 변경만 기록하고, 디스크에 남은 뒤에 메모리에 반영.
+        # op는 entry 목록(전부 아니면 전무, 결과는 ValueError 또는 None)이거나
+        # {"each": [...]}(entry마다 따로 확인, 결과는 entry별 오류 메시지 목록)이다
+        start = time.perf_counter()
+        with self._lock, self._file_lock():
+            self._refresh(locked=True)
+            staged: Dict[str, Optional[User]] = {}
+            results: List[Any] = []
+            entries: List[dict] = []
+            for batch in batches:
+                if isinstance(batch, dict):
+                    results.append([self._stage([entry], staged, entries) for entry in batch["each"]])
+                else:
+                    error = self._stage(batch, staged, entries)
+                    results.append(ValueError(error) if error else None)
+            data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+            if entries:
+                self._journal.write(data)
+                self._journal.flush()
+                if USER_JOURNAL_FSYNC:
+                    os.fsync(self._journal.fileno())
+                self._journal_offset += len(data)
+                for entry in entries:
+                    self._apply(entry)
+                self._journal_entries += len(entries)
+        metrics.observe_repository("json", "flush", time.perf_counter() - start, len(data))
+        return results
+
+    def _append(self, entries: List[dict]) -> None:
+        self._writer.submit(entries).result()
+
+    def compact(self) -> None:
+        """저널 내용을 스냅샷에 합치고 빈 저널로 교체한다."""
+        with self._lock, self._file_lock():
+            self._refresh(locked=True)
+            if self._journal_entries == 0:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({email: user.model_dump() for email, user in self.users.items()}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            # 저널은 새 파일로 교체해서 inode를 바꾼다: 다른 워커는 이를 보고 전체를 다시 읽는다.
+            # 교체 전에 죽더라도 저널 재생은 멱등이라 안전하다
+            tmp_journal = f"{self.journal_path}.tmp"
+            open(tmp_journal, "wb").close()
+            os.replace(tmp_journal, self.journal_path)
+            self._reload()
+
+    def compact_if_needed(self) -> None:
+        if self._journal_entries >= USER_COMPACT_THRESHOLD:
+            self.compact()
+
+    def after_fork(self) -> None:
+        # flock과 읽기 위치는 열린 파일(open file description)에 붙어 있어서, 물려받은 핸들을 그대로 쓰면
+        # 워커끼리 잠금이 서로를 막지 못하고 저널 읽기 위치도 섞인다. 경로로 다시 연다 (users dict는 그대로 공유).
+        # 저널이 그 사이 compaction으로 바뀌었으면 다음 _refresh가 inode를 보고 전체를 다시 읽는다
+        with self._lock:
+            self._lock_file.close()
+            self._lock_file = open(self.lock_path, "a")
+            self._journal.close()
+            self._journal = open(self.journal_path, "a+b")
+
+    def close(self) -> None:
+        self._writer.close()
+        self.compact()
+        self._journal.close()
+        self._lock_file.close()
 
     def get_user_by_email(self, email: str) -> Optional[User]:
+        start = time.perf_counter()
+        self._refresh()
         user = self.users.get(email)
-        return User(**user) if user else None
+        metrics.observe_repository("json", "lookup", time.perf_counter() - start)
+        # 호출한 쪽에서 수정해도 인덱스가 바뀌지 않도록 복사본을 반환
+        return user.model_copy() if user else None
+
+    def list_users(
+        self, prefix: str = "", by: str = "email", after: Optional[Tuple[str, ...]] = None, limit: int = 50
+    ) -> List[User]:
+        self._refresh()
+        with self._lock:
+            keys = self._indexes[by].page(prefix, after, limit)
+            # 페이지에 들어간 사용자만 복사한다
+            return [self.users[key[-1]].model_copy() for key in keys]
 
-    def save_user(self, user: User) -> User: 
-        self.users[user.email] = user.model_dump()
-        with open(USER_DATA, "w") as f:
-            json.dump(self.users, f)
+    def username_exists(self, username: str) -> bool:
+        self._refresh()
+        with self._lock:
+            return self._indexes["username"].contains_first(username)
+
+    def save_user(self, user: User) -> User:
+        self._append([{"op": "put", "user": user.model_dump()}])
         return user
 
     def delete_user(self, user: User) -> User:
-        del self.users[user.email]
-        with open(USER_DATA, "w") as f:
-            json.dump(self.users, f)
-        return user
\ No newline at end of file
+        self._append([{"op": "del", "email": user.email, "expect": "exists"}])
+        return user
+
+    def create_user(self, user: User) -> User:
+        self._append([{"op": "put", "user": user.model_dump(), "expect": "new"}])
+        return user
+
+    def update_user(self, user: User, expected_password: Optional[str] = None) -> User:
+        entry = {"op": "put", "user": user.model_dump(), "expect": "exists"}
+        if expected_password is not None:
+            entry["expect_password"] = expected_password
+        self._append([entry])
+        return user
+
+    def create_users(self, users: List[User]) -> List[Optional[str]]:
+        # 행마다 따로 확인하되 하나의 op로 넣어서 한 번의 flush에 기록된다
+        return self._writer.submit({"each": [{"op": "put", "user": u.model_dump(), "expect": "new"} for u in users]}).result()
+
+    def save_users(self, users: List[User]) -> List[User]:
+        self._append([{"op": "put", "user": user.model_dump()} for user in users])
+        return users
+
+    def delete_users(self, users: List[User]) -> List[User]:
+        self._append([{"op": "del", "email": user.email} for user in users])
+        return users
@@ -1,23 +1,145 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from app.user.user_schema import User, UserLogin, UserUpdate, UserDeleteRequest
+from typing import AsyncIterator, Callable, List, Optional, Tuple, Type
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from app.user.user_schema import User, UserLogin, UserUpdate, UserDeleteRequest, BulkRowResult, UserPage, UserSummary
 from app.user.user_service import UserService
-from app.dependencies import get_user_service
-from app.responses.base_response import BaseResponse
+from app.dependencies import admit_password_hashing, get_user_service
+from app.responses.base_response import BaseResponse, respond
+from app.ndjson import DuplexStreamingResponse, iter_ndjson_lines
+from app.config import BULK_CHUNK_SIZE, USER_PAGE_SIZE, USER_PAGE_MAX_SIZE
 
 user = APIRouter(prefix="/api/user")
 
+# 로그인 시 발급한 세션 토큰을 주고받는 헤더
+SESSION_HEADER = "X-Session-Token"
+
+
+def to_summary(user: User) -> UserSummary:
+    """응답에 비밀번호 해시가 실리지 않도록 email/username만 남깁니다. (FAST_RESPONSES는 response_model을 거치지 않으므로 직접 변환)"""
+    return UserSummary(email=user.email, username=user.username)
+
+
+def check_session(service: UserService, token: Optional[str], email: str) -> None:
+    """세션 토큰이 주어졌다면 유효하고 같은 사용자의 것인지 확인합니다."""
+    if token is None:
+        return
+    try:
+        session_user = service.get_session_user(token)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    if session_user.email != email:
+        raise HTTPException(status_code=403, detail="Session does not match the user.")
+
+
+@user.get("", response_model=BaseResponse[UserPage], status_code=status.HTTP_200_OK)
+def list_users(
+    prefix: str = "",
+    by: str = "email",
+    cursor: Optional[str] = None,
+    limit: int = Query(USER_PAGE_SIZE, ge=1, le=USER_PAGE_MAX_SIZE),
+    x_session_token: str = Header(..., alias=SESSION_HEADER),
+    service: UserService = Depends(get_user_service),
+) -> BaseResponse[UserPage]:
+    """
+    사용자 목록을 email 또는 username 순으로 한 페이지씩 조회합니다. 로그인한 사용자만 조회할 수 있습니다.
+
+    Args:
+        prefix (str): by 필드의 접두어 검색어 (비우면 전체)
+        by (str): 정렬/검색 기준 필드 ("email" 또는 "username")
+        cursor (Optional[str]): 이전 페이지 응답의 next_cursor
+        limit (int): 페이지 크기
+        x_session_token (str): 로그인 때 발급받은 세션 토큰
+        service (UserService): 사용자 서비스 객체
+
+    Returns:
+        BaseResponse[UserPage]: 사용자 목록과 다음 페이지 커서 반환 (마지막 페이지면 null)
+
+    Raises:
+        HTTPException: 토큰이 없거나 만료/폐기된 경우 401, 기준 필드나 커서가 잘못된 경우 400 상태 코드와 오류 메시지 반환
+    """
+    try:
+        service.get_session_user(x_session_token)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    try:
+        page = service.list_users(prefix, by, cursor, limit)
+        return respond(BaseResponse(status="success", data=page, message="User list success."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@user.post("/login", response_model=BaseResponse[UserSummary], dependencies=[Depends(admit_password_hashing)], status_code=status.HTTP_200_OK)
+def login_user(user_login: UserLogin, response: Response, service: UserService = Depends(get_user_service)) -> BaseResponse[UserSummary]:
+    """
+    로그인하고 X-Session-Token 헤더로 세션 토큰을 발급합니다.
+
+    Args:
+        user_login (UserLogin): 이메일과 비밀번호
+        response (Response): 세션 토큰 헤더를 붙일 응답 객체
+        service (UserService): 사용자 서비스 객체
+
+    Returns:
+        BaseResponse[UserSummary]: 로그인한 사용자 정보와 성공 메시지 반환
 
-@user.post("/login", response_model=BaseResponse[User], status_code=status.HTTP_200_OK)
-def login_user(user_login: UserLogin, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+    Raises:
+        HTTPException: 로그인 실패 시 400 상태 코드와 오류 메시지 반환
+    """
     try:
         user = service.login(user_login)
-        return BaseResponse(status="success", data=user, message="Login Success.") 
+        response.headers[SESSION_HEADER] = service.create_session(user)
+        return respond(BaseResponse(status="success", data=to_summary(user), message="Login Success."), status.HTTP_200_OK, response)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@user.post("/register", response_model=BaseResponse[User], status_code=status.HTTP_201_CREATED)
-def register_user(user: User, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+@user.get("/me", response_model=BaseResponse[UserSummary], status_code=status.HTTP_200_OK)
+def get_session_user(
+    x_session_token: str = Header(..., alias=SESSION_HEADER),
+    service: UserService = Depends(get_user_service),
+) -> BaseResponse[UserSummary]:
+    """
+    세션 토큰으로 로그인한 사용자 정보를 조회합니다. 저장소 조회와 비밀번호 검증 없이 세션 캐시만 봅니다.
+
+    Args:
+        x_session_token (str): 로그인 때 발급받은 세션 토큰
+        service (UserService): 사용자 서비스 객체
+
+    Returns:
+        BaseResponse[UserSummary]: 세션의 사용자 정보 반환
+
+    Raises:
+        HTTPException: 토큰이 없거나 만료/폐기된 경우 401 상태 코드 반환
+    """
+    try:
+        session_user = service.get_session_user(x_session_token)
+        return respond(BaseResponse(status="success", data=to_summary(session_user), message="Session valid."), status.HTTP_200_OK)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+
+@user.post("/logout", response_model=BaseResponse[None], status_code=status.HTTP_200_OK)
+def logout_user(
+    x_session_token: str = Header(..., alias=SESSION_HEADER),
+    service: UserService = Depends(get_user_service),
+) -> BaseResponse[None]:
+    """
+    세션 토큰을 폐기합니다.
+
+    Args:
+        x_session_token (str): 폐기할 세션 토큰
+        service (UserService): 사용자 서비스 객체
+
+    Returns:
+        BaseResponse[None]: 성공 메시지 반환
+    """
+    service.logout(x_session_token)
+    return respond(BaseResponse(status="success", message="Logout Success."), status.HTTP_200_OK)
+
+
+@user.post("/register", response_model=BaseResponse[UserSummary], dependencies=[Depends(admit_password_hashing)], status_code=status.HTTP_201_CREATED)
+def register_user(user: User, service: UserService = Depends(get_user_service)) -> BaseResponse[UserSummary]:
     """
     새로운 사용자를 등록합니다.
     
@@ -26,56 +148,142 @@ def register_user(user: User, service: UserService = Depends(get_user_service))
         service (UserService): 사용자 서비스 객체
         
     Returns:
-        BaseResponse[User]: 등록된 사용자 정보와 성공 메시지 반환
+        BaseResponse[UserSummary]: 등록된 사용자 정보와 성공 메시지 반환
 
     Raises:
         HTTPException: 등록 실패 시 400 상태 코드와 오류 메시지 반환
     """
     try:
         result = service.register_user(user)
-        return BaseResponse(status="success", data=result, message="User registeration success.")
+        return respond(BaseResponse(status="success", data=to_summary(result), message="User registeration success."), status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@user.delete("/delete", response_model=BaseResponse[User], status_code=status.HTTP_200_OK)
-def delete_user(user_delete_request: UserDeleteRequest, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+@user.delete("/delete", response_model=BaseResponse[UserSummary], status_code=status.HTTP_200_OK)
+def delete_user(
+    user_delete_request: UserDeleteRequest,
+    x_session_token: Optional[str] = Header(None, alias=SESSION_HEADER),
+    service: UserService = Depends(get_user_service),
+) -> BaseResponse[UserSummary]:
     """
-    사용자 계정을 삭제합니다.
+    사용자 계정을 삭제합니다. 삭제된 사용자의 세션은 모두 폐기됩니다.
     
     Args:
         user_delete_request (UserDeleteRequest): 삭제할 사용자 이메일 정보
+        x_session_token (Optional[str]): 주어지면 같은 사용자의 유효한 세션인지 확인
         service (UserService): 사용자 서비스 객체
         
     Returns:
-        BaseResponse[User]: 삭제된 사용자 정보와 성공 메시지 반환
+        BaseResponse[UserSummary]: 삭제된 사용자 정보와 성공 메시지 반환
         
     Raises:
-        HTTPException: 삭제 실패 시 404 상태 코드와 오류 메시지 반환"""
+        HTTPException: 삭제 실패 시 404, 세션이 유효하지 않으면 401/403 상태 코드와 오류 메시지 반환"""
+    check_session(service, x_session_token, user_delete_request.email)
     try:
         deleted_user = service.delete_user(user_delete_request.email)
-        return BaseResponse(status="success", data=deleted_user, message="User Deletion Success.")
+        return respond(BaseResponse(status="success", data=to_summary(deleted_user), message="User Deletion Success."), status.HTTP_200_OK)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@user.put("/update-password", response_model=BaseResponse[User], status_code=status.HTTP_200_OK)
-def update_user_password(user_update: UserUpdate, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+@user.put("/update-password", response_model=BaseResponse[UserSummary], dependencies=[Depends(admit_password_hashing)], status_code=status.HTTP_200_OK)
+def update_user_password(
+    user_update: UserUpdate,
+    x_session_token: Optional[str] = Header(None, alias=SESSION_HEADER),
+    service: UserService = Depends(get_user_service),
+) -> BaseResponse[UserSummary]:
     """
-    사용자의 비밀번호를 업데이트합니다.
+    사용자의 비밀번호를 업데이트합니다. 해당 사용자의 기존 세션은 모두 폐기됩니다.
     
     Args:
         user_update (UserUpdate): 업데이트할 사용자 이메일 및 새 비밀번호 정보
+        x_session_token (Optional[str]): 주어지면 같은 사용자의 유효한 세션인지 확인
         service (UserService): 사용자 서비스 객체
         
     Returns:
-        BaseResponse[User]: 업데이트된 사용자 정보와 성공 메시지 반환
+        BaseResponse[UserSummary]: 업데이트된 사용자 정보와 성공 메시지 반환
         
     Raises:
-        HTTPException: 업데이트 실패 시 404 상태 코드와 오류 메시지 반환
+        HTTPException: 업데이트 실패 시 404, 세션이 유효하지 않으면 401/403 상태 코드와 오류 메시지 반환
     """
+    check_session(service, x_session_token, user_update.email)
     try:
         updated_user = service.update_user_pwd(user_update)
-        return BaseResponse(status="success", data=updated_user, message="User password update success.")
+        return respond(BaseResponse(status="success", data=to_summary(updated_user), message="User password update success."), status.HTTP_200_OK)
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+async def stream_bulk_results(
+    request: Request,
+    schema: Type[BaseModel],
+    key: Callable[[BaseModel], object],
+    apply: Callable[[List], List[Optional[str]]],
+) -> AsyncIterator[bytes]:
+    """
+    NDJSON 본문을 한 줄씩 schema로 검증하고, BULK_CHUNK_SIZE 행마다 apply를 한 번 호출해
+    (= 저장소 flush 한 번) 행별 결과를 NDJSON으로 흘려보낸다.
+    """
+    pending: List[Tuple[int, Optional[BaseModel], Optional[str]]] = []
+
+    async def flush() -> AsyncIterator[bytes]:
+        valid = [row for _, row, _ in pending if row is not None]
+        try:
+            errors = iter(await run_in_threadpool(apply, [key(row) for row in valid]) if valid else [])
+        except Exception as e:
+            # 스트림 도중의 실패(해시 풀 포화, 디스크 오류 등): 상태 코드는 바꿀 수 없으므로 이 묶음의 행들을 실패로 보내고 계속한다
+            errors = iter([str(e) or type(e).__name__] * len(valid))
+        for line_no, row, error in pending:
+            if row is not None:
+                error = next(errors)
+            result = BulkRowResult(
+                line=line_no,
+                status="failure" if error else "success",
+                email=getattr(row, "email", None),
+                message=error,
+            )
+            yield result.model_dump_json().encode("utf-8") + b"\n"
+        pending.clear()
+
+    async for line_no, line in iter_ndjson_lines(request):
+        try:
+            pending.append((line_no, schema.model_validate_json(line), None))
+        except ValidationError as e:
+            message = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'body'}: {err['msg']}" for err in e.errors())
+            pending.append((line_no, None, message))
+        if len(pending) >= BULK_CHUNK_SIZE:
+            async for out in flush():
+                yield out
+    async for out in flush():
+        yield out
+
+
+@user.post("/bulk-register", status_code=status.HTTP_200_OK)
+async def bulk_register_users(request: Request, service: UserService = Depends(get_user_service)) -> DuplexStreamingResponse:
+    """
+    NDJSON(한 줄에 User 하나)으로 여러 사용자를 한 번에 등록합니다.
+
+    Args:
+        request (Request): 한 줄에 하나씩 User JSON이 담긴 스트리밍 본문
+        service (UserService): 사용자 서비스 객체
+
+    Returns:
+        DuplexStreamingResponse: 행별 결과(BulkRowResult)를 담은 NDJSON 스트림
+    """
+    return DuplexStreamingResponse(stream_bulk_results(request, User, lambda row: row, service.bulk_register))
+
+
+@user.post("/bulk-delete", status_code=status.HTTP_200_OK)
+async def bulk_delete_users(request: Request, service: UserService = Depends(get_user_service)) -> DuplexStreamingResponse:
+    """
+    NDJSON(한 줄에 UserDeleteRequest 하나)으로 여러 사용자를 한 번에 삭제합니다.
+
+    Args:
+        request (Request): 한 줄에 하나씩 {"email": ...} 이 담긴 스트리밍 본문
+        service (UserService): 사용자 서비스 객체
+
+    Returns:
+        DuplexStreamingResponse: 행별 결과(BulkRowResult)를 담은 NDJSON 스트림
+    """
+    return DuplexStreamingResponse(stream_bulk_results(request, UserDeleteRequest, lambda row: row.email, service.bulk_delete))
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, EmailStr
 
 class User(BaseModel):
@@ -19,3 +21,17 @@ class UserDeleteRequest(BaseModel):
 class MessageResponse(BaseModel):
     message: str
 
+class BulkRowResult(BaseModel):
+    line: int
+    status: str
+    email: Optional[str] = None
+    message: Optional[str] = None
+
+
+class UserSummary(BaseModel):
+    email: str
+    username: str
+
+class UserPage(BaseModel):
+    users: List[UserSummary]
+    next_cursor: Optional[str] = None
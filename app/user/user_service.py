@@ -1,38 +1,118 @@
-from app.user.user_repository import UserRepository
-from app.user.user_schema import User, UserLogin, UserUpdate
+import base64
+import binascii
+import json
+from typing import List, Optional, Tuple
+
+from app.user.base_user_repository import (
+    BaseUserRepository, USER_EXISTS, USER_NOT_FOUND, USER_SORT_FIELDS, USERNAME_EXISTS, sort_key,
+)
+from app.user.password_hasher import PasswordHasher, get_password_hasher
+from app.user.session_cache import SessionCache, get_session_cache
+from app.user.user_schema import User, UserLogin, UserUpdate, UserPage, UserSummary
+
+
+def encode_cursor(key: Tuple[str, ...]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, by: str) -> Tuple[str, ...]:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, binascii.Error):
+        raise ValueError("Invalid Cursor.")
+    if not isinstance(key, list) or len(key) != (1 if by == "email" else 2) or not all(isinstance(k, str) for k in key):
+        raise ValueError("Invalid Cursor.")
+    return tuple(key)
 
 class UserService:
-    def __init__(self, userRepoitory: UserRepository) -> None:
+    def __init__(
+        self,
+        userRepoitory: BaseUserRepository,
+        hasher: Optional[PasswordHasher] = None,
+        sessions: Optional[SessionCache] = None,
+    ) -> None:
         self.repo = userRepoitory
+        self.hasher = hasher or get_password_hasher()
+        self.sessions = sessions if sessions is not None else get_session_cache()
 
     def login(self, user_login: UserLogin) -> User:
         '''
         Login user with email and password
-        compare with stored user data in the repository
+        compare with stored password hash in the repository
         if the data cannot match, raise an ValueError
+        plaintext (or outdated cost) records are rehashed on a successful login
         '''
         user_email = user_login.email
         user_password = user_login.password
         user = self.repo.get_user_by_email(user_email)
         if not user:
-            raise ValueError("User not Found.")
-        if user.password != user_password:
+            raise ValueError(USER_NOT_FOUND)
+        if not self.hasher.verify(user_password, user.password):
             raise ValueError("Invalid ID/PW")
+        if self.hasher.needs_rehash(user.password):
+            verified = user.password
+            user.password = self.hasher.hash(user_password)
+            try:
+                # 검증한 해시가 그대로일 때만 바꾼다. 그 사이 비밀번호가 바뀌었거나 지워졌으면 재해싱을 버린다
+                self.repo.update_user(user, expected_password=verified)
+            except ValueError:
+                pass
+        return user
+
+    def create_session(self, user: User) -> str:
+        '''
+        Issue a session token for a logged-in user
+        '''
+        return self.sessions.issue(user)
+
+    def get_session_user(self, token: str) -> User:
+        '''
+        Resolve a session token from the session cache without touching the repository
+        if the token is unknown, expired or revoked, raise an ValueError
+        '''
+        user = self.sessions.get(token)
+        if not user:
+            raise ValueError("Invalid Session.")
         return user
-        
+
+    def logout(self, token: str) -> None:
+        self.sessions.revoke(token)
+
     def register_user(self, new_user: User) -> User:
         '''
-        Register a new user, if the email already exists, raise an ValueError
+        Register a new user, if the email or username already exists, raise an ValueError
         Otherwise, save the new user to the repository
+        the uniqueness check is repeated inside the repository writer, so concurrent registrations cannot both succeed
         '''
         new_user_email = new_user.email
+        # 해싱 전에 싸게 거른다. 최종 확인은 저장소 writer가 한다
         existing = self.repo.get_user_by_email(new_user_email)
         if existing:
-            raise ValueError("User already Exists.")
+            raise ValueError(USER_EXISTS)
+        if self.repo.username_exists(new_user.username):
+            raise ValueError(USERNAME_EXISTS)
+
+        stored_user = new_user.model_copy(update={"password": self.hasher.hash(new_user.password)})
+        self.repo.create_user(stored_user)
 
-        self.repo.save_user(new_user)
-   
-        return new_user
+        return stored_user
+
+    def list_users(self, prefix: str = "", by: str = "email", cursor: Optional[str] = None, limit: int = 50) -> UserPage:
+        '''
+        List users sorted by email or username, optionally filtered by a prefix of that field
+        the cursor is the opaque sort key of the last user on the previous page
+        if the field or the cursor is invalid, raise an ValueError
+        '''
+        if by not in USER_SORT_FIELDS:
+            raise ValueError("Invalid Sort Field.")
+        after = decode_cursor(cursor, by) if cursor else None
+        # 한 명 더 읽어서 다음 페이지가 있는지 판단한다
+        users = self.repo.list_users(prefix, by, after, limit + 1)
+        next_cursor = encode_cursor(sort_key(users[limit - 1], by)) if len(users) > limit else None
+        return UserPage(
+            users=[UserSummary(email=u.email, username=u.username) for u in users[:limit]],
+            next_cursor=next_cursor,
+        )
 
     def delete_user(self, email: str) -> User:
         '''
@@ -41,9 +121,11 @@ class UserService:
         '''
         existing = self.repo.get_user_by_email(email)
         if not existing:
-            raise ValueError("User not Found.")
+            raise ValueError(USER_NOT_FOUND)
 
+        # 동시에 지워졌으면 저장소가 ValueError를 던진다
         deleted_user = self.repo.delete_user(existing)
+        self.sessions.revoke_email(email)
         return deleted_user
 
     def update_user_pwd(self, user_update: UserUpdate) -> User:
@@ -58,10 +140,66 @@ class UserService:
         # query
         user_in_db = self.repo.get_user_by_email(user_email)
         if not user_in_db:
-            raise ValueError("User not Found.")
+            raise ValueError(USER_NOT_FOUND)
 
-        # update
-        user_in_db.password = new_password
-        updated_user = self.repo.save_user(user_in_db)
+        # update (그 사이 지워진 사용자를 되살리지 않도록 저장소가 존재를 다시 확인한다)
+        user_in_db.password = self.hasher.hash(new_password)
+        updated_user = self.repo.update_user(user_in_db)
+        self.sessions.revoke_email(user_email)
         return updated_user
-        
\ No newline at end of file
+
+    def bulk_register(self, new_users: List[User]) -> List[Optional[str]]:
+        '''
+        Register several users with one repository flush.
+        Returns an error message per row (None if the row was registered),
+        rows whose email or username already exists or repeats within the batch are skipped
+        '''
+        errors: List[Optional[str]] = []
+        accepted: List[User] = []
+        rows: List[int] = []
+        seen = set()
+        seen_usernames = set()
+        for new_user in new_users:
+            if new_user.email in seen or self.repo.get_user_by_email(new_user.email):
+                errors.append(USER_EXISTS)
+                continue
+            if new_user.username in seen_usernames or self.repo.username_exists(new_user.username):
+                errors.append(USERNAME_EXISTS)
+                continue
+            seen.add(new_user.email)
+            seen_usernames.add(new_user.username)
+            rows.append(len(errors))
+            accepted.append(new_user)
+            errors.append(None)
+
+        if accepted:
+            # chunk의 해싱을 풀에 함께 넣어 코어 수만큼 병렬로 계산한다
+            hashes = self.hasher.hash_many([user.password for user in accepted])
+            accepted = [user.model_copy(update={"password": hashed}) for user, hashed in zip(accepted, hashes)]
+            # 그 사이 다른 요청이 먼저 등록한 행은 저장소 writer가 거절한다
+            for row, error in zip(rows, self.repo.create_users(accepted)):
+                errors[row] = error
+        return errors
+
+    def bulk_delete(self, emails: List[str]) -> List[Optional[str]]:
+        '''
+        Delete several users with one repository flush.
+        Returns an error message per row (None if the row was deleted)
+        '''
+        errors: List[Optional[str]] = []
+        existing: List[User] = []
+        seen = set()
+        for email in emails:
+            user = self.repo.get_user_by_email(email) if email not in seen else None
+            if not user:
+                errors.append(USER_NOT_FOUND)
+                continue
+            seen.add(email)
+            existing.append(user)
+            errors.append(None)
+
+        if existing:
+            self.repo.delete_users(existing)
+            for user in existing:
+                self.sessions.revoke_email(user.email)
+        return errors
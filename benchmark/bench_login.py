@@ -0,0 +1,77 @@
+"""
+Login latency benchmark.
+
+Seeds a temporary users.json with N users, loads it once into a single
+UserRepository (as the app does at startup) and measures UserService.login
+latency. p99 should stay flat as N grows. Passwords are stored with a
+minimal-cost hash so the numbers reflect the lookup path, not the KDF
+(see bench_password_hash.py for that).
+
+    python -m benchmark.bench_login --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from app.user.password_hasher import PasswordHasher
+from app.user.user_repository import UserRepository
+from app.user.user_schema import UserLogin
+from app.user.user_service import UserService
+
+
+def seed_users(path: str, n: int, stored_password: str) -> None:
+    with open(path, "w") as f:
+        json.dump({
+            f"user{i}@example.com": {"email": f"user{i}@example.com", "password": stored_password, "username": f"user{i}"}
+            for i in range(n)
+        }, f)
+
+
+def percentile(samples, p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def run(n: int, requests: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.json")
+        hasher = PasswordHasher(iterations=1, max_workers=1)
+        seed_users(path, n, hasher.hash("pw"))
+
+        start = time.perf_counter()
+        service = UserService(UserRepository(path), hasher)
+        load_s = time.perf_counter() - start
+
+        logins = [UserLogin(email=f"user{i}@example.com", password="pw")
+                  for i in (random.randrange(n) for _ in range(requests))]
+        samples = []
+        for login in logins:
+            t0 = time.perf_counter()
+            service.login(login)
+            samples.append((time.perf_counter() - t0) * 1e6)
+
+    return {
+        "users": n,
+        "load_s": round(load_s, 3),
+        "p50_us": round(percentile(samples, 0.50), 2),
+        "p99_us": round(percentile(samples, 0.99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login latency against the user store size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--requests", type=int, default=10_000, help="Logins measured per size.")
+    args = parser.parse_args()
+
+    print(f"{'users':>10} {'load(s)':>9} {'p50(us)':>9} {'p99(us)':>9}")
+    for n in args.sizes:
+        r = run(n, args.requests)
+        print(f"{r['users']:>10} {r['load_s']:>9} {r['p50_us']:>9} {r['p99_us']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Password hashing benchmark.
+
+Measures login (verify) throughput per core for each PBKDF2 cost setting, using
+a PasswordHasher with a single worker so the number is per-core.
+
+    python -m benchmark.bench_password_hash --iterations 100000 300000 600000
+"""
+import argparse
+import time
+
+from app.user.password_hasher import PasswordHasher
+
+
+def run(iterations: int, seconds: float) -> dict:
+    hasher = PasswordHasher(iterations=iterations, max_workers=1)
+    stored = hasher.hash("password123")
+
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        hasher.verify("password123", stored)
+        count += 1
+    elapsed = time.perf_counter() - start
+    hasher.close()
+
+    return {
+        "iterations": iterations,
+        "logins_per_s": round(count / elapsed, 1),
+        "ms_per_login": round(elapsed / count * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput per core at each hash cost.")
+    parser.add_argument("--iterations", type=int, nargs="+", default=[100_000, 300_000, 600_000, 1_000_000])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Measurement time per cost setting.")
+    args = parser.parse_args()
+
+    print(f"{'iterations':>12} {'logins/s/core':>14} {'ms/login':>9}")
+    for iterations in args.iterations:
+        r = run(iterations, args.seconds)
+        print(f"{r['iterations']:>12} {r['logins_per_s']:>14} {r['ms_per_login']:>9}")
+
+
+if __name__ == "__main__":
+    main()
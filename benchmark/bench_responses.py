@@ -0,0 +1,96 @@
+"""
+Response serialization benchmark.
+
+Drives /api/user/login and /api/user/register directly through the ASGI app
+(no network, no HTTP client) with the default response_model path and with
+FAST_RESPONSES, and prints requests per second for each.
+
+    python -m benchmark.bench_responses --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("USER_JOURNAL_FSYNC", "0")
+
+import app.responses.base_response as base_response
+from app.dependencies import get_user_service
+from app.main import app
+from app.user.password_hasher import PasswordHasher
+from app.user.session_cache import SessionCache
+from app.user.user_repository import UserRepository
+from app.user.user_service import UserService
+
+
+async def call(path: str, body: bytes) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 8000),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(path: str, bodies) -> float:
+    start = time.perf_counter()
+    for body in bodies:
+        assert await call(path, body) < 300
+    return len(bodies) / (time.perf_counter() - start)
+
+
+def run(requests: int, fast: bool) -> dict:
+    base_response.FAST_RESPONSES = fast
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.json")
+        with open(path, "w") as f:
+            json.dump({}, f)
+        repo = UserRepository(path)
+        service = UserService(repo, PasswordHasher(iterations=1, max_workers=1), SessionCache())
+        app.dependency_overrides[get_user_service] = lambda: service
+
+        prefix = "fast" if fast else "default"
+        register = [json.dumps({"email": f"{prefix}{i}@example.com", "password": "pw", "username": f"u{i}"}).encode()
+                    for i in range(requests)]
+        login = [json.dumps({"email": f"{prefix}{i}@example.com", "password": "pw"}).encode() for i in range(requests)]
+
+        register_rps = asyncio.run(measure("/api/user/register", register))
+        login_rps = asyncio.run(measure("/api/user/login", login))
+        app.dependency_overrides = {}
+        repo.close()
+    return {"register": register_rps, "login": login_rps}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare requests/s with and without FAST_RESPONSES.")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    before = run(args.requests, fast=False)
+    after = run(args.requests, fast=True)
+    print(f"{'endpoint':>10} {'default rps':>12} {'fast rps':>10} {'speedup':>8}")
+    for endpoint in ("login", "register"):
+        print(f"{endpoint:>10} {before[endpoint]:>12.0f} {after[endpoint]:>10.0f} {after[endpoint] / before[endpoint]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Similar-review (ANN) benchmark.
+
+Generates a synthetic topic-clustered TF-IDF corpus of N documents, builds
+the pruned-postings ANN index, saves it and reopens it with memory mapping (as the app does
+at startup), then compares its top-k against exact brute-force cosine top-k.
+Reports recall@k, ANN vs exact query latency and candidates scanned.
+
+    python -m benchmark.bench_similar --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix  # type: ignore
+
+from utils.ann_index import SparseANNIndex, SparseRows
+
+
+def percentile(samples, p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def synthetic_corpus(n: int, vocab: int, topics: int, terms_per_doc: int, seed: int = 0) -> csr_matrix:
+    """토픽마다 선호 단어가 있는 문서 집합. 70%는 토픽 단어, 나머지는 Zipf 분포의 배경 단어."""
+    rng = np.random.default_rng(seed)
+    topic_terms = rng.integers(0, vocab, size=(topics, 60))
+    doc_topic = rng.integers(0, topics, size=n)
+    from_topic = rng.random((n, terms_per_doc)) < 0.7
+    topic_pick = topic_terms[doc_topic[:, None], rng.integers(0, 60, size=(n, terms_per_doc))]
+    background = np.minimum(rng.zipf(1.3, size=(n, terms_per_doc)) - 1, vocab - 1)
+    terms = np.where(from_topic, topic_pick, background)
+
+    rows = np.repeat(np.arange(n), terms_per_doc)
+    tf = csr_matrix((np.ones(rows.size, dtype=np.float32), (rows, terms.ravel())), shape=(n, vocab))
+    tf.sum_duplicates()
+    df = np.bincount(tf.indices, minlength=vocab)
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    tf.data *= idf[tf.indices]
+    norms = np.sqrt(np.asarray(tf.multiply(tf).sum(axis=1)).ravel())
+    tf.data /= np.repeat(norms, np.diff(tf.indptr))
+    tf.sort_indices()
+    return tf
+
+
+def run(n: int, k: int, queries: int, max_postings: int, query_terms: int, vocab: int) -> dict:
+    matrix = synthetic_corpus(n, vocab, topics=max(10, n // 200), terms_per_doc=15)
+    vectors = SparseRows(matrix.data, matrix.indices.astype(np.int32), matrix.indptr.astype(np.int64), vocab)
+
+    start = time.perf_counter()
+    built = SparseANNIndex.build([f"t{i}" for i in range(vocab)], np.ones(vocab, dtype=np.float32), vectors, max_postings)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ann")
+        built.save(path)
+        start = time.perf_counter()
+        index = SparseANNIndex.load(path, mmap=True)
+        load_s = time.perf_counter() - start
+
+        rng = np.random.default_rng(1)
+        recalls, ann_us, exact_us, scanned = [], [], [], []
+        for doc in rng.choice(n, size=queries, replace=False):
+            t0 = time.perf_counter()
+            ann = index.query(int(doc), k, query_terms)
+            ann_us.append((time.perf_counter() - t0) * 1e6)
+            scanned.append(len(index.candidates(*index.vectors.row(int(doc)), query_terms)))
+
+            t0 = time.perf_counter()
+            scores = (matrix @ matrix[doc].T).toarray().ravel()
+            scores[doc] = -1
+            exact = np.argpartition(-scores, k)[:k]
+            exact = exact[scores[exact] > 0]
+            exact_us.append((time.perf_counter() - t0) * 1e6)
+
+            if len(exact):
+                recalls.append(len({d for d, _ in ann} & set(exact.tolist())) / len(exact))
+
+    return {
+        "reviews": n,
+        "build_s": round(build_s, 2),
+        "load_ms": round(load_s * 1000, 2),
+        "recall": round(float(np.mean(recalls)), 3),
+        "scanned": int(np.median(scanned)),
+        "ann_p50_us": round(percentile(ann_us, 0.50), 1),
+        "ann_p99_us": round(percentile(ann_us, 0.99), 1),
+        "exact_p50_us": round(percentile(exact_us, 0.50), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ANN recall and latency against exact cosine top-k.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200, help="Query documents sampled per size.")
+    parser.add_argument("--max-postings", type=int, default=1000, help="Highest-weight documents kept per term.")
+    parser.add_argument("--query-terms", type=int, default=32, help="Highest-weight query terms whose postings are scanned.")
+    parser.add_argument("--vocab", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'reviews':>9} {'build(s)':>9} {'load(ms)':>9} {'recall@k':>9} {'scanned':>8} "
+          f"{'ann p50(us)':>12} {'ann p99(us)':>12} {'exact p50(us)':>14}")
+    for n in args.sizes:
+        r = run(n, args.k, args.queries, args.max_postings, args.query_terms, args.vocab)
+        print(f"{r['reviews']:>9} {r['build_s']:>9} {r['load_ms']:>9} {r['recall']:>9} {r['scanned']:>8} "
+              f"{r['ann_p50_us']:>12} {r['ann_p99_us']:>12} {r['exact_p50_us']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Import-time (cold start) report.
+
+Imports each entry-point module in a fresh interpreter with `python -X importtime`,
+and prints its wall-clock import time (best of --repeat runs) next to the heaviest
+top-level packages it pulled in. Each entry is checked against the committed budget
+(benchmark/import_budget.json): `budget_ms` for the import time and `forbidden` for
+heavy packages the entry point must not load at import (they are imported on first use).
+Exits with status 1 if any entry is over budget or imports a forbidden package.
+
+    python -m benchmark.import_time
+    python -m benchmark.import_time --modules app.main app.server --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+# 하위 인터프리터에서 import 시간만 재고 stdout으로 돌려준다 (-X importtime 결과는 stderr로 나온다)
+TIMER = "import time, importlib; t = time.perf_counter(); importlib.import_module({module!r}); print(time.perf_counter() - t)"
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """`-X importtime` 출력에서 (모듈 이름, self 시간 us) 목록. 머리줄과 다른 출력은 건너뛴다."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules.append((fields[2].strip(), int(fields[0])))
+    return modules
+
+
+def package_times(modules: List[Tuple[str, int]], exclude=frozenset()) -> Dict[str, int]:
+    """최상위 패키지별 self 시간 합(us). exclude(인터프리터 시작 때 이미 불러온 모듈)는 뺀다."""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us in modules:
+        if name not in exclude:
+            totals[name.split(".")[0]] += self_us
+    return dict(totals)
+
+
+def run_import(module: str) -> Tuple[float, List[Tuple[str, int]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", TIMER.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+    return float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def measure(module: str, repeat: int, startup: frozenset) -> dict:
+    """repeat 번 새 인터프리터에서 import해서 가장 빠른 시간(ms)과 그때 불러온 패키지별 시간을 돌려준다."""
+    best = None
+    for _ in range(repeat):
+        seconds, modules = run_import(module)
+        if best is None or seconds < best[0]:
+            best = (seconds, modules)
+    seconds, modules = best
+    return {
+        "ms": round(seconds * 1000, 1),
+        "packages": package_times(modules, startup),
+    }
+
+
+def check(report: dict, budget: dict) -> List[str]:
+    problems = []
+    if report["ms"] > budget["budget_ms"]:
+        problems.append(f"{report['ms']}ms > {budget['budget_ms']}ms")
+    loaded = sorted(set(budget.get("forbidden", [])) & set(report["packages"]))
+    if loaded:
+        problems.append(f"imports {', '.join(loaded)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report entry-point import times and check them against the committed budget.")
+    parser.add_argument("--budget", type=str, default=BUDGET_FILE, help="Budget JSON: {module: {budget_ms, forbidden}}.")
+    parser.add_argument("--modules", type=str, nargs="+", help="Entry points to measure. Default: every module in the budget.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the fastest run is reported.")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest top-level packages shown per module.")
+    args = parser.parse_args()
+
+    with open(args.budget, encoding="utf-8") as f:
+        budgets = json.load(f)
+    startup = frozenset(name for name, _ in run_import("sys")[1])
+
+    failed = False
+    print(f"{'module':<40} {'ms':>8} {'budget':>8}  {'status':<6} heaviest packages (ms)")
+    for module in args.modules or list(budgets):
+        budget = budgets.get(module, {"budget_ms": float("inf")})
+        try:
+            report = measure(module, args.repeat, startup)
+        except RuntimeError as e:
+            failed = True
+            print(f"{module:<40} {'-':>8} {budget['budget_ms']:>8}  FAIL\n    {e}")
+            continue
+        problems = check(report, budget)
+        failed = failed or bool(problems)
+        heaviest = sorted(report["packages"].items(), key=lambda item: -item[1])[:args.top]
+        print(f"{module:<40} {report['ms']:>8} {budget['budget_ms']:>8}  {'FAIL' if problems else 'ok':<6} "
+              + ", ".join(f"{name} {us / 1000:.0f}" for name, us in heaviest))
+        for problem in problems:
+            print(f"    {problem}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
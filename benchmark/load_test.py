@@ -0,0 +1,237 @@
+"""
+In-process load test for the user API.
+
+Seeds a temporary user store with N users, then drives the real app.main:app
+through httpx.AsyncClient + ASGITransport with a mix of login, register,
+update-password and delete requests at a fixed concurrency. Reports
+throughput, p50/p95/p99 latency per operation and memory use, and can save
+a JSON baseline or diff against one.
+
+    python -m benchmark.load_test --users 100000 --concurrency 64 --requests 20000 --save baseline.json
+    python -m benchmark.load_test --users 100000 --concurrency 64 --requests 20000 --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+from typing import Dict, List
+
+os.environ.setdefault("USER_JOURNAL_FSYNC", "0")
+
+import httpx
+
+from app.dependencies import USER_REPOSITORY_CLASSES, get_user_repository
+from app.main import app
+from app.user.password_hasher import PasswordHasher, get_password_hasher
+from app.user.session_cache import SessionCache, get_session_cache
+
+OPERATIONS = ("login", "register", "update", "delete")
+PASSWORD = "password123"
+
+
+def max_rss_mb() -> float:
+    # Linux에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def seed_store(directory: str, store: str, n: int, stored_password: str):
+    path = os.path.join(directory, "users.json")
+    with open(path, "w") as f:
+        json.dump({
+            f"user{i}@example.com": {"email": f"user{i}@example.com", "password": stored_password, "username": f"user{i}"}
+            for i in range(n)
+        }, f)
+    if store == "json":
+        return USER_REPOSITORY_CLASSES["json"](path)
+
+    source = USER_REPOSITORY_CLASSES["json"](path)
+    if store == "sqlite":
+        repo = USER_REPOSITORY_CLASSES["sqlite"](os.path.join(directory, "users.db"))
+        repo.import_users(source.users.values())
+    else:
+        from app.user.sharded_user_repository import reshard
+        reshard(source.users, os.path.join(directory, "users"), 16)
+        repo = USER_REPOSITORY_CLASSES["sharded"](os.path.join(directory, "users"), 16)
+    source.close()
+    return repo
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, users: int, mix: Dict[str, int], requests: int) -> None:
+        self.client = client
+        self.alive = [f"user{i}@example.com" for i in range(users)]
+        self.next_id = users
+        self.plan = random.choices(list(mix), weights=list(mix.values()), k=requests)
+        self.latencies: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.errors: Dict[str, int] = {op: 0 for op in OPERATIONS}
+
+    async def request(self, op: str) -> httpx.Response:
+        if op == "login":
+            email = random.choice(self.alive)
+            return await self.client.post("/api/user/login", json={"email": email, "password": PASSWORD})
+        if op == "register":
+            email = f"user{self.next_id}@example.com"
+            self.next_id += 1
+            response = await self.client.post(
+                "/api/user/register", json={"email": email, "password": PASSWORD, "username": email.split("@")[0]}
+            )
+            if response.status_code < 300:
+                self.alive.append(email)
+            return response
+        if op == "update":
+            email = random.choice(self.alive)
+            return await self.client.put("/api/user/update-password", json={"email": email, "new_password": PASSWORD})
+        # delete: 살아있는 사용자 중 하나를 골라 목록에서 먼저 빼서 다른 요청이 쓰지 않게 한다
+        email = self.alive.pop(random.randrange(len(self.alive)))
+        return await self.client.request("DELETE", "/api/user/delete", json={"email": email})
+
+    async def worker(self, queue: "asyncio.Queue[str]") -> None:
+        while True:
+            try:
+                op = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if op != "register" and not self.alive:
+                # 살아있는 사용자가 없으면 (delete가 몰린 경우) login/update/delete 대신 가입을 보낸다
+                op = "register"
+            start = time.perf_counter()
+            response = await self.request(op)
+            self.latencies[op].append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 300:
+                self.errors[op] += 1
+
+    async def run(self, concurrency: int) -> float:
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        for op in self.plan:
+            queue.put_nowait(op)
+        start = time.perf_counter()
+        await asyncio.gather(*(self.worker(queue) for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+async def run_load_test(args) -> dict:
+    hasher = PasswordHasher(iterations=args.hash_iterations)
+    rss_start = max_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_start = time.perf_counter()
+        repo = seed_store(tmp, args.store, args.users, hasher.hash(PASSWORD))
+        seed_s = time.perf_counter() - seed_start
+        rss_seeded = max_rss_mb()
+
+        sessions = SessionCache()
+        app.dependency_overrides[get_user_repository] = lambda: repo
+        app.dependency_overrides[get_password_hasher] = lambda: hasher
+        app.dependency_overrides[get_session_cache] = lambda: sessions
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                test = LoadTest(client, args.users, dict(args.mix), args.requests)
+                elapsed = await test.run(args.concurrency)
+        finally:
+            app.dependency_overrides = {}
+            repo.close()
+            hasher.close()
+
+    operations = {}
+    for op in OPERATIONS:
+        samples = test.latencies[op]
+        if samples:
+            operations[op] = {
+                "count": len(samples),
+                "errors": test.errors[op],
+                "p50_ms": round(percentile(samples, 0.50), 3),
+                "p95_ms": round(percentile(samples, 0.95), 3),
+                "p99_ms": round(percentile(samples, 0.99), 3),
+            }
+    return {
+        "config": {
+            "store": args.store,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "mix": dict(args.mix),
+            "hash_iterations": args.hash_iterations,
+        },
+        "seed_s": round(seed_s, 3),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "memory_mb": {
+            "start": round(rss_start, 1),
+            "after_seed": round(rss_seeded, 1),
+            "peak": round(max_rss_mb(), 1),
+        },
+        "operations": operations,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"throughput: {report['throughput_rps']} req/s over {report['elapsed_s']}s (seed {report['seed_s']}s)")
+    mem = report["memory_mb"]
+    print(f"memory: start {mem['start']} MB, after seed {mem['after_seed']} MB, peak {mem['peak']} MB")
+    print(f"{'op':>10} {'count':>8} {'errors':>7} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+    for op, r in report["operations"].items():
+        print(f"{op:>10} {r['count']:>8} {r['errors']:>7} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+
+
+def print_diff(report: dict, baseline: dict) -> None:
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(f"\nvs baseline: throughput {change(report['throughput_rps'], baseline['throughput_rps'])}, "
+          f"peak memory {change(report['memory_mb']['peak'], baseline['memory_mb']['peak'])}")
+    print(f"{'op':>10} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for op, r in report["operations"].items():
+        old = baseline["operations"].get(op)
+        if old:
+            print(f"{op:>10} {change(r['p50_ms'], old['p50_ms']):>8} "
+                  f"{change(r['p95_ms'], old['p95_ms']):>8} {change(r['p99_ms'], old['p99_ms']):>8}")
+
+
+def parse_mix(value: str) -> List[tuple]:
+    mix = []
+    for part in value.split(","):
+        op, weight = part.split("=")
+        if op not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation: {op}")
+        mix.append((op, int(weight)))
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test for the user API.")
+    parser.add_argument("--store", choices=sorted(USER_REPOSITORY_CLASSES), default="json")
+    parser.add_argument("--users", type=int, default=10_000, help="Users seeded before the run (up to millions).")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("login=70,register=10,update=10,delete=10"),
+                        help="Operation weights. Example: login=70,register=10,update=10,delete=10")
+    parser.add_argument("--hash-iterations", type=int, default=1_000, help="PBKDF2 cost used for the run.")
+    parser.add_argument("--save", type=str, help="Write the report as a JSON baseline to this path.")
+    parser.add_argument("--compare", type=str, help="Diff the report against a saved JSON baseline.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args))
+    print_report(report)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_diff(report, json.load(f))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
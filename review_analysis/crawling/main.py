@@ -3,18 +3,22 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
-from typing import Dict, Type
-from review_analysis.crawling.base_crawler import BaseCrawler
-from review_analysis.crawling.google_crawler import GoogleCrawler
-from review_analysis.crawling.kakao_crawler import KakaoCrawler
-from review_analysis.crawling.tripdotcom_crawler import TripDotComCrawler
-# 모든 크롤링 클래스를 예시 형식으로 적어주세요. 
-CRAWLER_CLASSES: Dict[str, Type[BaseCrawler]] = {
-    "google": GoogleCrawler,
-    "kakao": KakaoCrawler,
-    "tripdotcom": TripDotComCrawler,
+from importlib import import_module
+from typing import TYPE_CHECKING, Dict, Type
+if TYPE_CHECKING:
+    from review_analysis.crawling.base_crawler import BaseCrawler
+# 모든 크롤링 클래스를 예시 형식으로 적어주세요. ("모듈 경로:클래스 이름")
+# selenium import가 무거워서 실제로 돌릴 크롤러의 모듈만 그때 불러온다
+CRAWLER_CLASSES: Dict[str, str] = {
+    "google": "review_analysis.crawling.google_crawler:GoogleCrawler",
+    "kakao": "review_analysis.crawling.kakao_crawler:KakaoCrawler",
+    "tripdotcom": "review_analysis.crawling.tripdotcom_crawler:TripDotComCrawler",
 }
 
+def load_crawler(name: str) -> "Type[BaseCrawler]":
+    module, cls = CRAWLER_CLASSES[name].split(":")
+    return getattr(import_module(module), cls)
+
 def create_parser() -> ArgumentParser:
     parser = ArgumentParser()
     parser.add_argument('-o', '--output_dir', type=str, required=True, help="Output file directory. Example: ../../database")
@@ -30,13 +34,13 @@ if __name__ == "__main__":
 
     if args.all: 
         for crawler_name in CRAWLER_CLASSES.keys():
-            Crawler_class = CRAWLER_CLASSES[crawler_name]
+            Crawler_class = load_crawler(crawler_name)
             crawler = Crawler_class(args.output_dir)
             crawler.scrape_reviews()
             crawler.save_to_database()
      
     elif args.crawler:
-        Crawler_class = CRAWLER_CLASSES[args.crawler]
+        Crawler_class = load_crawler(args.crawler)
         crawler = Crawler_class(args.output_dir)
         crawler.scrape_reviews()
         crawler.save_to_database()
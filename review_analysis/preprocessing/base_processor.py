@@ -1,5 +1,31 @@
+import re
 from abc import ABC, abstractmethod
 
+
+def clean_text(text) -> str:
+    """
+    리뷰 텍스트를 전처리합니다. 전처리 클래스와 온라인 수집(ingest)이 같은 규칙을 쓰도록 여기에 둡니다.
+
+    Args:
+        text (str): 원본 리뷰 텍스트
+
+    Returns:
+        str: 이모지/특수문자를 지우고 공백을 정리한 텍스트 (한글/영문/숫자/공백만 남김)
+    """
+    if not isinstance(text, str): return ""
+    # 이모지 및 특수문자 제거, 한글/영문/숫자만 남김
+    text = re.sub(r'[^가-힣a-zA-Z0-9\s]', ' ', text)
+    # 연속된 공백 하나로 축소
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def clean_kakao_text(text) -> str:
+    """clean_text 후 카카오맵 리뷰의 '...더보기' 꼬리를 지웁니다."""
+    text = clean_text(text)
+    return re.sub(r"[\.\s…\n\r\t]+더보기", "", text).strip()
+
+
 class BaseDataProcessor:
     def __init__(self, input_path: str, output_dir: str):
         self.input_path = input_path
@@ -1,9 +1,7 @@
 # @jiucai233
-from .base_processor import BaseDataProcessor
+from .base_processor import BaseDataProcessor, clean_text
 from utils.logger import setup_logger
-from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
 import pandas as pd # type: ignore
-import re
 import os
 
 logger = setup_logger(__name__)
@@ -58,25 +56,6 @@ class GoogleProcessor(BaseDataProcessor):
         logger.info(f"Dropped {before_abnormal - len(self.df)} rows with abnormal star ratings.")
 
         # 3. Text data preprocessing
-        # Function to clean text
-        def clean_text(text) -> str:
-            """
-            리뷰 텍스트를 전처리합니다.
-            이모지 및 특수문자 제거 후 텍스트 벡터화를 진행합니다.
-
-            Args:
-                text (str): 원본 리뷰 텍스트
-
-            Returns:
-                str: 전처리된 리뷰 텍스트
-            """
-            if not isinstance(text, str): return ""
-            # 이모지 및 특수문자 제거, 한글/영문/숫자만 남김
-            text = re.sub(r'[^가-힣a-zA-Z0-9\s]', ' ', text)
-            # 연속된 공백 하나로 축소
-            text = re.sub(r'\s+', ' ', text).strip()
-            return text
-
         self.df['content'] = self.df['content'].apply(clean_text)
         logger.info("Text data preprocessing completed.")
 
@@ -108,6 +87,9 @@ class GoogleProcessor(BaseDataProcessor):
         # Ensure all contents are strings
         contents = self.df['content'].astype(str).tolist()
 
+        # scikit-learn은 import가 무거워서 TF-IDF를 만들 때 처음 불러온다
+        from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
+
         vectorizer = TfidfVectorizer(max_features=5000,stop_words='english')
         tfidf_matrix = vectorizer.fit_transform(contents)
 
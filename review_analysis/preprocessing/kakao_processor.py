@@ -1,10 +1,8 @@
 # @chu20-afk
 import os
-import re
 import pandas as pd # type: ignore
-from .base_processor import BaseDataProcessor
+from .base_processor import BaseDataProcessor, clean_kakao_text
 from utils.logger import setup_logger
-from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
 
 logger = setup_logger(__name__)
 
@@ -65,21 +63,7 @@ class KakaoProcessor(BaseDataProcessor):
         logger.info(f"[Kakao] Dropped {before_abnormal - len(self.df)} rows with abnormal star ratings.")
 
         # 3) Text preprocessing (emoji/special chars remove)
-        def clean_text(text) -> str:
-            """
-            이모지/특수문자 제거 + 공백 정리
-            - 한글/영문/숫자/공백만 남김
-            """
-            if not isinstance(text, str):
-                return ""
-            text = re.sub(r"[^가-힣a-zA-Z0-9\s]", " ", text)
-            text = re.sub(r"\s+", " ", text).strip()
-            # '...더보기' 제거
-            pattern = r"[\.\s…\n\r\t]+더보기"
-            text = re.sub(pattern, "", text).strip()
-            return text
-
-        self.df["content"] = self.df["content"].apply(clean_text)
+        self.df["content"] = self.df["content"].apply(clean_kakao_text)
         logger.info("[Kakao] Text preprocessing completed.")
 
     def feature_engineering(self):
@@ -116,6 +100,9 @@ class KakaoProcessor(BaseDataProcessor):
             return
 
         contents = self.df["content"].astype(str).tolist()
+        # scikit-learn은 import가 무거워서 TF-IDF를 만들 때 처음 불러온다
+        from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
+
         vectorizer = TfidfVectorizer(max_features=5000)
         tfidf_matrix = vectorizer.fit_transform(contents)
 
@@ -2,12 +2,15 @@ import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 import glob
+import tempfile
 from argparse import ArgumentParser
 from typing import Dict, Type
 from review_analysis.preprocessing.base_processor import BaseDataProcessor
 from review_analysis.preprocessing.google_processor import GoogleProcessor
 from review_analysis.preprocessing.kakao_processor import KakaoProcessor
 from review_analysis.preprocessing.tripdotcom_processor import TripdotcomProcessor
+from app.job.pipeline import publish
+from app.review.review_repository import REVIEW_STATS_FILE, ReviewRepository
 
 # 모든 preprocessing 클래스를 예시 형식으로 적어주세요. 
 # key는 "reviews_사이트이름"으로, value는 해당 처리를 위한 클래스
@@ -22,7 +25,7 @@ REVIEW_COLLECTIONS = glob.glob(os.path.join("..","..","database", "reviews_*.csv
 
 def create_parser() -> ArgumentParser:
     parser = ArgumentParser()
-    parser.add_argument('-o', '--output_dir', type=str, required=False, default = "../../database", help="Output file dir. Example: ../../database")
+    parser.add_argument('-o', '--output_dir', type=str, required=False, default = "../../database", help="Dataset root to publish into (a new release under releases/). Example: ../../database")
     parser.add_argument('-c', '--preprocessor', type=str, required=False, choices=PREPROCESS_CLASSES.keys(),
                         help=f"Which processor to use. Choices: {', '.join(PREPROCESS_CLASSES.keys())}")
     parser.add_argument('-a', '--all', action='store_true',
@@ -37,11 +40,22 @@ if __name__ == "__main__":
     os.makedirs(args.output_dir, exist_ok=True)
 
     if args.all: 
-        for csv_file in REVIEW_COLLECTIONS:
-            base_name = os.path.splitext(os.path.basename(csv_file))[0]
-            if base_name in PREPROCESS_CLASSES:
-                preprocessor_class = PREPROCESS_CLASSES[base_name]
-                preprocessor = preprocessor_class(csv_file, args.output_dir)
-                preprocessor.preprocess()
-                preprocessor.feature_engineering()
-                preprocessor.save_to_database()
+        # 서버가 읽고 있는 파일을 그 자리에서 덮어쓰지 않도록 임시 디렉토리에 쓴 뒤 새 릴리스로 올린다
+        # (같은 파일시스템이어야 publish가 파일을 옮길 수 있으므로 output_dir 안에 만든다)
+        with tempfile.TemporaryDirectory(prefix=".preprocess-", dir=args.output_dir) as staging_dir:
+            for csv_file in REVIEW_COLLECTIONS:
+                base_name = os.path.splitext(os.path.basename(csv_file))[0]
+                if base_name in PREPROCESS_CLASSES:
+                    preprocessor_class = PREPROCESS_CLASSES[base_name]
+                    preprocessor = preprocessor_class(csv_file, staging_dir)
+                    preprocessor.preprocess()
+                    preprocessor.feature_engineering()
+                    preprocessor.save_to_database()
+            if os.listdir(staging_dir):
+                release = publish(staging_dir, args.output_dir)
+                print(f"Published release {release}")
+
+    # 새 CSV로 저장소를 열면 본문 역색인과 출처별/전체 집계 테이블(review_stats.json)이 릴리스 안에 다시 만들어져 저장된다.
+    # 실행 중인 서버는 포인터(CURRENT)가 바뀐 것을 보고 새 릴리스로 바꿔 읽는다
+    repo = ReviewRepository(args.output_dir)
+    print(f"Review stats: {repo.stats.summary()['count']} reviews -> {os.path.join(repo.directory, REVIEW_STATS_FILE)}")
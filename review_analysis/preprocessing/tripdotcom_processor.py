@@ -1,9 +1,7 @@
 import os
 import pandas as pd # type: ignore
-import re
-from .base_processor import BaseDataProcessor
+from .base_processor import BaseDataProcessor, clean_text
 from utils.logger import setup_logger
-from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
 
 logger = setup_logger(__name__)
 
@@ -49,24 +47,6 @@ class TripdotcomProcessor(BaseDataProcessor):
         self.df = self.df[(self.df['rating'] >= 1) & (self.df['rating'] <= 5)]
         logger.info(f"Removed {before_outlier - len(self.df)} rows with invalid ratings.")
 
-        def clean_text(text) -> str:
-            """
-            리뷰 텍스트를 전처리합니다.
-            이모지 및 특수문자 제거 후 텍스트 벡터화를 진행합니다.
-
-            Args:
-                text (str): 원본 리뷰 텍스트
-
-            Returns:
-                str: 전처리된 리뷰 텍스트
-            """
-            if not isinstance(text, str): return ""
-            # 이모지 및 특수문자 제거, 한글/영문/숫자만 남김
-            text = re.sub(r'[^가-힣a-zA-Z0-9\s]', ' ', text)
-            # 연속된 공백 하나로 축소
-            text = re.sub(r'\s+', ' ', text).strip()
-            return text
-
         self.df['content'] = self.df['content'].apply(clean_text)
         logger.info("Text preprocessing completed.")
 
@@ -94,6 +74,9 @@ class TripdotcomProcessor(BaseDataProcessor):
 
         contents = self.df['content'].astype(str).tolist()
 
+        # scikit-learn은 import가 무거워서 TF-IDF를 만들 때 처음 불러온다
+        from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
+
         vectorizer = TfidfVectorizer(max_features=5000)
         tfidf_matrix = vectorizer.fit_transform(contents)
 
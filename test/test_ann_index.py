@@ -0,0 +1,70 @@
+import numpy as np
+from utils.ann_index import SparseANNIndex, impact_postings
+
+DOCS = [
+    "indoor park with long lines",
+    "long lines at the indoor park",
+    "outdoor magic island rides",
+    "magic island night parade",
+    "매직패스 필수 long lines",
+]
+
+
+def test_query_ranks_by_cosine_and_excludes_self():
+    """Test that neighbours come back by descending cosine, without the query document."""
+    index = SparseANNIndex.fit(DOCS)
+
+    hits = index.query(0, k=2)
+
+    assert [doc for doc, _ in hits] == [1, 4]
+    assert hits[0][1] >= hits[1][1] > 0
+    assert [doc for doc, _ in index.query(2, k=10)] == [3]
+
+
+def test_impact_postings_keep_highest_weights():
+    """Test that each term keeps only its max_postings highest-weight documents."""
+    index = SparseANNIndex.fit(DOCS)
+
+    posting_ptr, posting_rows = impact_postings(index.vectors, max_postings=1)
+    lines = index.term_ids["lines"]
+
+    assert np.all(np.diff(posting_ptr) <= 1)
+    # "lines"의 가중치는 문서가 짧을수록 크다
+    assert posting_rows[posting_ptr[lines]:posting_ptr[lines + 1]].tolist() == [4]
+
+
+def test_transform_matches_fitted_vectors():
+    """Test that transforming an indexed text reproduces its stored vector."""
+    index = SparseANNIndex.fit(DOCS)
+
+    indices, data = index.transform(DOCS[2])
+    stored_indices, stored_data = index.vectors.row(2)
+
+    assert indices.tolist() == stored_indices.tolist()
+    np.testing.assert_allclose(data, stored_data, rtol=1e-5)
+    assert index.transform("완전히 새로운 단어")[0].size == 0
+
+
+def test_save_and_load_with_mmap(tmp_path):
+    """Test that a saved index reopens memory-mapped and answers the same queries."""
+    index = SparseANNIndex.fit(DOCS, fingerprint="abc")
+    path = str(tmp_path / "ann")
+    index.save(path)
+
+    loaded = SparseANNIndex.load(path, mmap=True)
+
+    assert isinstance(loaded.posting_rows, np.memmap)
+    assert loaded.fingerprint == "abc" and len(loaded) == len(DOCS)
+    assert loaded.query(0, k=3) == index.query(0, k=3)
+
+
+def test_append_uses_frozen_vocabulary():
+    """Test that appended vectors are queryable both as neighbours and as queries."""
+    index = SparseANNIndex.fit(DOCS)
+    base = len(index)
+
+    doc = index.append(*index.transform("magic island parade rides"))
+
+    assert doc == base and len(index) == base + 1
+    assert sorted(hit for hit, _ in index.query(doc, k=2)) == [2, 3]
+    assert doc in [hit for hit, _ in index.query(2, k=3)]
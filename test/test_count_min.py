@@ -0,0 +1,34 @@
+import numpy as np
+from utils.count_min import CountMinSketch, HeavyHitters
+
+
+def test_sketch_never_underestimates():
+    """Test that Count-Min estimates are at least the true counts and exact when there are no collisions."""
+    rng = np.random.default_rng(0)
+    terms = [f"term{i}" for i in rng.zipf(1.5, 5000) if i < 500]
+    sketch = CountMinSketch(width=256, depth=4)
+    sketch.add(terms)
+
+    unique, counts = np.unique(terms, return_counts=True)
+    estimates = sketch.estimate(unique.tolist())
+
+    assert np.all(estimates >= counts)
+    assert sketch.table.nbytes == 256 * 4 * 4
+    exact = CountMinSketch(width=1 << 16, depth=4)
+    exact.add(terms)
+    assert exact.estimate(["term1"])[0] == counts[unique.tolist().index("term1")]
+
+
+def test_heavy_hitters_keep_top_k_in_fixed_memory():
+    """Test that the heap keeps the k most frequent terms while only k terms are ever stored."""
+    hitters = HeavyHitters(k=3, width=1024, depth=4)
+    for _ in range(50):
+        hitters.add(["park", "lines", "rides"] + [f"rare{i}" for i in range(20)])
+        hitters.add(["park", "lines", "rides"])
+        hitters.add(["park", "lines"])
+        hitters.add(["park"])
+
+    assert [term for term, _ in hitters.most_common()] == ["park", "lines", "rides"]
+    assert hitters.most_common(1) == [("park", 200)]
+    assert hitters.sketch.estimate(["rare0"])[0] >= 50
+    assert len(hitters.top) == 3 and len(hitters._heap) <= 6
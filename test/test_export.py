@@ -0,0 +1,30 @@
+import gzip
+import json
+from app.export import csv_chunks, gzip_chunks, ndjson_chunks
+
+
+def test_csv_chunks_write_header_then_one_chunk_per_batch():
+    """Test that each batch of rows becomes one CSV chunk, with quoting handled by the csv module."""
+    chunks = list(csv_chunks(("id", "content"), [[(1, "a, b")], [(2, 'say "hi"')]]))
+
+    assert chunks == [b'id,content\n1,"a, b"\n', b'2,"say ""hi"""\n']
+
+
+def test_csv_chunks_header_only_when_empty():
+    """Test that an empty export still produces the header line."""
+    assert b"".join(csv_chunks(("id",), [])) == b"id\n"
+
+
+def test_ndjson_chunks_keep_unicode():
+    """Test that records are written one JSON object per line without escaping Korean text."""
+    body = b"".join(ndjson_chunks([[{"content": "재밌어요"}], [{"content": "보통"}]])).decode("utf-8")
+
+    assert [json.loads(line) for line in body.splitlines()] == [{"content": "재밌어요"}, {"content": "보통"}]
+    assert "재밌어요" in body
+
+
+def test_gzip_chunks_form_a_single_stream():
+    """Test that incrementally compressed chunks decompress to the concatenated input."""
+    parts = [f"line {i}\n".encode() * 50 for i in range(20)]
+
+    assert gzip.decompress(b"".join(gzip_chunks(iter(parts)))) == b"".join(parts)
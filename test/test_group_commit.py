@@ -0,0 +1,143 @@
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.user.group_commit import GroupCommitWriter
+from app.user.sqlite_user_repository import SqliteUserRepository
+from app.user.user_repository import UserRepository
+from app.user.user_schema import User
+
+
+def test_batches_concurrent_submissions():
+    """Test that concurrent submissions are flushed together in fewer batches."""
+    flushed = []
+    writer = GroupCommitWriter(flushed.extend, window=0.05)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(lambda i=i: writer.submit(i).result()) for i in range(64)]
+        for future in futures:
+            future.result()
+    writer.close()
+
+    assert sorted(flushed) == list(range(64))
+    assert writer.batches < 64
+
+
+def test_flush_error_fails_whole_batch():
+    """Test that a failed flush is reported to every waiting request."""
+    def flush(batch):
+        raise OSError("disk full")
+
+    writer = GroupCommitWriter(flush, window=0)
+
+    with pytest.raises(OSError, match="disk full"):
+        writer.submit("op").result()
+    writer.close()
+
+
+def test_flush_results_fail_single_ops():
+    """Test that a per-op error returned by flush fails only that op's future."""
+    def flush(batch):
+        return [ValueError("rejected") if op == "bad" else None for op in batch]
+
+    writer = GroupCommitWriter(flush, window=0.05)
+    good, bad = writer.submit("good"), writer.submit("bad")
+
+    assert good.result() is None
+    with pytest.raises(ValueError, match="rejected"):
+        bad.result()
+    writer.close()
+
+
+def test_concurrent_registers_are_not_lost(tmp_path):
+    """Test that parallel writes to one repository are all persisted."""
+    path = tmp_path / "users.json"
+    path.write_text("{}")
+    repo = UserRepository(str(path))
+    users = [User(email=f"user{i}@example.com", password="pw", username=f"user{i}") for i in range(50)]
+
+    threads = [threading.Thread(target=repo.save_user, args=(u,)) for u in users]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    repo.close()
+
+    reloaded = UserRepository(str(path))
+    assert all(reloaded.get_user_by_email(u.email) is not None for u in users)
+
+
+def open_repo(kind, tmp_path):
+    if kind == "sqlite":
+        return SqliteUserRepository(str(tmp_path / "users.db"))
+    path = tmp_path / "users.json"
+    path.write_text("{}")
+    return UserRepository(str(path))
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_concurrent_same_email_registers_once(kind, tmp_path):
+    """Test that only one of several parallel registrations of the same email succeeds."""
+    repo = open_repo(kind, tmp_path)
+    users = [User(email="same@example.com", password=f"pw{i}", username=f"user{i}") for i in range(8)]
+    barrier = threading.Barrier(len(users))
+
+    def register(user):
+        barrier.wait()
+        try:
+            repo.create_user(user)
+            return None
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        results = list(pool.map(register, users))
+    stored = repo.get_user_by_email("same@example.com")
+    repo.close()
+
+    assert results.count(None) == 1
+    assert all(r == "User already Exists." for r in results if r is not None)
+    assert stored.username == users[results.index(None)].username
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_concurrent_same_username_registers_once(kind, tmp_path):
+    """Test that two emails cannot claim the same username in parallel."""
+    repo = open_repo(kind, tmp_path)
+    users = [User(email=f"user{i}@example.com", password="pw", username="same") for i in range(8)]
+
+    assert repo.create_users(users).count(None) == 1
+    repo.close()
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_update_after_delete_does_not_resurrect(kind, tmp_path):
+    """Test that a password update racing a delete fails instead of recreating the user."""
+    repo = open_repo(kind, tmp_path)
+    user = User(email="user@example.com", password="old", username="user")
+    repo.create_user(user)
+    # 서비스가 읽어 둔 사용자를 다른 요청이 먼저 지운 상황
+    stale = user.model_copy(update={"password": "new"})
+    repo.delete_user(user)
+
+    with pytest.raises(ValueError, match="User not Found."):
+        repo.update_user(stale)
+    with pytest.raises(ValueError, match="User not Found."):
+        repo.delete_user(user)
+    assert repo.get_user_by_email(user.email) is None
+    repo.close()
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_create_users_chunk_is_one_flush(kind, tmp_path):
+    """Test that a 1000-row bulk create is one flush and still reports per-row errors."""
+    repo = open_repo(kind, tmp_path)
+    repo.create_user(User(email="user0@example.com", password="pw", username="taken"))
+    flushes = repo._writer.batches
+    users = [User(email=f"user{i}@example.com", password="pw", username=f"user{i}") for i in range(1000)]
+
+    errors = repo.create_users(users)
+
+    assert repo._writer.batches - flushes == 1
+    assert errors[0] == "User already Exists."
+    assert errors[1:] == [None] * 999
+    repo.close()
@@ -0,0 +1,30 @@
+import json
+
+from benchmark.import_time import BUDGET_FILE, check, measure, package_times, parse_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      5000 |       9000 | pandas
+import time:      4000 |       4000 |   pandas.core
+import time:       300 |        300 | app.config
+"""
+
+
+def test_parse_and_group_by_package():
+    """Test that -X importtime lines are parsed and self times are summed per top-level package."""
+    modules = parse_importtime(SAMPLE)
+
+    assert modules[1] == ("pandas", 5000)
+    assert package_times(modules, exclude=frozenset({"_io"})) == {"pandas": 9000, "app": 300}
+
+
+def test_entry_points_do_not_import_forbidden_packages():
+    """Test that no budgeted entry point loads a heavy package it is supposed to import lazily."""
+    with open(BUDGET_FILE, encoding="utf-8") as f:
+        budgets = json.load(f)
+
+    for module, budget in budgets.items():
+        report = measure(module, repeat=1, startup=frozenset())
+        # 시간은 기계마다 달라서 여기서는 보지 않는다 (python -m benchmark.import_time 으로 확인)
+        problems = check(report, dict(budget, budget_ms=float("inf")))
+        assert problems == [], f"{module}: {problems}"
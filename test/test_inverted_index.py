@@ -0,0 +1,99 @@
+import numpy as np
+from utils.inverted_index import InvertedIndex, decode_postings, encode_postings, tokenize
+
+DOCS = [
+    "Lotte World indoor park",
+    "indoor park with long lines lines lines",
+    "outdoor magic island",
+    "매직패스 필수 indoor",
+]
+
+
+def test_postings_roundtrip():
+    """Test that delta + varint encoding round-trips large gaps and counts."""
+    postings = [(0, 1), (5, 3), (300, 1), (70000, 200)]
+
+    assert decode_postings(encode_postings(postings)) == ([0, 5, 300, 70000], [1, 3, 1, 200])
+
+
+def test_tokenize_matches_vectorizer_rules():
+    """Test that tokens are lowercased and single characters are dropped."""
+    assert tokenize("Indoor 줄 매직패스!") == ["indoor", "매직패스"]
+
+
+def test_search_intersects_terms():
+    """Test that only documents containing every query term are returned."""
+    index = InvertedIndex.build(DOCS)
+
+    assert [doc for doc, _ in index.search("indoor park")] == [0, 1]
+    assert [doc for doc, _ in index.search("매직패스 indoor")] == [3]
+    assert index.search("indoor unknownword") == []
+
+
+def test_search_respects_allowed_bitmap_and_k():
+    """Test filtering by a bitmap and truncating to top-k."""
+    index = InvertedIndex.build(DOCS)
+    allowed = np.array([False, True, True, True])
+
+    assert [doc for doc, _ in index.search("indoor", allowed=allowed)] == [3, 1]
+    assert len(index.search("indoor", k=1)) == 1
+
+
+def test_save_and_load(tmp_path):
+    """Test that a saved index answers queries identically after loading."""
+    index = InvertedIndex.build(DOCS, fingerprint="v1")
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+
+    loaded = InvertedIndex.load(path)
+
+    assert loaded.fingerprint == "v1"
+    assert loaded.search("indoor park") == index.search("indoor park")
+
+
+def test_add_matches_full_build():
+    """Test that documents added after build score exactly like a full rebuild."""
+    index = InvertedIndex.build(DOCS[:2])
+    index.add(DOCS[2:])
+    full = InvertedIndex.build(DOCS)
+
+    assert len(index) == len(DOCS)
+    assert index.search("indoor") == full.search("indoor")
+    assert index.search("매직패스 indoor") == full.search("매직패스 indoor")
+
+
+def brute_force(docs, query):
+    terms = set(tokenize(query))
+    return sorted(i for i, text in enumerate(docs) if terms <= set(tokenize(text)))
+
+
+def test_block_skipping_matches_full_scan(monkeypatch):
+    """Test that multi-block intersections match a brute-force scan and decode only the blocks holding candidates."""
+    docs = [f"common{' even' if i % 2 == 0 else ''}{' rare' if i in (5, 700, 2900) else ''}" for i in range(3000)]
+    index = InvertedIndex.build(docs[:2500])
+    index.add(docs[2500:])
+    assert len(index.block_max) > 20
+    decoded = []
+
+    def counting_decode(data, base=0):
+        decoded.append(base)
+        return decode_postings(data, base)
+
+    monkeypatch.setattr("utils.inverted_index.decode_postings", counting_decode)
+
+    for query in ("rare common", "even rare", "even common", "common"):
+        assert sorted(doc for doc, _ in index.search(query, k=3000)) == brute_force(docs, query)
+    decoded.clear()
+    index.search("rare common")
+    # rare 전체 1번 + common에서 후보가 든 블록 2개 (2900은 add()로 들어온 문서)
+    assert len(decoded) == 3
+
+
+def test_lookup_returns_term_frequencies():
+    """Test that lookup finds tf for candidates across blocks and the uncompressed delta postings."""
+    index = InvertedIndex.build(["word word"] * 300 + ["other"] * 10)
+    index.add(["word", "other"])
+
+    tfs = index.lookup("word", np.array([0, 150, 299, 300, 310, 311]))
+
+    assert tfs.tolist() == [2, 2, 2, 0, 1, 0]
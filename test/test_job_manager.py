@@ -0,0 +1,197 @@
+import json
+import os
+import time
+import pytest
+from app.job.job_manager import JobManager, JobQueueFull
+from app.job.pipeline import JOB_FILE, OUTPUT_DIR, JobProgress, publish
+from app.review.review_repository import REVIEW_ANN_DIR, REVIEW_CURRENT_FILE, REVIEW_RELEASES_DIR, dataset_directory
+
+# 워커 프로세스(spawn)에서 import 되어야 하므로 job 함수들은 모듈 최상위에 둔다
+
+
+def quick_job(kind, data_dir, job_dir):
+    output = os.path.join(job_dir, OUTPUT_DIR)
+    os.makedirs(output)
+    progress = JobProgress(job_dir, total=1)
+    progress.step("write")
+    with open(os.path.join(output, f"{kind}.txt"), "w") as f:
+        f.write(kind)
+    progress.finish()
+
+
+def slow_job(kind, data_dir, job_dir):
+    progress = JobProgress(job_dir, total=1000)
+    for i in range(1000):
+        progress.step(f"step {i}")
+        time.sleep(0.01)
+
+
+def failing_job(kind, data_dir, job_dir):
+    raise RuntimeError("boom")
+
+
+def wait(manager, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.status not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers = []
+    published = []
+
+    def publish_output(kind, output_dir):
+        publish(output_dir, str(tmp_path))
+        published.append(kind)
+        return f"v{len(published)}"
+
+    def make(target, **kwargs):
+        manager = JobManager(publish_output, data_dir=str(tmp_path), jobs_dir=str(tmp_path / "jobs"), target=target, **kwargs)
+        managers.append(manager)
+        return manager
+
+    make.published = published
+    yield make
+    for manager in managers:
+        manager.shutdown()
+
+
+def test_successful_job_is_published(make_manager, tmp_path):
+    """Test that a finished job's output is moved into the data directory and only its job record is kept."""
+    manager = make_manager(quick_job)
+
+    job = wait(manager, manager.submit("preprocess").id)
+
+    assert job.status == "succeeded" and job.version == "v1"
+    assert job.progress.done == job.progress.total == 1
+    assert open(os.path.join(dataset_directory(str(tmp_path)), "preprocess.txt")).read() == "preprocess"
+    assert os.listdir(tmp_path / "jobs" / job.id) == [JOB_FILE]
+
+
+def test_failed_job_reports_error(make_manager):
+    """Test that an exception in the worker marks the job failed without publishing."""
+    manager = make_manager(failing_job)
+
+    job = wait(manager, manager.submit("embedding").id)
+
+    assert job.status == "failed" and "boom" in job.error
+    assert make_manager.published == []
+
+
+def test_cancel_running_and_queued_jobs(make_manager):
+    """Test that a queued job is cancelled immediately and a running one stops at its next step."""
+    manager = make_manager(slow_job, workers=1)
+    running = manager.submit("preprocess")
+    queued = manager.submit("preprocess")
+    # 실행 중이라고 표시된 것만으로는 아직 한 단계도 안 했을 수 있다. 진행이 보일 때까지 기다린다
+    deadline = time.monotonic() + 30
+    while manager.get(running.id).progress.done < 1:
+        assert time.monotonic() < deadline, "job made no progress"
+        time.sleep(0.05)
+
+    assert manager.cancel(queued.id).status == "cancelled"
+    manager.cancel(running.id)
+    job = wait(manager, running.id)
+
+    assert job.status == "cancelled"
+    assert 0 < job.progress.done < 1000
+    assert make_manager.published == []
+
+
+def test_queue_is_bounded(make_manager):
+    """Test that submitting beyond queue_size queued/running jobs is rejected."""
+    manager = make_manager(slow_job, workers=1, queue_size=2)
+    jobs = [manager.submit("preprocess"), manager.submit("preprocess")]
+
+    with pytest.raises(JobQueueFull):
+        manager.submit("preprocess")
+    for job in jobs:
+        manager.cancel(job.id)
+    with pytest.raises(ValueError):
+        manager.get("missing")
+
+
+def test_jobs_are_shared_between_server_workers(make_manager):
+    """Test that a job submitted in one server worker can be read, listed and cancelled from another."""
+    owner = make_manager(slow_job, workers=1)
+    other = make_manager(slow_job, workers=1, queue_size=2)
+    running = owner.submit("preprocess")
+    deadline = time.monotonic() + 30
+    while other.get(running.id).progress.done < 1:
+        assert time.monotonic() < deadline, "job made no progress"
+        time.sleep(0.05)
+
+    assert other.get(running.id).status == "running"
+    assert [job.id for job in other.list()] == [running.id]
+    other.submit("preprocess")
+    # 대기열 제한은 다른 워커의 job까지 센다
+    with pytest.raises(JobQueueFull):
+        other.submit("preprocess")
+
+    other.cancel(running.id)
+    job = wait(other, running.id)
+
+    assert job.status == "cancelled" and owner.get(running.id).status == "cancelled"
+    assert make_manager.published == []
+
+
+def test_job_of_a_dead_worker_is_failed(make_manager, tmp_path):
+    """Test that an unfinished job left by a stopped server worker is reported as failed, not running forever."""
+    owner = make_manager(slow_job, workers=1)
+    job = owner.submit("preprocess")
+    owner.shutdown()
+    # shutdown은 job을 취소로 기록한다. 기록을 남기지 못하고 죽은 경우를 흉내 내서 상태를 되돌린다
+    path = tmp_path / "jobs" / job.id / JOB_FILE
+    data = json.loads(path.read_text())
+    path.write_text(json.dumps({**data, "status": "queued", "finished_at": None}))
+
+    found = make_manager(slow_job).get(job.id)
+
+    assert found.status == "failed" and "exited" in found.error
+
+
+def write_output(directory, files):
+    os.makedirs(directory)
+    for name, text in files.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+    return str(directory)
+
+
+def test_publish_switches_whole_release_at_once(tmp_path):
+    """Test that publishing builds a new release next to the old one and switches to it with one pointer write."""
+    # 릴리스를 올린 적 없는 저장소: 데이터셋 파일이 data_dir 바로 아래에 있다
+    (tmp_path / "preprocessed_reviews_google.csv").write_text("old google")
+    (tmp_path / "preprocessed_reviews_naver.csv").write_text("old naver")
+    (tmp_path / "reviews_google.csv").write_text("raw")
+
+    first = publish(write_output(tmp_path / "out1", {"preprocessed_reviews_google.csv": "new google"}), str(tmp_path))
+
+    assert dataset_directory(str(tmp_path)) == first
+    assert sorted(os.listdir(first)) == ["preprocessed_reviews_google.csv", "preprocessed_reviews_naver.csv"]
+    assert open(os.path.join(first, "preprocessed_reviews_google.csv")).read() == "new google"
+    # 릴리스 밖(data_dir 바로 아래)의 파일은 그 자리에서 고쳐 쓰일 수 있으므로 하드링크가 아니라 복사로 물려받는다
+    assert not os.path.samefile(os.path.join(first, "preprocessed_reviews_naver.csv"), tmp_path / "preprocessed_reviews_naver.csv")
+    (tmp_path / "preprocessed_reviews_naver.csv").write_text("rewritten in place")
+    assert open(os.path.join(first, "preprocessed_reviews_naver.csv")).read() == "old naver"
+    # 원래 자리의 파일은 건드리지 않는다 (이전 포인터를 따르던 쪽은 계속 같은 묶음을 읽는다)
+    assert (tmp_path / "preprocessed_reviews_google.csv").read_text() == "old google"
+
+    second = publish(write_output(tmp_path / "out2", {f"{REVIEW_ANN_DIR}/meta.json": "{}"}), str(tmp_path))
+    third = publish(write_output(tmp_path / "out3", {"preprocessed_reviews_naver.csv": "new naver"}), str(tmp_path))
+
+    assert dataset_directory(str(tmp_path)) == third
+    assert (tmp_path / REVIEW_CURRENT_FILE).read_text() == os.path.basename(third)
+    assert open(os.path.join(third, "preprocessed_reviews_google.csv")).read() == "new google"
+    assert os.path.exists(os.path.join(third, REVIEW_ANN_DIR, "meta.json"))
+    # 릴리스끼리는 바뀌지 않은 파일을 복사하지 않고 하드링크로 물려받는다
+    assert os.path.samefile(os.path.join(second, "preprocessed_reviews_google.csv"), os.path.join(third, "preprocessed_reviews_google.csv"))
+    # 지금 릴리스와 직전 릴리스만 남는다
+    assert sorted(os.listdir(tmp_path / REVIEW_RELEASES_DIR)) == [os.path.basename(second), os.path.basename(third)]
@@ -0,0 +1,42 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.dependencies import get_job_manager
+from app.job.job_manager import JobManager
+from test.test_job_manager import quick_job
+
+# FastAPI 테스트 클라이언트
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def override_job_manager(tmp_path):
+    manager = JobManager(lambda kind, output_dir: "v1", data_dir=str(tmp_path), jobs_dir=str(tmp_path / "jobs"), target=quick_job)
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    yield
+    app.dependency_overrides = {}
+    manager.shutdown()
+
+
+# 테스트: job 생성 후 상태 조회로 완료 확인
+def test_create_and_poll_job():
+    response = client.post("/api/jobs", json={"kind": "preprocess"})
+
+    # 검증
+    assert response.status_code == 202
+    job_id = response.json()["data"]["id"]
+    for _ in range(200):
+        data = client.get(f"/api/jobs/{job_id}").json()["data"]
+        if data["status"] == "succeeded":
+            break
+        time.sleep(0.05)
+    assert data["status"] == "succeeded" and data["version"] == "v1"
+    assert [job["id"] for job in client.get("/api/jobs").json()["data"]] == [job_id]
+
+
+# 테스트: 알 수 없는 종류는 422, 없는 job은 404
+def test_job_errors():
+    assert client.post("/api/jobs", json={"kind": "crawl"}).status_code == 422
+    assert client.get("/api/jobs/missing").status_code == 404
+    assert client.delete("/api/jobs/missing").status_code == 404
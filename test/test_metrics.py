@@ -0,0 +1,82 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_review_repository, get_user_repository
+from app.main import app
+from app.metrics import Histogram, MetricsRegistry, metrics
+from app.review.review_repository import ReviewRepository
+from app.user.user_repository import UserRepository
+from app.user.user_schema import User
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def override_repositories(tmp_path):
+    """Point the app at throwaway stores so requests never write into database/."""
+    (tmp_path / "users.json").write_text("{}")
+    user_repo = UserRepository(str(tmp_path / "users.json"))
+    review_repo = ReviewRepository(str(tmp_path / "reviews"))
+    app.dependency_overrides[get_user_repository] = lambda: user_repo
+    app.dependency_overrides[get_review_repository] = lambda: review_repo
+    yield
+    app.dependency_overrides = {}
+    user_repo.close()
+
+
+def test_histogram_buckets():
+    """Test that observations land in the first bucket whose bound covers them."""
+    histogram = Histogram((0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(0.5, nbytes=10)
+    histogram.observe(3.0)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.bytes == 10
+
+
+def test_render_cumulative_buckets():
+    """Test that the exposition output uses cumulative bucket counts."""
+    registry = MetricsRegistry()
+    registry.observe_request("GET", "/api/user/me", 200, 0.0002)
+    registry.observe_request("GET", "/api/user/me", 200, 20.0)
+    registry.observe_repository("json", "flush", 0.001, nbytes=128)
+
+    text = registry.render()
+
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/user/me",status="200",le="0.00025"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/user/me",status="200",le="+Inf"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/user/me",status="200"} 2' in text
+    assert 'user_repository_bytes_total{store="json",operation="flush"} 128' in text
+
+
+def test_metrics_endpoint_labels_route_template():
+    """Test that requests are recorded under the route template, not the raw path."""
+    client.post("/api/user/login", json={"email": "nobody@example.com", "password": "x"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/user/login"' in response.text
+
+
+def test_repository_timings_recorded(tmp_path):
+    """Test that the JSON store records load, lookup and flush timings with byte counts."""
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps({}))
+    before = {key: h.count for key, h in metrics.repository.items()}
+
+    flushed_bytes = metrics.repository[("json", "flush")].bytes if ("json", "flush") in metrics.repository else 0
+
+    repo = UserRepository(str(path))
+    repo.save_user(User(email="new@example.com", password="password123", username="New"))
+    repo.get_user_by_email("new@example.com")
+    repo.close()
+
+    for operation in ("load", "lookup", "flush"):
+        assert metrics.repository[("json", operation)].count > before.get(("json", operation), 0)
+    assert metrics.repository[("json", "flush")].bytes > flushed_bytes
@@ -0,0 +1,81 @@
+import threading
+import time
+import pytest
+from app.user.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher():
+    return PasswordHasher(iterations=1000, max_workers=2)
+
+
+def test_hash_and_verify(hasher):
+    """Test that a hash verifies only the original password and is salted."""
+    stored = hasher.hash("password123")
+
+    assert stored.startswith("pbkdf2_sha256$1000$")
+    assert hasher.verify("password123", stored)
+    assert not hasher.verify("wrongpassword", stored)
+    assert hasher.hash("password123") != stored
+
+
+def test_needs_rehash(hasher):
+    """Test that plaintext and outdated-cost records need rehashing."""
+    assert hasher.needs_rehash("password123")
+    assert hasher.needs_rehash(PasswordHasher(iterations=500).hash("password123"))
+    assert not hasher.needs_rehash(hasher.hash("password123"))
+
+
+def test_queue_timeout():
+    """Test that a full hashing queue raises PasswordHasherBusy after the timeout."""
+    hasher = PasswordHasher(iterations=1000, max_workers=1, max_pending=1, queue_timeout=0.01)
+    started, release = threading.Event(), threading.Event()
+
+    def hold_slot():
+        started.set()
+        release.wait()
+
+    blocker = threading.Thread(target=hasher._run, args=(hold_slot,))
+    blocker.start()
+    started.wait()
+
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher.hash("password123")
+    finally:
+        release.set()
+        blocker.join()
+
+
+@pytest.mark.parametrize("stored", [
+    "pbkdf2_sha256$",
+    "pbkdf2_sha256$1000$c2FsdA==",
+    "pbkdf2_sha256$abc$c2FsdA==$aGFzaA==",
+    "pbkdf2_sha256$1000$not base64!$aGFzaA==",
+    "pbkdf2_sha256$1000$c2FsdA==$aGFzaA==$extra",
+])
+def test_malformed_hash_is_rejected(hasher, stored):
+    """Test that a malformed stored hash fails verification instead of raising."""
+    assert not hasher.verify(stored, stored)
+    assert not hasher.verify("password123", stored)
+    assert hasher.needs_rehash(stored)
+
+
+def test_hash_many_runs_in_parallel():
+    """Test that a batch is hashed on several pool threads and every hash verifies."""
+    hasher = PasswordHasher(iterations=1000, max_workers=4)
+    threads = set()
+    original = hasher._hash
+
+    def record(*args):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return original(*args)
+
+    hasher._hash = record
+    passwords = [f"password{i}" for i in range(12)]
+
+    hashes = hasher.hash_many(passwords)
+
+    assert len(threads) > 1
+    assert all(hasher.verify(p, h) for p, h in zip(passwords, hashes))
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.response_cache import ResponseCache, ResponseCacheMiddleware
+
+
+@pytest.fixture
+def state():
+    return {"version": "v1", "calls": 0}
+
+
+@pytest.fixture
+def client(state):
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware, version=lambda scope: state["version"], prefix="/api",
+                       cache=ResponseCache(max_size=2))
+
+    @app.get("/api/items")
+    def items(page: int = 0):
+        state["calls"] += 1
+        return {"page": page, "version": state["version"]}
+
+    @app.get("/api/missing")
+    def missing():
+        state["calls"] += 1
+        raise HTTPException(status_code=404)
+
+    @app.get("/api/stream")
+    def stream():
+        state["calls"] += 1
+        return StreamingResponse(iter([b"a", b"b"]))
+
+    return TestClient(app)
+
+
+def test_hit_skips_the_app_and_revalidates_with_304(client, state):
+    """Test that a repeated GET is served from the cache and a matching If-None-Match gets 304."""
+    first = client.get("/api/items", params={"page": 1})
+    etag = first.headers["etag"]
+
+    second = client.get("/api/items", params={"page": 1})
+    not_modified = client.get("/api/items", params={"page": 1}, headers={"If-None-Match": etag})
+
+    assert second.json() == first.json() and second.headers["etag"] == etag
+    assert first.headers["cache-control"] == "no-cache"
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert state["calls"] == 1
+
+
+def test_new_version_invalidates_entries(client, state):
+    """Test that publishing a new dataset version drops old entries and changes the ETag."""
+    etag = client.get("/api/items").headers["etag"]
+    state["version"] = "v2"
+
+    response = client.get("/api/items", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["version"] == "v2"
+    assert response.headers["etag"] != etag
+    assert state["calls"] == 2
+
+
+def test_lru_eviction_and_query_normalisation(client, state):
+    """Test that the least recently used entry is evicted and parameter order does not matter."""
+    client.get("/api/items?page=1&x=a")
+    client.get("/api/items?x=a&page=1")
+    client.get("/api/items", params={"page": 2})
+    client.get("/api/items", params={"page": 1, "x": "a"})
+    client.get("/api/items", params={"page": 3})
+    assert state["calls"] == 3
+
+    client.get("/api/items", params={"page": 2})
+
+    assert state["calls"] == 4
+
+
+def test_errors_and_streams_are_not_cached(client, state):
+    """Test that non-200 and streaming (no Content-Length) responses pass through untouched."""
+    for _ in range(2):
+        assert client.get("/api/missing").status_code == 404
+        response = client.get("/api/stream")
+        assert response.content == b"ab" and "etag" not in response.headers
+
+    assert state["calls"] == 4
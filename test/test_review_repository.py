@@ -0,0 +1,267 @@
+import datetime
+import os
+import threading
+import pytest
+from app.review.review_repository import (
+    REVIEW_ANN_DIR, REVIEW_INDEX_FILE, REVIEW_INGEST_FILE, REVIEW_STATS_FILE, REVIEW_TRENDING_FILE, ReviewIndexNotBuilt,
+    ReviewRepository,
+)
+from app.review.review_schema import ReviewFilter, ReviewIngest
+from app.job.pipeline import publish
+
+
+@pytest.fixture
+def review_dir(tmp_path):
+    # 출처마다 열 구성이 다르다 (google: month/weekday 없음, tripdotcom: is_positive 없음)
+    (tmp_path / "preprocessed_reviews_google.csv").write_text(
+        "﻿rating,date,content,content_length,is_positive\n"
+        "5.0,2025-03-01,great rides,11,1\n"
+        "2.0,2025-03-08,long lines,10,0\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "preprocessed_reviews_tripdotcom.csv").write_text(
+        "﻿rating,date,content,content_length,month,weekday\n"
+        "4,2025-04-05,재밌어요,4,4,Saturday\n"
+        "3,2025-03-03,보통,2,3,Monday\n",
+        encoding="utf-8",
+    )
+    return str(tmp_path)
+
+
+@pytest.fixture
+def repo(review_dir):
+    return ReviewRepository(review_dir)
+
+
+def test_load_columns(repo):
+    """Test that every source is loaded into one set of column arrays with derived fields."""
+    assert repo.sources == ["google", "tripdotcom"]
+    assert len(repo) == 4
+
+    review = repo.get(2)
+    assert review.source == "tripdotcom"
+    assert review.is_positive is True
+    assert review.weekday == "Saturday"
+    assert repo.get(0).month == 3
+
+
+def test_filters_combine(repo):
+    """Test that bitmap and range filters are ANDed together."""
+    total, rows = repo.query(ReviewFilter(month=3, min_rating=3))
+    assert total == 2
+    assert sorted(rows.tolist()) == [0, 3]
+
+    total, rows = repo.query(ReviewFilter(source=["google"], weekday="Saturday"))
+    assert rows.tolist() == [1, 0]
+
+    total, _ = repo.query(ReviewFilter(date_from=datetime.date(2025, 3, 3), date_to=datetime.date(2025, 3, 8)))
+    assert total == 2
+
+
+def test_sort_orders_and_paging(repo):
+    """Test the precomputed sort orders and offset/limit slicing."""
+    assert repo.query(ReviewFilter(), "-date")[1].tolist() == [2, 1, 3, 0]
+    assert repo.query(ReviewFilter(), "rating")[1].tolist() == [1, 3, 2, 0]
+
+    total, rows = repo.query(ReviewFilter(), "-rating", offset=1, limit=2)
+    assert total == 4
+    assert rows.tolist() == [2, 3]
+
+
+def test_unknown_source_and_id(repo):
+    """Test that unknown sources and ids raise ValueError."""
+    with pytest.raises(ValueError, match="Unknown Source"):
+        repo.query(ReviewFilter(source=["naver"]))
+    with pytest.raises(ValueError, match="Review not Found."):
+        repo.get(10)
+
+
+def test_empty_directory(tmp_path):
+    """Test that a directory without preprocessed CSVs yields an empty repository."""
+    repo = ReviewRepository(str(tmp_path))
+
+    assert len(repo) == 0
+    assert repo.query(ReviewFilter())[0] == 0
+
+
+def test_search_uses_persisted_index(repo, review_dir):
+    """Test that the inverted index is saved next to the CSVs and reused while they are unchanged."""
+    path = os.path.join(review_dir, REVIEW_INDEX_FILE)
+    assert os.path.exists(path)
+    mtime = os.stat(path).st_mtime_ns
+
+    reopened = ReviewRepository(review_dir)
+
+    assert os.stat(path).st_mtime_ns == mtime
+    assert [row for row, _ in reopened.search("great rides", ReviewFilter())] == [0]
+    assert reopened.search("great rides", ReviewFilter(source=["tripdotcom"])) == []
+
+
+def test_index_rebuilt_when_csv_changes(repo, review_dir):
+    """Test that re-running preprocessing (a changed CSV) invalidates the stored index."""
+    with open(os.path.join(review_dir, "preprocessed_reviews_google.csv"), "a", encoding="utf-8") as f:
+        f.write("4.0,2025-05-05,new attraction,14,1\n")
+
+    reopened = ReviewRepository(review_dir)
+
+    assert [row for row, _ in reopened.search("attraction", ReviewFilter())] == [2]
+
+
+def test_similar_requires_offline_index(repo, review_dir):
+    """Test that similar() fails until the ANN index is built, then reopens it memory-mapped."""
+    with pytest.raises(ReviewIndexNotBuilt):
+        repo.similar(0)
+    with open(os.path.join(review_dir, "preprocessed_reviews_google.csv"), "a", encoding="utf-8") as f:
+        f.write("4.0,2025-05-05,great long rides,16,1\n")
+    repo = ReviewRepository(review_dir)
+    repo.build_ann()
+    assert os.path.isdir(os.path.join(review_dir, REVIEW_ANN_DIR))
+
+    reopened = ReviewRepository(review_dir)
+
+    assert [row for row, _ in reopened.similar(2)] == [0, 1]
+    with pytest.raises(ValueError):
+        reopened.similar(100)
+
+
+def test_similar_index_stale_when_csv_changes(repo, review_dir):
+    """Test that an ANN index built from older CSVs is not used."""
+    repo.build_ann()
+    with open(os.path.join(review_dir, "preprocessed_reviews_google.csv"), "a", encoding="utf-8") as f:
+        f.write("4.0,2025-05-05,new attraction,14,1\n")
+
+    with pytest.raises(ReviewIndexNotBuilt):
+        ReviewRepository(review_dir).similar(0)
+
+
+def test_stats_materialized_next_to_csvs(repo, review_dir):
+    """Test that per-source aggregates are saved once and rebuilt only when the CSVs change."""
+    path = os.path.join(review_dir, REVIEW_STATS_FILE)
+    mtime = os.stat(path).st_mtime_ns
+
+    assert ReviewRepository(review_dir).stats.summary("google")["count"] == 2
+    assert os.stat(path).st_mtime_ns == mtime
+
+    with open(os.path.join(review_dir, "preprocessed_reviews_google.csv"), "a", encoding="utf-8") as f:
+        f.write("4.0,2025-05-05,new attraction,14,1\n")
+    stats = ReviewRepository(review_dir).stats
+
+    assert stats.summary("google")["count"] == 3
+    assert stats.summary()["by_month"]["5"] == 1
+
+
+def test_ingest_requires_frozen_vectorizer(repo):
+    """Test that ingestion is refused until the TF-IDF vocabulary (ANN index) exists."""
+    with pytest.raises(ReviewIndexNotBuilt):
+        repo.ingest([ReviewIngest(source="google", rating=5, date="2025-06-01", content="great rides")])
+
+
+def test_ingest_appends_incrementally(repo, review_dir):
+    """Test that ingested reviews are cleaned, featurized and visible to every read path without a reload."""
+    repo.build_ann()
+    index_mtime = os.stat(os.path.join(review_dir, REVIEW_INDEX_FILE)).st_mtime_ns
+    version = repo.version
+
+    ids = repo.ingest([
+        ReviewIngest(source="google", rating=4.5, date="2025-06-02", content="Great rides!! 😀  again"),
+        ReviewIngest(source="tripdotcom", rating=1, date="2025-03-08", content="줄이 너무 길어요..."),
+    ])
+
+    assert ids == [4, 5]
+    review = repo.get(4)
+    assert review.content == "Great rides again"
+    assert (review.content_length, review.is_positive, review.month, review.weekday) == (17, True, 6, "Monday")
+    assert repo.version != version and repo.fingerprint() == repo.version
+    assert repo.query(ReviewFilter(), "-date")[1].tolist()[:1] == [4]
+    assert repo.query(ReviewFilter(date_from=datetime.date(2025, 3, 8), date_to=datetime.date(2025, 3, 8)))[0] == 2
+    assert sorted(row for row, _ in repo.search("rides", ReviewFilter(source=["google"]))) == [0, 4]
+    assert repo.stats.summary("google")["count"] == 3
+    assert 0 in [row for row, _ in repo.similar(4)]
+    # 저장해 둔 색인은 다시 만들지 않는다
+    assert os.stat(os.path.join(review_dir, REVIEW_INDEX_FILE)).st_mtime_ns == index_mtime
+    with pytest.raises(ValueError):
+        repo.ingest([ReviewIngest(source="naver", rating=3, date="2025-06-01", content="x")])
+
+
+def test_search_is_not_interleaved_with_ingest(repo):
+    """Test that an ingest arriving between the filter mask and the index lookup waits for the search."""
+    repo.build_ann()
+    search = repo.index.search
+    ingest = threading.Thread(target=repo.ingest, args=([ReviewIngest(source="google", rating=5, date="2025-06-01", content="rides")],))
+
+    def search_during_ingest(query, k, allowed):
+        ingest.start()
+        ingest.join(0.2)
+        # ingest는 검색이 끝날 때까지 기다린다
+        assert ingest.is_alive()
+        return search(query, k, allowed)
+
+    repo.index.search = search_during_ingest
+    assert sorted(row for row, _ in repo.search("rides", ReviewFilter())) == [0]
+    ingest.join()
+    repo.index.search = search
+    assert sorted(row for row, _ in repo.search("rides", ReviewFilter())) == [0, 4]
+
+
+def test_repository_follows_published_release(repo, review_dir):
+    """Test that a new release changes the version and a reload reads only the release the pointer names."""
+    output = os.path.join(review_dir, "out")
+    os.makedirs(output)
+    with open(os.path.join(output, "preprocessed_reviews_google.csv"), "w", encoding="utf-8") as f:
+        f.write("rating,date,content,content_length,is_positive\n1.0,2025-05-01,closed,6,0\n")
+    version = repo.version
+
+    release = publish(output, review_dir)
+
+    assert repo.fingerprint() != version
+    reloaded = ReviewRepository(review_dir)
+    assert reloaded.directory == release and reloaded.root == review_dir
+    assert len(reloaded) == 3
+    assert reloaded.stats.summary("google")["count"] == 1
+
+
+def test_ingested_reviews_replayed_on_load(repo, review_dir):
+    """Test that a restarted repository replays the ingested store on top of the persisted indexes."""
+    repo.build_ann()
+    repo.ingest([ReviewIngest(source="google", rating=2, date="2025-06-01", content="NA")])
+    assert os.path.exists(os.path.join(review_dir, REVIEW_INGEST_FILE))
+
+    reopened = ReviewRepository(review_dir)
+
+    assert len(reopened) == 5 and reopened.base_size == 4
+    assert reopened.get(4).content == "NA"
+    assert reopened.version == repo.version
+    assert reopened.stats.summary()["count"] == 5
+    assert len(reopened.ann) == 5 and len(reopened.index) == 5
+
+
+def test_ingest_from_another_worker_leaves_version_stale(repo, review_dir):
+    """Test that rows appended by another process are not hidden behind this process's new version."""
+    repo.build_ann()
+    other = ReviewRepository(review_dir)
+    other.ingest([ReviewIngest(source="google", rating=5, date="2025-06-01", content="first worker")])
+
+    repo.ingest([ReviewIngest(source="tripdotcom", rating=3, date="2025-06-02", content="second worker")])
+
+    assert len(repo) == 5
+    assert repo.fingerprint() != repo.version
+    reopened = ReviewRepository(review_dir)
+    assert [reopened.get(row).content for row in (4, 5)] == ["first worker", "second worker"]
+
+
+def test_trending_terms_snapshot_and_ingest(repo, review_dir):
+    """Test that trending terms are snapshotted, updated on ingest and caught up from the ingested store on load."""
+    assert os.path.exists(os.path.join(review_dir, REVIEW_TRENDING_FILE))
+    top, months = repo.trending_terms("google", "all", 5)
+    assert ("rides", 1) in top and months == ["2025-03"]
+
+    repo.build_ann()
+    repo.ingest([ReviewIngest(source="google", rating=5, date="2025-06-01", content="great rides")])
+    reopened = ReviewRepository(review_dir)
+
+    for current in (repo, reopened):
+        assert current.trending_terms("google", "2025-06", 5)[0] == [("great", 1), ("rides", 1)]
+        assert ("rides", 2) in current.trending_terms("all", "all", 10)[0]
+    assert reopened.trending.rows == len(reopened) == 5
+    with pytest.raises(ValueError):
+        repo.trending_terms("google", "2019-01", 5)
@@ -0,0 +1,191 @@
+import gzip
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app import dependencies
+from app.dependencies import get_review_repository
+from app.review.review_repository import ReviewRepository
+
+# FastAPI 테스트 클라이언트
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def override_repository(tmp_path):
+    (tmp_path / "preprocessed_reviews_kakao.csv").write_text(
+        "﻿rating,date,content,content_length,is_positive,month,weekday\n"
+        "5.0,2025-03-14,굿굿굿,3,1,3,Friday\n"
+        "3.0,2025-01-29,명절연휴는 진짜,8,0,1,Wednesday\n"
+        "4.0,2025-03-01,대박,2,1,3,Saturday\n",
+        encoding="utf-8",
+    )
+    repo = ReviewRepository(str(tmp_path))
+    app.dependency_overrides[get_review_repository] = lambda: repo
+    yield
+    app.dependency_overrides = {}
+
+
+# 테스트: 필터 + 정렬 + 페이지
+def test_list_reviews():
+    response = client.get("/api/reviews", params={"source": "kakao", "month": 3, "sort": "rating", "limit": 1})
+
+    # 검증
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 2
+    assert [r["content"] for r in data["reviews"]] == ["대박"]
+
+
+# 테스트: 알 수 없는 출처는 400, 잘못된 요일은 422
+def test_list_reviews_invalid_filters():
+    assert client.get("/api/reviews", params={"source": "naver"}).status_code == 400
+    assert client.get("/api/reviews", params={"weekday": "Funday"}).status_code == 422
+
+
+# 테스트: id로 단건 조회
+def test_get_review():
+    response = client.get("/api/reviews/1")
+
+    # 검증
+    assert response.status_code == 200
+    assert response.json()["data"]["weekday"] == "Wednesday"
+    assert client.get("/api/reviews/100").status_code == 404
+
+
+# 테스트: 본문 검색 (모든 단어를 포함한 리뷰만, 점수 순)
+def test_search_reviews():
+    response = client.get("/api/reviews/search", params={"q": "굿굿굿", "k": 5})
+
+    # 검증
+    assert response.status_code == 200
+    hits = response.json()["data"]
+    assert [hit["review"]["id"] for hit in hits] == [0]
+    assert hits[0]["score"] > 0
+    assert client.get("/api/reviews/search").status_code == 422
+
+
+# 테스트: 유사 리뷰 (색인 빌드 전에는 503, 없는 id는 404)
+def test_similar_reviews():
+    repo = app.dependency_overrides[get_review_repository]()
+    assert client.get("/api/reviews/0/similar").status_code == 503
+
+    repo.build_ann()
+    response = client.get("/api/reviews/1/similar", params={"k": 2})
+
+    # 검증
+    assert response.status_code == 200
+    assert len(response.json()["data"]) <= 2
+    assert client.get("/api/reviews/100/similar").status_code == 404
+
+
+# 테스트: 전체/출처별 집계, 알 수 없는 출처는 400
+def test_review_stats():
+    response = client.get("/api/reviews/stats")
+
+    # 검증
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["count"] == 3
+    assert data["rating_histogram"]["5"] == 1
+    assert data["by_month"]["3"] == 2
+    assert client.get("/api/reviews/stats", params={"source": "kakao"}).json()["data"]["positive_ratio"] == 0.6667
+    assert client.get("/api/reviews/stats", params={"source": "naver"}).status_code == 400
+
+
+# 테스트: 필터를 적용한 CSV / gzip NDJSON 내보내기
+def test_export_reviews():
+    response = client.get("/api/reviews/export", params={"month": 3, "sort": "rating"})
+
+    # 검증
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="reviews.csv"'
+    lines = response.text.splitlines()
+    assert lines[0] == "id,source,rating,date,content,content_length,is_positive,month,weekday"
+    assert [line.split(",")[4] for line in lines[1:]] == ["대박", "굿굿굿"]
+
+    response = client.get("/api/reviews/export", params={"format": "ndjson", "gzip": "true"})
+    assert response.headers["content-type"] == "application/gzip"
+    records = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert [r["id"] for r in records] == [0, 2, 1]
+    assert client.get("/api/reviews/export", params={"source": "naver"}).status_code == 400
+
+
+# 테스트: TF-IDF 벡터 내보내기 (색인 빌드 전에는 503)
+def test_export_embeddings():
+    assert client.get("/api/reviews/embeddings/export").status_code == 503
+
+    app.dependency_overrides[get_review_repository]().build_ann()
+    response = client.get("/api/reviews/embeddings/export", params={"format": "ndjson"})
+
+    # 검증
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in records] == [0, 2, 1]
+    assert records[2]["terms"].keys() == {"명절연휴는", "진짜"}
+
+
+# 테스트: 출처/달별 인기 단어, 알 수 없는 출처/달은 400
+def test_trending_terms():
+    response = client.get("/api/reviews/trending", params={"source": "kakao", "month": "2025-03", "k": 1})
+
+    # 검증
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["months"] == ["2025-01", "2025-03"]
+    assert data["terms"] == [{"term": "굿굿굿", "count": 1}]
+    assert client.get("/api/reviews/trending", params={"source": "naver"}).status_code == 400
+    assert client.get("/api/reviews/trending", params={"month": "1999-01"}).status_code == 400
+
+
+# 테스트: 같은 데이터셋 버전이면 ETag가 같고 If-None-Match에 304
+def test_review_responses_conditional_get():
+    first = client.get("/api/reviews/stats")
+    etag = first.headers["etag"]
+
+    response = client.get("/api/reviews/stats", headers={"If-None-Match": etag})
+
+    # 검증
+    assert response.status_code == 304
+    assert client.get("/api/reviews", params={"limit": 1}).headers["etag"] != etag
+
+
+# 테스트: NDJSON 리뷰 수집 (색인 빌드 전에는 503, 행별 결과, 새 버전으로 바로 조회)
+def test_ingest_reviews(monkeypatch):
+    repo = app.dependency_overrides[get_review_repository]()
+    body = "\n".join([
+        json.dumps({"source": "kakao", "rating": 5, "date": "2025-06-07", "content": "굿굿굿!! 최고...더보기"}),
+        json.dumps({"source": "kakao", "rating": 9, "date": "2025-06-07", "content": "별점 이상"}),
+        json.dumps({"source": "naver", "rating": 3, "date": "2025-06-07", "content": "없는 출처"}),
+    ]) + "\n"
+    assert client.post("/api/reviews/ingest", content=body).status_code == 503
+
+    repo.build_ann()
+    etag = client.get("/api/reviews/stats").headers["etag"]
+    monkeypatch.setattr(dependencies, "_review_repository", repo)
+    response = client.post("/api/reviews/ingest", content=body)
+
+    # 검증
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["status"] for row in rows] == ["success", "failure", "failure"]
+    assert rows[0]["id"] == 3 and rows[2]["message"] == "Unknown Source: naver"
+    review = client.get("/api/reviews/3").json()["data"]
+    assert (review["content"], review["weekday"], review["is_positive"]) == ("굿굿굿 최고", "Saturday", True)
+    assert client.get("/api/reviews/stats").headers["etag"] != etag
+    assert dependencies.reload_review_repository() is repo
+
+
+# 테스트: CSV가 바뀌면 새 데이터셋 버전으로 저장소를 바꿔 끼운다
+def test_reload_review_repository(tmp_path, monkeypatch):
+    repo = app.dependency_overrides[get_review_repository]()
+    monkeypatch.setattr(dependencies, "_review_repository", repo)
+    assert dependencies.reload_review_repository() is repo
+
+    with open(tmp_path / "preprocessed_reviews_kakao.csv", "a", encoding="utf-8") as f:
+        f.write("1.0,2025-02-02,별로,2,0,2,Sunday\n")
+    reloaded = dependencies.reload_review_repository()
+
+    # 검증
+    assert reloaded is not repo and reloaded.version != repo.version
+    assert len(reloaded) == 4
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from app.review.review_stats import ALL_SOURCES, ReviewStats
+
+
+@pytest.fixture
+def stats():
+    stats = ReviewStats()
+    # 별점, 월, 요일(0=월), 본문 길이
+    stats.add("kakao", np.array([5.0, 2.0]), np.array([3, 3]), np.array([4, 0]), np.array([10, 20]))
+    stats.add("google", np.array([4.0]), np.array([12]), np.array([6]), np.array([30]))
+    return stats
+
+
+def test_summary_per_source_and_overall(stats):
+    """Test that each source and the overall aggregate expose counts, means and histograms."""
+    kakao = stats.summary("kakao")
+    overall = stats.summary()
+
+    assert kakao["count"] == 2 and kakao["mean_rating"] == 3.5 and kakao["positive_ratio"] == 0.5
+    assert kakao["rating_histogram"] == {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1}
+    assert kakao["by_month"]["3"] == 2
+    assert kakao["by_weekday"]["Friday"] == 1 and kakao["by_weekday"]["Monday"] == 1
+    assert overall["source"] == ALL_SOURCES and overall["count"] == 3 and overall["mean_content_length"] == 20
+    assert stats.sources == ["kakao", "google"]
+
+
+def test_incremental_add_matches_batch(stats):
+    """Test that adding reviews one at a time gives the same table as adding them together."""
+    batch = ReviewStats()
+    batch.add("kakao", np.array([5.0, 2.0, 3.0]), np.array([3, 3, 1]), np.array([4, 0, 2]), np.array([10, 20, 5]))
+
+    stats.add("kakao", np.array([3.0]), np.array([1]), np.array([2]), np.array([5]))
+
+    assert stats.summary("kakao") == batch.summary("kakao")
+
+
+def test_save_load_and_unknown_source(stats, tmp_path):
+    """Test that the table round-trips through JSON and unknown sources raise ValueError."""
+    path = str(tmp_path / "review_stats.json")
+    stats.fingerprint = "abc"
+    stats.save(path)
+
+    loaded = ReviewStats.load(path)
+
+    assert loaded.fingerprint == "abc"
+    assert loaded.summary() == stats.summary()
+    with pytest.raises(ValueError):
+        loaded.summary("naver")
+    assert ReviewStats().summary()["mean_rating"] is None
@@ -0,0 +1,56 @@
+from app.review.review_trending import ALL_MONTHS, TrendingTerms
+
+
+def test_counts_each_review_once_per_source_and_month():
+    """Test that terms are counted per review into source/month and all-source/all-time buckets."""
+    trending = TrendingTerms(k=5, width=512, depth=4, months=3)
+    trending.add(
+        ["kakao", "kakao", "google"],
+        ["2025-03", "2025-04", "2025-03"],
+        ["long lines lines", "long rides", "great rides"],
+    )
+
+    assert trending.top("kakao") == [("long", 2), ("lines", 1), ("rides", 1)]
+    assert trending.top("all", "2025-03") == [("great", 1), ("lines", 1), ("long", 1), ("rides", 1)]
+    assert trending.month_buckets("kakao") == ["2025-03", "2025-04"]
+    assert trending.rows == 3
+
+
+def test_keeps_only_recent_months():
+    """Test that the oldest month buckets are dropped so the number of sketches stays bounded."""
+    trending = TrendingTerms(k=5, width=64, depth=2, months=2)
+    for month in ("2025-01", "2025-03", "2025-02", "2024-12"):
+        trending.add(["kakao"], [month], ["rides"])
+
+    assert trending.month_buckets("kakao") == ["2025-02", "2025-03"]
+    assert trending.top("kakao", ALL_MONTHS) == [("rides", 4)]
+    assert len(trending.hitters) == 2 * (2 + 1)
+
+
+def test_unknown_source_and_month():
+    """Test that unknown sources and dropped months raise ValueError."""
+    trending = TrendingTerms(k=5, width=64, depth=2, months=2)
+    trending.add(["kakao"], ["2025-01"], ["rides"])
+
+    for source, month in (("naver", ALL_MONTHS), ("kakao", "2020-01")):
+        try:
+            trending.top(source, month)
+            assert False
+        except ValueError:
+            pass
+    assert TrendingTerms().top() == []
+
+
+def test_save_and_load(tmp_path):
+    """Test that a snapshot restores the sketches, heaps and row count."""
+    trending = TrendingTerms(k=2, width=128, depth=3, months=4, fingerprint="v1")
+    trending.add(["kakao", "google"], ["2025-03", "2025-03"], ["매직패스 필수", "매직패스 rides"])
+    path = str(tmp_path / "trending.npz")
+    trending.save(path)
+
+    loaded = TrendingTerms.load(path)
+    loaded.add(["kakao"], ["2025-03"], ["매직패스"])
+
+    assert (loaded.fingerprint, loaded.rows, loaded.k) == ("v1", 3, 2)
+    assert loaded.top("all", "2025-03")[0] == ("매직패스", 3)
+    assert loaded.top("kakao") == [("매직패스", 2), ("필수", 1)]
@@ -0,0 +1,71 @@
+import os
+import pytest
+from app.config import PORT, SERVER_GRACEFUL_TIMEOUT, SERVER_WORKERS
+from app.server import create_config, create_parser, event_loop, http_protocol
+from app.user.sqlite_user_repository import SqliteUserRepository
+from app.user.user_repository import UserRepository
+from app.user.user_schema import User
+
+
+def test_parser_defaults():
+    """Test that the launcher defaults come from app.config."""
+    args = create_parser().parse_args([])
+
+    assert args.port == PORT
+    assert args.workers == SERVER_WORKERS
+    assert args.graceful_timeout == SERVER_GRACEFUL_TIMEOUT
+
+
+def test_config_prefers_fast_loop_when_installed():
+    """Test that uvloop/httptools are used only when importable, with a graceful shutdown timeout."""
+    config = create_config(create_parser().parse_args(["-p", "9000", "--graceful-timeout", "7"]))
+
+    assert config.port == 9000
+    assert config.timeout_graceful_shutdown == 7
+    assert (config.loop, config.http) == (event_loop(), http_protocol())
+    assert config.loop in ("uvloop", "asyncio") and config.http in ("httptools", "h11")
+
+
+def open_store(kind, tmp_path):
+    if kind == "sqlite":
+        return SqliteUserRepository(str(tmp_path / "users.db"), pool_size=2)
+    path = tmp_path / "users.json"
+    path.write_text("{}")
+    return UserRepository(str(path))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_forked_workers_share_the_user_store(kind, tmp_path):
+    """Test that workers forked from a preloaded store write through their own handles after after_fork."""
+    repo = open_store(kind, tmp_path)
+    repo.create_user(User(email="parent@example.com", password="pw", username="parent"))
+
+    pids = []
+    for worker in range(3):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                repo.after_fork()
+                # 워커끼리 같은 username을 두고 경쟁하고, 각자 자기 사용자도 만든다
+                for i in range(20):
+                    repo.create_user(User(email=f"w{worker}-{i}@example.com", password="pw", username=f"w{worker}-{i}"))
+                try:
+                    repo.create_user(User(email=f"race{worker}@example.com", password="pw", username="race"))
+                except ValueError:
+                    pass
+                code = 0 if repo.get_user_by_email("parent@example.com") is not None else 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+    # 부모(preload 프로세스)의 핸들도 워커가 끝난 뒤 계속 쓸 수 있어야 한다
+    repo.create_user(User(email="after@example.com", password="pw", username="after"))
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+
+    assert all(repo.get_user_by_email(f"w{w}-{i}@example.com") for w in range(3) for i in range(20))
+    assert repo.get_user_by_email("after@example.com") is not None
+    assert sum(repo.get_user_by_email(f"race{w}@example.com") is not None for w in range(3)) == 1
+    repo.close()
@@ -0,0 +1,91 @@
+import os
+import time
+from app.user.session_cache import SessionCache
+from app.user.user_schema import User
+
+
+def make_user(i: int) -> User:
+    return User(email=f"user{i}@example.com", password="pw", username=f"user{i}")
+
+
+def test_issue_and_get():
+    """Test that an issued token resolves to its user."""
+    cache = SessionCache(max_size=10, ttl=60)
+    token = cache.issue(make_user(0))
+
+    assert cache.get(token).email == "user0@example.com"
+    assert cache.get("unknown") is None
+
+
+def test_lru_eviction():
+    """Test that the least recently used session is evicted first."""
+    cache = SessionCache(max_size=2, ttl=60)
+    first = cache.issue(make_user(0))
+    second = cache.issue(make_user(1))
+    cache.get(first)
+
+    cache.issue(make_user(2))
+
+    assert len(cache) == 2
+    assert cache.get(first) is not None
+    assert cache.get(second) is None
+
+
+def test_ttl_expiry():
+    """Test that expired sessions are dropped on lookup."""
+    cache = SessionCache(max_size=10, ttl=0.01)
+    token = cache.issue(make_user(0))
+    time.sleep(0.02)
+
+    assert cache.get(token) is None
+    assert len(cache) == 0
+
+
+def test_revoke_email():
+    """Test that all sessions of one user are revoked together."""
+    cache = SessionCache(max_size=10, ttl=60)
+    tokens = [cache.issue(make_user(0)), cache.issue(make_user(0))]
+    other = cache.issue(make_user(1))
+
+    cache.revoke_email("user0@example.com")
+
+    assert all(cache.get(token) is None for token in tokens)
+    assert cache.get(other) is not None
+
+
+def test_shared_directory_across_workers(tmp_path):
+    """Test that a session issued by one worker resolves in another and a revoke in either applies to both."""
+    worker_a = SessionCache(max_size=10, ttl=60, directory=str(tmp_path))
+    worker_b = SessionCache(max_size=10, ttl=60, directory=str(tmp_path))
+    token = worker_a.issue(make_user(0))
+    other = worker_a.issue(make_user(1))
+
+    assert worker_b.get(token).email == "user0@example.com"
+    assert worker_b.get(other).username == "user1"
+
+    # 비밀번호 변경/탈퇴는 다른 워커에서 처리될 수 있다
+    worker_b.revoke_email("user0@example.com")
+    assert worker_a.get(token) is None
+    # 로그아웃도 마찬가지
+    worker_b.revoke(other)
+    assert worker_a.get(other) is None
+
+
+def test_shared_directory_rejects_foreign_paths(tmp_path):
+    """Test that tokens cannot point outside the session directory."""
+    cache = SessionCache(max_size=10, ttl=60, directory=str(tmp_path / "sessions"))
+    (tmp_path / "secret").write_text("{}")
+
+    assert cache.get("../secret") is None
+    assert cache.get("..%2f.secret") is None
+
+
+def test_prune_removes_expired_session_files(tmp_path):
+    """Test that expired session files are removed even if never looked up again."""
+    cache = SessionCache(max_size=10, ttl=0.01, directory=str(tmp_path))
+    cache.issue(make_user(0))
+    time.sleep(0.02)
+
+    cache.prune()
+
+    assert [name for _, _, names in os.walk(tmp_path) for name in names] == []
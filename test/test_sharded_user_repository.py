@@ -0,0 +1,157 @@
+import json
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.user.sharded_user_repository import ShardedUserRepository, reshard, shard_index, shard_path, username_path
+from app.user.user_repository import UserRepository
+from app.user.user_schema import User
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return ShardedUserRepository(str(tmp_path / "users"), shards=4)
+
+
+def test_save_and_get_user(repo):
+    """Test that users round-trip through their shard."""
+    users = [User(email=f"user{i}@example.com", password="pw", username=f"user{i}") for i in range(20)]
+    for user in users:
+        repo.save_user(user)
+
+    assert all(repo.get_user_by_email(u.email).username == u.username for u in users)
+    assert repo.get_user_by_email("nonexistent@example.com") is None
+
+
+def test_write_touches_only_one_shard(repo):
+    """Test that a mutation loads and writes only the owning shard."""
+    user = User(email="test@example.com", password="pw", username="TestUser")
+    repo.save_user(user)
+
+    loaded = repo.loaded_shards()
+    assert len(loaded) == 1
+    assert loaded[0].path == shard_path(repo.directory, shard_index(user.email, 4))
+
+
+def test_delete_user(repo):
+    """Test that a deleted user can no longer be found."""
+    user = User(email="test@example.com", password="pw", username="TestUser")
+    repo.save_user(user)
+    repo.delete_user(user)
+
+    assert repo.get_user_by_email(user.email) is None
+
+
+def test_shard_count_mismatch(repo):
+    """Test that opening a store with a different shard count fails."""
+    with pytest.raises(ValueError, match="Shard count mismatch"):
+        ShardedUserRepository(repo.directory, shards=8)
+
+
+def test_reshard_from_users_json(tmp_path):
+    """Test splitting users.json into shards."""
+    users_file = tmp_path / "users.json"
+    users_file.write_text(json.dumps({
+        f"user{i}@example.com": {"email": f"user{i}@example.com", "password": "pw", "username": f"user{i}"}
+        for i in range(20)
+    }))
+    directory = str(tmp_path / "users")
+
+    reshard(UserRepository(str(users_file)).users, directory, 4)
+
+    repo = ShardedUserRepository(directory, shards=4)
+    assert all(repo.get_user_by_email(f"user{i}@example.com") is not None for i in range(20))
+    assert len([name for name in os.listdir(directory) if name.endswith(".json") and name.startswith("users-")]) == 4
+
+
+def test_list_users_merges_shards(repo):
+    """Test that listing merges the sorted pages of every shard."""
+    emails = [f"user{i:02d}@example.com" for i in range(20)]
+    repo.save_users([User(email=email, password="pw", username=email[:6]) for email in emails])
+
+    first = repo.list_users("user", "email", None, 8)
+    rest = repo.list_users("user", "email", (first[-1].email,), 50)
+
+    assert [u.email for u in first + rest] == emails
+    assert repo.username_exists("user07")
+
+
+def test_create_users_checks_every_shard(repo):
+    """Test that conditional creates reject existing emails and usernames taken in other shards."""
+    repo.create_user(User(email="taken@example.com", password="pw", username="taken"))
+    users = [
+        User(email="taken@example.com", password="pw", username="other"),
+        User(email="new0@example.com", password="pw", username="taken"),
+        User(email="new1@example.com", password="pw", username="new1"),
+    ]
+
+    assert repo.create_users(users) == ["User already Exists.", "Username already Exists.", None]
+    assert repo.get_user_by_email("new1@example.com") is not None
+
+
+def test_username_lookup_and_listing_load_only_needed_shards(repo):
+    """Test that username checks use one username partition and a page loads only its users' shards."""
+    repo.save_users([User(email=f"user{i:02d}@example.com", password="pw", username=f"name{i:02d}") for i in range(20)])
+    repo.close()
+    reopened = ShardedUserRepository(repo.directory, shards=4)
+
+    assert reopened.username_exists("name07")
+    assert not reopened.username_exists("missing")
+    assert reopened.loaded_shards() == []
+    page = reopened.list_users("", "username", None, 1)
+    assert [u.username for u in page] == ["name00"]
+    assert len(reopened.loaded_shards()) == 1
+
+
+def test_concurrent_same_username_across_shards(repo):
+    """Test that one username cannot be registered twice through different email shards."""
+    users = [User(email=f"user{i}@example.com", password="pw", username="same") for i in range(8)]
+    assert len({shard_index(u.email, 4) for u in users}) > 1
+
+    def register(user):
+        try:
+            repo.create_user(user)
+            return True
+        except ValueError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        assert sum(pool.map(register, users)) == 1
+
+
+def test_username_partitions_built_for_store_without_them(tmp_path):
+    """Test that a store written before username partitions existed gets them on open."""
+    directory = tmp_path / "users"
+    directory.mkdir()
+    user = User(email="old@example.com", password="pw", username="old")
+    (directory / "users-000.json").write_text(json.dumps({user.email: user.model_dump()}))
+    (directory / "shards.json").write_text(json.dumps({"shards": 1}))
+
+    repo = ShardedUserRepository(str(directory), shards=1)
+
+    assert repo.username_exists("old")
+    with pytest.raises(ValueError, match="Username already Exists."):
+        repo.create_user(User(email="new@example.com", password="pw", username="old"))
+
+
+def test_writes_to_different_shards_share_no_file(repo):
+    """Test that a create touches only its email shard and username partition, never a file shared with another user."""
+    a = User(email="a@example.com", password="pw", username="alice")
+    b = next(
+        User(email=f"b{i}@example.com", password="pw", username=f"bob{i}") for i in range(100)
+        if shard_index(f"b{i}@example.com", 4) != shard_index(a.email, 4)
+        and shard_index(f"bob{i}", 4) != shard_index(a.username, 4)
+    )
+    repo.create_user(a)
+
+    def snapshot():
+        return {name: os.stat(os.path.join(repo.directory, name)).st_mtime_ns for name in os.listdir(repo.directory)}
+
+    before = snapshot()
+    repo.create_user(b)
+    after = snapshot()
+
+    changed = {name for name in after if before.get(name) != after[name]}
+    owned = (shard_path(repo.directory, shard_index(b.email, 4)), username_path(repo.directory, shard_index(b.username, 4)))
+    assert changed
+    assert all(any(os.path.join(repo.directory, name).startswith(path) for path in owned) for name in changed)
+    assert repo.list_users("", "username") == [a, b]
@@ -0,0 +1,82 @@
+import json
+import subprocess
+import sys
+import pytest
+from app.user.sqlite_user_repository import SqliteUserRepository
+from app.user.user_schema import User
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = SqliteUserRepository(str(tmp_path / "users.db"), pool_size=2)
+    yield repo
+    repo.close()
+
+
+@pytest.fixture
+def test_user():
+    return User(email="test@example.com", password="password123", username="TestUser")
+
+
+def test_save_and_get_user(repo, test_user):
+    """Test that a saved user can be looked up by email."""
+    repo.save_user(test_user)
+
+    user = repo.get_user_by_email(test_user.email)
+
+    assert user.username == test_user.username
+    assert repo.get_user_by_email("nonexistent@example.com") is None
+
+
+def test_save_user_updates_existing(repo, test_user):
+    """Test that saving an existing email updates it in place."""
+    repo.save_user(test_user)
+    repo.save_user(User(email=test_user.email, password="newpassword123", username="TestUser"))
+
+    assert repo.get_user_by_email(test_user.email).password == "newpassword123"
+
+
+def test_delete_user(repo, test_user):
+    """Test that a deleted user can no longer be found."""
+    repo.save_user(test_user)
+    repo.delete_user(test_user)
+
+    assert repo.get_user_by_email(test_user.email) is None
+
+
+def test_wal_mode(repo):
+    """Test that the database runs in WAL mode."""
+    with repo._connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_import_from_json(tmp_path, test_user):
+    """Test the users.json -> SQLite migration command."""
+    users_file = tmp_path / "users.json"
+    users_file.write_text(json.dumps({test_user.email: test_user.model_dump()}))
+    db_path = tmp_path / "migrated.db"
+
+    subprocess.run(
+        [sys.executable, "-m", "app.user.sqlite_user_repository", "-i", str(users_file), "-o", str(db_path)],
+        check=True,
+    )
+
+    repo = SqliteUserRepository(str(db_path), pool_size=1)
+    assert repo.get_user_by_email(test_user.email).username == test_user.username
+    repo.close()
+
+
+def test_list_users_by_username(repo):
+    """Test that username listing pages through duplicates in (username, email) order."""
+    repo.save_users([
+        User(email="b@example.com", password="pw", username="kim"),
+        User(email="a@example.com", password="pw", username="kim"),
+        User(email="c@example.com", password="pw", username="lee"),
+    ])
+
+    first = repo.list_users("k", "username", None, 1)
+    second = repo.list_users("k", "username", (first[0].username, first[0].email), 5)
+
+    assert [u.email for u in first + second] == ["a@example.com", "b@example.com"]
+    assert repo.username_exists("lee")
+    assert not repo.username_exists("park")
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.static_files import PrecompressedStaticFiles, accepted_encodings
+
+HTML = "<html><body>" + "롯데월드 리뷰 " * 200 + "</body></html>"
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "index.html").write_text(HTML, encoding="utf-8")
+    (tmp_path / "tiny.txt").write_text("hi")
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path), max_age=60), name="static")
+    return TestClient(app)
+
+
+def test_serves_gzip_variant(client):
+    """Test that gzip-capable clients get the precompressed body with caching headers."""
+    response = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == "public, max-age=60"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == HTML
+    assert int(response.headers["content-length"]) < len(HTML.encode("utf-8"))
+
+
+def test_identity_variant_has_its_own_etag(client):
+    """Test that the uncompressed body carries a different strong ETag than the gzip one."""
+    plain = client.get("/static/index.html", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert plain.text == HTML
+    assert plain.headers["etag"] != zipped.headers["etag"]
+    assert not plain.headers["etag"].startswith("W/")
+
+
+def test_conditional_request_returns_304(client):
+    """Test that a matching If-None-Match short-circuits to 304 without a body."""
+    etag = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+    response = client.get("/static/index.html", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_small_files_are_not_compressed(client):
+    """Test that files below the size threshold are only served as identity."""
+    response = client.get("/static/tiny.txt", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "hi"
+
+
+def test_missing_file_and_method(client):
+    """Test 404 for unknown paths and 405 for non-GET methods."""
+    assert client.get("/static/missing.js").status_code == 404
+    assert client.post("/static/index.html").status_code == 405
+
+
+def test_accepted_encodings():
+    """Test that q=0 encodings are excluded."""
+    assert accepted_encodings("gzip;q=0, br;q=0.5, identity") == ["br", "identity"]
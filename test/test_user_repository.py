@@ -0,0 +1,183 @@
+import json
+import os
+import pytest
+from app.user.user_repository import UserRepository
+from app.user.user_schema import User
+
+
+@pytest.fixture
+def users_file(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps({
+        "test@example.com": {"email": "test@example.com", "password": "password123", "username": "TestUser"}
+    }))
+    return str(path)
+
+
+@pytest.fixture
+def repo(users_file):
+    return UserRepository(users_file)
+
+
+def test_load_users(repo):
+    """Test that users are loaded once into the in-memory index."""
+    user = repo.get_user_by_email("test@example.com")
+
+    assert user.username == "TestUser"
+    assert repo.get_user_by_email("nonexistent@example.com") is None
+
+
+def test_get_user_returns_copy(repo):
+    """Test that mutating a returned user does not change the index."""
+    user = repo.get_user_by_email("test@example.com")
+    user.password = "changed"
+
+    assert repo.get_user_by_email("test@example.com").password == "password123"
+
+
+def test_save_and_delete_user(repo, users_file):
+    """Test that mutations are visible in memory and persisted to disk."""
+    new_user = User(email="new@example.com", password="pw", username="NewUser")
+    repo.save_user(new_user)
+
+    assert repo.get_user_by_email("new@example.com").username == "NewUser"
+    assert UserRepository(users_file).get_user_by_email("new@example.com") is not None
+
+    repo.delete_user(new_user)
+
+    assert repo.get_user_by_email("new@example.com") is None
+    assert UserRepository(users_file).get_user_by_email("new@example.com") is None
+
+
+def test_missing_file(tmp_path):
+    """Test that a missing users file raises ValueError."""
+    with pytest.raises(ValueError, match="File not found"):
+        UserRepository(str(tmp_path / "missing.json"))
+
+
+def test_mutations_are_journaled(repo, users_file):
+    """Test that writes append to the journal instead of rewriting the snapshot."""
+    with open(users_file) as f:
+        snapshot_before = f.read()
+
+    repo.save_user(User(email="new@example.com", password="pw", username="NewUser"))
+    repo.delete_user(User(email="test@example.com", password="password123", username="TestUser"))
+
+    with open(users_file) as f:
+        assert f.read() == snapshot_before
+    with open(repo.journal_path) as f:
+        assert len(f.readlines()) == 2
+
+
+def test_compact_folds_journal_into_snapshot(repo, users_file):
+    """Test that compaction writes a new snapshot and empties the journal."""
+    repo.save_user(User(email="new@example.com", password="pw", username="NewUser"))
+    repo.compact()
+
+    with open(users_file) as f:
+        assert "new@example.com" in json.load(f)
+    with open(repo.journal_path) as f:
+        assert f.read() == ""
+    assert UserRepository(users_file).get_user_by_email("new@example.com") is not None
+
+
+def test_replay_ignores_torn_write(repo, users_file):
+    """Test that a half-written last journal line is discarded on startup."""
+    repo.save_user(User(email="new@example.com", password="pw", username="NewUser"))
+    with open(repo.journal_path, "a") as f:
+        f.write('{"op": "put", "user": {"email": "torn@exa')
+
+    reloaded = UserRepository(users_file)
+
+    assert reloaded.get_user_by_email("new@example.com") is not None
+    assert reloaded.get_user_by_email("torn@example.com") is None
+    with open(reloaded.journal_path) as f:
+        assert len(f.readlines()) == 1
+
+
+def test_other_worker_writes_are_visible(users_file):
+    """Test that a second process-level instance picks up journal appends."""
+    worker_a = UserRepository(users_file)
+    worker_b = UserRepository(users_file)
+
+    worker_a.save_user(User(email="new@example.com", password="pw", username="NewUser"))
+
+    assert worker_b.get_user_by_email("new@example.com").username == "NewUser"
+
+
+def test_other_worker_compaction_is_visible(users_file):
+    """Test that an instance reloads after another one compacts and keeps writing."""
+    worker_a = UserRepository(users_file)
+    worker_b = UserRepository(users_file)
+
+    worker_a.save_user(User(email="new@example.com", password="pw", username="NewUser"))
+    worker_a.compact()
+    worker_b.save_user(User(email="other@example.com", password="pw", username="Other"))
+
+    assert worker_b.get_user_by_email("new@example.com") is not None
+    assert worker_a.get_user_by_email("other@example.com") is not None
+    assert UserRepository(users_file).get_user_by_email("other@example.com") is not None
+
+
+def test_save_users_is_one_flush(repo, users_file):
+    """Test that a bulk save is persisted in a single writer batch."""
+    users = [User(email=f"user{i}@example.com", password="pw", username=f"user{i}") for i in range(100)]
+
+    repo.save_users(users)
+
+    assert repo._writer.batches == 1
+    assert all(UserRepository(users_file).get_user_by_email(u.email) for u in users)
+
+
+def test_list_users_pages_by_email(repo):
+    """Test cursor pagination and prefix search over the sorted email index."""
+    repo.save_users([User(email=f"user{i}@example.com", password="pw", username=f"name{i}") for i in range(5)])
+
+    first = repo.list_users("user", "email", None, 3)
+    rest = repo.list_users("user", "email", (first[-1].email,), 3)
+
+    assert [u.email for u in first + rest] == [f"user{i}@example.com" for i in range(5)]
+    assert [u.email for u in repo.list_users("test")] == ["test@example.com"]
+
+
+def test_username_index_follows_updates(repo):
+    """Test that renames and deletes keep the username index in sync."""
+    user = repo.get_user_by_email("test@example.com")
+    assert repo.username_exists("TestUser")
+
+    repo.save_user(user.model_copy(update={"username": "Renamed"}))
+    assert not repo.username_exists("TestUser")
+    assert [u.username for u in repo.list_users("Ren", "username")] == ["Renamed"]
+
+    repo.delete_user(user)
+    assert not repo.username_exists("Renamed")
+    assert repo.list_users() == []
+
+
+def test_other_worker_writes_update_indexes(users_file):
+    """Test that journal entries from another worker land in the sorted indexes."""
+    worker_a = UserRepository(users_file)
+    worker_b = UserRepository(users_file)
+
+    worker_a.save_user(User(email="new@example.com", password="pw", username="NewUser"))
+
+    assert worker_b.username_exists("NewUser")
+    assert [u.email for u in worker_b.list_users()] == ["new@example.com", "test@example.com"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_after_fork_reopens_handles(repo, users_file):
+    """Test that a forked worker writes through its own lock/journal handles and the parent sees the change."""
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            repo.after_fork()
+            repo.save_user(User(email="child@example.com", password="pw", username="Child"))
+            code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert repo.get_user_by_email("child@example.com").username == "Child"
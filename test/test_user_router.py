@@ -1,12 +1,15 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from app.main import app
-from app.user.user_schema import User, UserLogin, UserUpdate, UserDeleteRequest
+from app.user.user_schema import User, UserLogin, UserUpdate, UserDeleteRequest, UserPage, UserSummary
 from app.responses.base_response import BaseResponse
 from app.user.user_repository import UserRepository
 from app.user.user_service import UserService
-from app.dependencies import get_user_service
+from app.dependencies import get_review_repository, get_user_repository, get_user_service
+from app.review.review_repository import ReviewRepository
+from app.user.password_hasher import PasswordHasher, get_password_hasher
 
 # FastAPI 테스트 클라이언트
 client = TestClient(app)
@@ -23,15 +26,22 @@ mock_user = User(email="test@example.com", password="password123", username="Tes
 @pytest.fixture
 def mock_user_service():
     with patch("app.user.user_service.UserService") as mock_service:
+        mock_service.return_value.create_session.return_value = "session-token"
         yield mock_service
 
 
-# 모든 테스트에서 의존성 오버라이드
+# 모든 테스트에서 의존성 오버라이드 (저장소는 임시 디렉터리에 만들어서 database/에 아무것도 쓰지 않는다)
 @pytest.fixture(autouse=True)
-def override_dependencies(mock_user_service):
+def override_dependencies(mock_user_service, tmp_path):
+    (tmp_path / "users.json").write_text("{}")
+    user_repo = UserRepository(str(tmp_path / "users.json"))
+    review_repo = ReviewRepository(str(tmp_path / "reviews"))
     app.dependency_overrides[get_user_service] = lambda: mock_user_service.return_value
+    app.dependency_overrides[get_user_repository] = lambda: user_repo
+    app.dependency_overrides[get_review_repository] = lambda: review_repo
     yield
     app.dependency_overrides = {}
+    user_repo.close()
 
 
 # Mock UserRepository 생성
@@ -79,6 +89,7 @@ def test_login_success(mock_user_service):
     assert data["status"] == "success"
     assert data["data"]["email"] == mock_user.email
     assert data["data"]["username"] == mock_user.username
+    assert response.headers["X-Session-Token"] == "session-token"
 
 
 # 테스트: 로그인 실패 (유저 없음)
@@ -110,7 +121,8 @@ def test_update_password_success(mock_user_service):
     data = response.json()
     assert data["status"] == "success"
     assert data["data"]["email"] == updated_user.email
-    assert data["data"]["password"] == updated_user.password
+    # 비밀번호 해시는 응답에 싣지 않음
+    assert "password" not in data["data"]
 
 
 # 테스트: 비밀번호 업데이트 실패 (유저 없음)
@@ -149,4 +161,185 @@ def test_delete_user_not_found(mock_user_service):
     # 응답 검증
     assert response.status_code == 404
     data = response.json()
-    assert data["detail"] == USER_NOT_FOUND
\ No newline at end of file
+    assert data["detail"] == USER_NOT_FOUND
+
+# 테스트: 저장소는 프로세스에서 한 번만 생성됨
+def test_user_repository_is_shared(tmp_path, monkeypatch):
+    import app.dependencies as dependencies
+    (tmp_path / "shared.json").write_text("{}")
+    monkeypatch.setattr(dependencies, "_user_repository", None)
+    monkeypatch.setitem(
+        dependencies.USER_REPOSITORY_CLASSES, dependencies.USER_STORE, lambda: UserRepository(str(tmp_path / "shared.json"))
+    )
+    # 검증
+    assert dependencies.init_user_repository() is dependencies.init_user_repository()
+    dependencies.close_user_repository()
+
+
+# 테스트: NDJSON 일괄 등록 (행별 결과 스트림)
+def test_bulk_register(mock_user_service):
+    mock_user_service.return_value.bulk_register.return_value = [None, USER_ALREADY_EXISTS]
+
+    body = "\n".join([
+        '{"email": "a@example.com", "password": "pw", "username": "A"}',
+        '{"email": "b@example.com", "password": "pw", "username": "B"}',
+        '{"email": "not-an-email", "password": "pw", "username": "C"}',
+    ])
+    response = client.post("/api/user/bulk-register", content=body)
+
+    # 검증
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["status"] for row in rows] == ["success", "failure", "failure"]
+    assert rows[1]["message"] == USER_ALREADY_EXISTS
+    assert rows[2]["line"] == 3
+    mock_user_service.return_value.bulk_register.assert_called_once()
+
+
+# 테스트: 한 묶음의 저장이 실패해도 스트림은 끊기지 않고 그 묶음의 행들만 실패로 보냄
+def test_bulk_register_failed_chunk(mock_user_service, monkeypatch):
+    monkeypatch.setattr("app.user.user_router.BULK_CHUNK_SIZE", 2)
+    mock_user_service.return_value.bulk_register.side_effect = [OSError("disk full"), [None]]
+
+    body = "\n".join(
+        f'{{"email": "{name}@example.com", "password": "pw", "username": "{name}"}}' for name in ("a", "b", "c")
+    )
+    response = client.post("/api/user/bulk-register", content=body)
+
+    # 검증
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["status"] for row in rows] == ["failure", "failure", "success"]
+    assert [row["message"] for row in rows[:2]] == ["disk full", "disk full"]
+    assert rows[2]["email"] == "c@example.com"
+
+
+# 테스트: NDJSON 일괄 삭제
+def test_bulk_delete(mock_user_service):
+    mock_user_service.return_value.bulk_delete.return_value = [None, USER_NOT_FOUND]
+
+    body = '{"email": "a@example.com"}\n{"email": "b@example.com"}\n'
+    response = client.post("/api/user/bulk-delete", content=body)
+
+    # 검증
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["status"] for row in rows] == ["success", "failure"]
+    mock_user_service.return_value.bulk_delete.assert_called_once_with(["a@example.com", "b@example.com"])
+
+
+# 테스트: 세션 토큰으로 사용자 조회
+def test_get_session_user(mock_user_service):
+    mock_user_service.return_value.get_session_user.return_value = mock_user
+
+    response = client.get("/api/user/me", headers={"X-Session-Token": "session-token"})
+
+    # 검증
+    assert response.status_code == 200
+    assert response.json()["data"]["email"] == mock_user.email
+    mock_user_service.return_value.get_session_user.assert_called_once_with("session-token")
+
+
+# 테스트: 만료/폐기된 세션 토큰
+def test_get_session_user_invalid(mock_user_service):
+    mock_user_service.return_value.get_session_user.side_effect = ValueError("Invalid Session.")
+
+    response = client.get("/api/user/me", headers={"X-Session-Token": "expired"})
+
+    # 검증
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid Session."
+
+
+# 테스트: 다른 사용자의 세션으로 비밀번호 변경 시도
+def test_update_password_session_mismatch(mock_user_service):
+    mock_user_service.return_value.get_session_user.return_value = User(email="other@example.com", password="pw", username="Other")
+
+    user_update = UserUpdate(email=mock_user.email, new_password="newpassword123")
+    response = client.put("/api/user/update-password", json=user_update.model_dump(), headers={"X-Session-Token": "session-token"})
+
+    # 검증
+    assert response.status_code == 403
+    mock_user_service.return_value.update_user_pwd.assert_not_called()
+
+
+# 테스트: 로그아웃
+def test_logout(mock_user_service):
+    response = client.post("/api/user/logout", headers={"X-Session-Token": "session-token"})
+
+    # 검증
+    assert response.status_code == 200
+    mock_user_service.return_value.logout.assert_called_once_with("session-token")
+
+
+# 테스트: FAST_RESPONSES 경로도 같은 응답 본문과 헤더를 돌려줌
+def test_fast_response_path(mock_user_service, monkeypatch):
+    monkeypatch.setattr("app.responses.base_response.FAST_RESPONSES", True)
+    mock_user_service.return_value.login.return_value = mock_user
+    mock_user_service.return_value.register_user.return_value = mock_user
+
+    user_login = UserLogin(email=mock_user.email, password=mock_user.password)
+    login_response = client.post("/api/user/login", json=user_login.model_dump())
+    register_response = client.post("/api/user/register", json=mock_user.model_dump())
+
+    # 검증
+    assert login_response.status_code == 200
+    assert login_response.json() == {"status": "success", "data": {"email": mock_user.email, "username": mock_user.username}, "message": "Login Success."}
+    assert login_response.headers["X-Session-Token"] == "session-token"
+    assert register_response.status_code == 201
+    assert register_response.json()["data"] == {"email": mock_user.email, "username": mock_user.username}
+
+
+# 테스트: 사용자 목록 조회 (접두어 검색 + 커서)
+def test_list_users(mock_user_service):
+    page = UserPage(users=[UserSummary(email=mock_user.email, username=mock_user.username)], next_cursor="next")
+    mock_user_service.return_value.list_users.return_value = page
+
+    response = client.get("/api/user", params={"prefix": "te", "by": "username", "limit": 1}, headers={"X-Session-Token": "session-token"})
+
+    # 검증
+    assert response.status_code == 200
+    assert response.json()["data"] == {"users": [{"email": mock_user.email, "username": mock_user.username}], "next_cursor": "next"}
+    mock_user_service.return_value.list_users.assert_called_once_with("te", "username", None, 1)
+
+
+# 테스트: 사용자 목록은 유효한 세션이 있어야 조회 가능
+def test_list_users_requires_session(mock_user_service):
+    mock_user_service.return_value.get_session_user.side_effect = ValueError("Invalid Session.")
+
+    missing = client.get("/api/user")
+    invalid = client.get("/api/user", headers={"X-Session-Token": "expired"})
+
+    # 검증
+    assert missing.status_code == 422
+    assert invalid.status_code == 401
+    assert invalid.json()["detail"] == "Invalid Session."
+    mock_user_service.return_value.list_users.assert_not_called()
+
+
+# 테스트: 잘못된 커서는 400
+def test_list_users_invalid_cursor(mock_user_service):
+    mock_user_service.return_value.list_users.side_effect = ValueError("Invalid Cursor.")
+
+    response = client.get("/api/user", params={"cursor": "bad"}, headers={"X-Session-Token": "session-token"})
+
+    # 검증
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid Cursor."
+
+
+# 테스트: 해싱 대기열이 가득 차면 스레드풀에 들어가기 전에 503
+def test_login_rejected_before_threadpool_when_hasher_full(mock_user_service):
+    hasher = PasswordHasher(iterations=1000, max_workers=1, max_pending=1, queue_timeout=0.05)
+    mock_user_service.return_value.login.return_value = mock_user
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
+    # 다른 요청이 자리를 잡고 있는 상황
+    hasher._admission.acquire()
+
+    user_login = UserLogin(email=mock_user.email, password=mock_user.password)
+    response = client.post("/api/user/login", json=user_login.model_dump())
+
+    # 검증
+    assert response.status_code == 503
+    mock_user_service.return_value.login.assert_not_called()
+    hasher._admission.release()
+    assert client.post("/api/user/login", json=user_login.model_dump()).status_code == 200
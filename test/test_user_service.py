@@ -1,17 +1,33 @@
 import pytest
 from app.user.user_service import UserService
+from app.user.password_hasher import PasswordHasher
+from app.user.session_cache import SessionCache
+from app.user.user_repository import UserRepository
 from app.user.user_schema import User, UserLogin, UserUpdate
 from unittest.mock import MagicMock, patch
 
 
 @pytest.fixture
 def mock_user_repository():
-    return MagicMock()
+    repo = MagicMock()
+    repo.username_exists.return_value = False
+    return repo
 
 
 @pytest.fixture
-def user_service(mock_user_repository):
-    return UserService(mock_user_repository)
+def hasher():
+    # 테스트에서는 낮은 비용으로 해싱
+    return PasswordHasher(iterations=1000, max_workers=2)
+
+
+@pytest.fixture
+def sessions():
+    return SessionCache(max_size=10, ttl=60)
+
+
+@pytest.fixture
+def user_service(mock_user_repository, hasher, sessions):
+    return UserService(mock_user_repository, hasher, sessions)
 
 
 @pytest.fixture
@@ -30,6 +46,53 @@ def test_login_success(user_service, mock_user_repository, test_user):
     mock_user_repository.get_user_by_email.assert_called_once_with("test@example.com")
 
 
+def test_login_rehashes_plaintext_password(user_service, mock_user_repository, test_user, hasher):
+    """Test that a legacy plaintext password is rehashed on successful login."""
+    mock_user_repository.get_user_by_email.return_value = test_user
+    user_login = UserLogin(email="test@example.com", password="password123")
+
+    user_service.login(user_login)
+
+    saved = mock_user_repository.update_user.call_args.args[0]
+    assert hasher.is_hashed(saved.password)
+    assert hasher.verify("password123", saved.password)
+    assert mock_user_repository.update_user.call_args.kwargs["expected_password"] == "password123"
+
+
+def test_login_rehash_skipped_after_concurrent_change(tmp_path, hasher, sessions):
+    """Test that a login rehash does not overwrite a password changed after it was verified."""
+    path = tmp_path / "users.json"
+    path.write_text("{}")
+    repo = UserRepository(str(path))
+    repo.create_user(User(email="test@example.com", password="password123", username="TestUser"))
+    service = UserService(repo, hasher, sessions)
+    changed = hasher.hash("changed")
+    # 검증 직후 다른 요청이 비밀번호를 바꾼 상황
+    original = hasher.needs_rehash
+
+    def change_then_check(stored):
+        repo.update_user(User(email="test@example.com", password=changed, username="TestUser"))
+        return original(stored)
+
+    with patch.object(hasher, "needs_rehash", change_then_check):
+        service.login(UserLogin(email="test@example.com", password="password123"))
+
+    assert repo.get_user_by_email("test@example.com").password == changed
+    repo.close()
+
+
+def test_login_with_hashed_password(user_service, mock_user_repository, test_user, hasher):
+    """Test login against a hashed password does not rewrite it."""
+    test_user.password = hasher.hash("password123")
+    mock_user_repository.get_user_by_email.return_value = test_user
+
+    user_service.login(UserLogin(email="test@example.com", password="password123"))
+
+    mock_user_repository.update_user.assert_not_called()
+    with pytest.raises(ValueError, match="Invalid ID/PW"):
+        user_service.login(UserLogin(email="test@example.com", password="wrongpassword"))
+
+
 def test_login_user_not_found(user_service, mock_user_repository):
     """Test login with non-existent user."""
     mock_user_repository.get_user_by_email.return_value = None
@@ -48,17 +111,19 @@ def test_login_invalid_password(user_service, mock_user_repository, test_user):
         user_service.login(user_login)
 
 
-def test_register_user_success(user_service, mock_user_repository, test_user):
+def test_register_user_success(user_service, mock_user_repository, test_user, hasher):
     """Test successful user registration."""
     mock_user_repository.get_user_by_email.return_value = None
-    mock_user_repository.save_user.return_value = test_user
+    mock_user_repository.create_user.return_value = test_user
     
     result = user_service.register_user(test_user)
     
     assert result.email == test_user.email
     assert result.username == test_user.username
     mock_user_repository.get_user_by_email.assert_called_once_with(test_user.email)
-    mock_user_repository.save_user.assert_called_once_with(test_user)
+    saved = mock_user_repository.create_user.call_args.args[0]
+    assert saved.password != test_user.password
+    assert hasher.verify(test_user.password, saved.password)
 
 
 def test_register_user_already_exists(user_service, mock_user_repository, test_user):
@@ -89,17 +154,17 @@ def test_delete_user_not_found(user_service, mock_user_repository):
         user_service.delete_user("nonexistent@example.com")
 
 
-def test_update_password_success(user_service, mock_user_repository, test_user):
+def test_update_password_success(user_service, mock_user_repository, test_user, hasher):
     """Test successful password update."""
     mock_user_repository.get_user_by_email.return_value = test_user
-    mock_user_repository.save_user.return_value = test_user
+    mock_user_repository.update_user.return_value = test_user
     
     user_update = UserUpdate(email="test@example.com", new_password="newpassword123")
     result = user_service.update_user_pwd(user_update)
     
-    assert result.password == "newpassword123"
+    assert hasher.verify("newpassword123", result.password)
     mock_user_repository.get_user_by_email.assert_called_once_with("test@example.com")
-    mock_user_repository.save_user.assert_called_once()
+    mock_user_repository.update_user.assert_called_once()
 
 
 def test_update_password_user_not_found(user_service, mock_user_repository):
@@ -109,3 +174,112 @@ def test_update_password_user_not_found(user_service, mock_user_repository):
     
     with pytest.raises(ValueError, match="User not Found."):
         user_service.update_user_pwd(user_update)
+
+
+def test_bulk_register(user_service, mock_user_repository, test_user):
+    """Test that bulk registration skips existing and duplicate rows and saves once."""
+    mock_user_repository.get_user_by_email.side_effect = lambda email: test_user if email == test_user.email else None
+    mock_user_repository.create_users.return_value = [None]
+    new_user = User(email="new@example.com", password="pw", username="NewUser")
+
+    errors = user_service.bulk_register([test_user, new_user, new_user])
+
+    assert errors == ["User already Exists.", None, "User already Exists."]
+    mock_user_repository.create_users.assert_called_once()
+    saved = mock_user_repository.create_users.call_args.args[0]
+    assert [u.email for u in saved] == [new_user.email]
+    assert saved[0].password != new_user.password
+
+
+def test_bulk_delete(user_service, mock_user_repository, test_user):
+    """Test that bulk deletion reports missing users and deletes once."""
+    mock_user_repository.get_user_by_email.side_effect = lambda email: test_user if email == test_user.email else None
+
+    errors = user_service.bulk_delete([test_user.email, "nonexistent@example.com"])
+
+    assert errors == [None, "User not Found."]
+    mock_user_repository.delete_users.assert_called_once_with([test_user])
+
+
+def test_session_roundtrip(user_service, mock_user_repository, test_user):
+    """Test that a session token resolves without a repository lookup."""
+    token = user_service.create_session(test_user)
+
+    user = user_service.get_session_user(token)
+
+    assert user.email == test_user.email
+    mock_user_repository.get_user_by_email.assert_not_called()
+
+
+def test_password_update_revokes_sessions(user_service, mock_user_repository, test_user):
+    """Test that changing the password invalidates existing sessions."""
+    token = user_service.create_session(test_user)
+    mock_user_repository.get_user_by_email.return_value = test_user
+
+    user_service.update_user_pwd(UserUpdate(email="test@example.com", new_password="newpassword123"))
+
+    with pytest.raises(ValueError, match="Invalid Session."):
+        user_service.get_session_user(token)
+
+
+def test_delete_revokes_sessions(user_service, mock_user_repository, test_user):
+    """Test that deleting the user invalidates existing sessions."""
+    token = user_service.create_session(test_user)
+    mock_user_repository.get_user_by_email.return_value = test_user
+    mock_user_repository.delete_user.return_value = test_user
+
+    user_service.delete_user(test_user.email)
+
+    with pytest.raises(ValueError, match="Invalid Session."):
+        user_service.get_session_user(token)
+
+
+def test_register_duplicate_username(user_service, mock_user_repository, test_user):
+    """Test that registration rejects a username that is already taken."""
+    mock_user_repository.get_user_by_email.return_value = None
+    mock_user_repository.username_exists.return_value = True
+
+    with pytest.raises(ValueError, match="Username already Exists."):
+        user_service.register_user(test_user)
+    mock_user_repository.create_user.assert_not_called()
+
+
+def test_register_race_lost_in_repository(user_service, mock_user_repository, test_user):
+    """Test that a registration rejected by the repository writer surfaces as a ValueError."""
+    mock_user_repository.get_user_by_email.return_value = None
+    mock_user_repository.create_user.side_effect = ValueError("User already Exists.")
+
+    with pytest.raises(ValueError, match="User already Exists."):
+        user_service.register_user(test_user)
+
+
+def test_bulk_register_race_lost_in_repository(user_service, mock_user_repository):
+    """Test that rows rejected by the repository writer keep their error in the result."""
+    mock_user_repository.get_user_by_email.return_value = None
+    mock_user_repository.create_users.return_value = ["User already Exists.", None]
+    users = [User(email=f"user{i}@example.com", password="pw", username=f"user{i}") for i in range(2)]
+
+    assert user_service.bulk_register(users) == ["User already Exists.", None]
+
+
+def test_list_users_cursor(user_service, mock_user_repository):
+    """Test that a full page returns a cursor for the last user and reads one extra row."""
+    users = [User(email=f"user{i}@example.com", password="pw", username=f"user{i}") for i in range(3)]
+    mock_user_repository.list_users.return_value = users
+
+    page = user_service.list_users("user", "username", None, 2)
+
+    mock_user_repository.list_users.assert_called_once_with("user", "username", None, 3)
+    assert [u.email for u in page.users] == ["user0@example.com", "user1@example.com"]
+    assert not hasattr(page.users[0], "password")
+
+    user_service.list_users("user", "username", page.next_cursor, 2)
+    assert mock_user_repository.list_users.call_args.args[2] == ("user1", "user1@example.com")
+
+
+def test_list_users_invalid_cursor(user_service):
+    """Test that malformed cursors and unknown fields are rejected."""
+    with pytest.raises(ValueError, match="Invalid Cursor."):
+        user_service.list_users(cursor="not-a-cursor")
+    with pytest.raises(ValueError, match="Invalid Sort Field."):
+        user_service.list_users(by="password")
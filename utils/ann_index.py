@@ -0,0 +1,186 @@
+# utils/ann_index.py
+import json
+import os
+import shutil
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.inverted_index import tokenize
+
+META_FILE = "meta.json"
+VOCABULARY_FILE = "vocabulary.json"
+ARRAYS = ("data", "indices", "indptr", "idf", "posting_ptr", "posting_rows")
+
+
+class SparseRows:
+    """CSR 행렬 (data, indices, indptr). memmap 배열을 그대로 들고 필요한 행만 읽는다."""
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, width: int) -> None:
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.width = width
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return np.asarray(self.indices[start:end]), np.asarray(self.data[start:end])
+
+    def dot(self, rows: np.ndarray, dense: np.ndarray) -> np.ndarray:
+        """rows 행들과 dense 벡터의 내적 (L2 정규화된 벡터끼리면 코사인 유사도). 해당 행의 값만 읽는다."""
+        starts = np.asarray(self.indptr[rows], dtype=np.int64)
+        lengths = np.asarray(self.indptr[rows + 1], dtype=np.int64) - starts
+        # 후보 행들의 [start, end) 구간을 이어 붙인 위치 배열
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        values = self.data[positions] * dense[self.indices[positions]]
+        return np.bincount(np.repeat(np.arange(len(rows)), lengths), weights=values, minlength=len(rows)).astype(np.float32)
+
+
+def impact_postings(vectors: SparseRows, max_postings: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    term마다 가중치가 큰 문서부터 정렬한 posting list를 만들고 앞의 max_postings 개만 남긴다.
+    term t의 문서들은 posting_rows[posting_ptr[t]:posting_ptr[t + 1]] 이다.
+    """
+    rows = np.repeat(np.arange(len(vectors), dtype=np.int64), np.diff(vectors.indptr))
+    terms = np.asarray(vectors.indices)
+    order = np.lexsort((-np.asarray(vectors.data), terms))
+    counts = np.bincount(terms, minlength=vectors.width)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(len(order)) - starts[terms[order]]
+    keep = order[rank < max_postings]
+    posting_ptr = np.concatenate([[0], np.cumsum(np.minimum(counts, max_postings))]).astype(np.int64)
+    return posting_ptr, rows[keep].astype(np.int32)
+
+
+class SparseANNIndex:
+    """
+    L2 정규화된 sparse TF-IDF 벡터의 근사 최근접 이웃(코사인) 색인.
+
+    - 오프라인에서 term -> (가중치 내림차순) 문서 posting list를 만들고 term마다 상위 max_postings 개만 남긴다.
+    - 질의는 질의 벡터에서 가중치가 큰 query_terms 개 term의 posting list만 합쳐 후보를 만들고,
+      후보만 실제 코사인 유사도로 다시 정렬한다. 공통 term이 없는 문서는 코사인이 0이라 후보에서 빠져도 손해가 없다.
+    - 모든 배열은 .npy로 저장하고 mmap_mode="r"로 열어서, 시작할 때 전체를 읽지 않는다.
+    - 저장 후에 append()로 들어온 벡터는 메모리의 delta 행/posting list에 따로 쌓는다 (어휘/idf는 고정, save 대상 아님).
+    """
+    def __init__(self, vocabulary: Sequence[str], idf: np.ndarray, vectors: SparseRows,
+                 posting_ptr: np.ndarray, posting_rows: np.ndarray, meta: dict) -> None:
+        self.vocabulary = list(vocabulary)
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.vocabulary)}
+        self.idf = idf
+        self.vectors = vectors
+        self.posting_ptr = posting_ptr
+        self.posting_rows = posting_rows
+        self.max_postings = meta["max_postings"]
+        self.fingerprint = meta.get("fingerprint", "")
+        self.delta_rows: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.delta_postings: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.vectors) + len(self.delta_rows)
+
+    def row(self, doc: int) -> Tuple[np.ndarray, np.ndarray]:
+        base = len(self.vectors)
+        return self.vectors.row(doc) if doc < base else self.delta_rows[doc - base]
+
+    def append(self, indices: np.ndarray, data: np.ndarray) -> int:
+        """transform()한 벡터를 다음 문서 id로 추가하고 그 id를 돌려준다. 비용은 벡터의 term 수에만 비례한다."""
+        doc = len(self)
+        self.delta_rows.append((indices, data))
+        for term in indices.tolist():
+            self.delta_postings.setdefault(term, []).append(doc)
+        return doc
+
+    @classmethod
+    def build(cls, vocabulary: Sequence[str], idf: np.ndarray, vectors: SparseRows, max_postings: int = 1000,
+              fingerprint: str = "") -> "SparseANNIndex":
+        posting_ptr, posting_rows = impact_postings(vectors, max_postings)
+        meta = {"max_postings": max_postings, "fingerprint": fingerprint}
+        return cls(vocabulary, idf, vectors, posting_ptr, posting_rows, meta)
+
+    @classmethod
+    def fit(cls, documents: Sequence[str], max_features: int = 20000, **kwargs) -> "SparseANNIndex":
+        """documents 전체에 TF-IDF를 하나로 학습해서 (출처와 상관없이 같은 공간) 색인을 만든다."""
+        from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore  # 오프라인 빌드에서만 필요
+
+        vectorizer = TfidfVectorizer(max_features=max_features, token_pattern=r"(?u)\b\w\w+\b", dtype=np.float32)
+        matrix = vectorizer.fit_transform(documents).tocsr()
+        matrix.sort_indices()
+        vectors = SparseRows(matrix.data, matrix.indices.astype(np.int32), matrix.indptr.astype(np.int64), matrix.shape[1])
+        return cls.build(vectorizer.get_feature_names_out().tolist(), vectorizer.idf_.astype(np.float32), vectors, **kwargs)
+
+    def transform(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """학습된 어휘/idf로 새 문서를 TfidfVectorizer와 같은 방식(tf * idf, L2 정규화)의 sparse 벡터로 바꾼다."""
+        counts: Dict[int, int] = {}
+        for token in tokenize(text):
+            i = self.term_ids.get(token)
+            if i is not None:
+                counts[i] = counts.get(i, 0) + 1
+        indices = np.array(sorted(counts), dtype=np.int32)
+        data = np.array([counts[i] for i in indices], dtype=np.float32) * self.idf[indices]
+        norm = np.linalg.norm(data)
+        return indices, (data / norm if norm else data)
+
+    def candidates(self, indices: np.ndarray, data: np.ndarray, query_terms: int = 32) -> np.ndarray:
+        top_terms = indices[np.argsort(-data, kind="stable")[:query_terms]]
+        found = [np.asarray(self.posting_rows[self.posting_ptr[t]:self.posting_ptr[t + 1]]) for t in top_terms]
+        found.extend(np.array(self.delta_postings[t], dtype=np.int32) for t in top_terms.tolist() if t in self.delta_postings)
+        return np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int32)
+
+    def query_vector(self, indices: np.ndarray, data: np.ndarray, k: int = 10, query_terms: int = 32,
+                     exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        candidates = self.candidates(indices, data, query_terms)
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        if not len(candidates):
+            return []
+        dense = np.zeros(self.vectors.width, dtype=np.float32)
+        dense[indices] = data
+        base = candidates < len(self.vectors)
+        scores = np.zeros(len(candidates), dtype=np.float32)
+        scores[base] = self.vectors.dot(candidates[base], dense)
+        for i in np.flatnonzero(~base):
+            row_indices, row_data = self.row(int(candidates[i]))
+            scores[i] = float(np.dot(row_data, dense[row_indices]))
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [(int(candidates[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def query(self, doc: int, k: int = 10, query_terms: int = 32) -> List[Tuple[int, float]]:
+        """색인된 문서 doc과 가장 비슷한 문서 (자기 자신 제외) 최대 k 개 (doc id, cosine)."""
+        indices, data = self.row(doc)
+        return self.query_vector(indices, data, k, query_terms, exclude=doc)
+
+    def save(self, directory: str) -> None:
+        """임시 디렉토리에 모두 쓴 뒤 통째로 교체한다. delta 행은 저장하지 않는다."""
+        tmp_dir = f"{directory}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        arrays = {
+            "data": self.vectors.data, "indices": self.vectors.indices, "indptr": self.vectors.indptr,
+            "idf": self.idf, "posting_ptr": self.posting_ptr, "posting_rows": self.posting_rows,
+        }
+        for name in ARRAYS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(arrays[name]))
+        with open(os.path.join(tmp_dir, VOCABULARY_FILE), "w", encoding="utf-8") as f:
+            json.dump(self.vocabulary, f, ensure_ascii=False)
+        with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+            json.dump({"max_postings": self.max_postings, "fingerprint": self.fingerprint,
+                       "size": len(self.vectors), "width": self.vectors.width}, f)
+        old_dir = f"{directory}.old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(directory):
+            os.rename(directory, old_dir)
+        os.rename(tmp_dir, directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "SparseANNIndex":
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode) for name in ARRAYS}
+        with open(os.path.join(directory, VOCABULARY_FILE), encoding="utf-8") as f:
+            vocabulary = json.load(f)
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        vectors = SparseRows(arrays["data"], arrays["indices"], arrays["indptr"], meta["width"])
+        return cls(vocabulary, arrays["idf"], vectors, arrays["posting_ptr"], arrays["posting_rows"], meta)
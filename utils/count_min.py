@@ -0,0 +1,112 @@
+# utils/count_min.py
+import hashlib
+import heapq
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+
+def term_hashes(terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """term마다 64비트 해시 두 개. 파이썬 hash()는 프로세스마다 바뀌므로 blake2b를 써서 스냅샷을 다시 열어도 같게 한다."""
+    digests = b"".join(hashlib.blake2b(term.encode("utf-8"), digest_size=16).digest() for term in terms)
+    pairs = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+    # 두 번째 해시는 홀수로 만들어서 행마다 다른 칸을 고르게 한다 (double hashing)
+    return pairs[:, 0], pairs[:, 1] | np.uint64(1)
+
+
+def sketch_columns(terms: List[str], width: int, depth: int) -> np.ndarray:
+    """term마다 행별로 고르는 칸 번호 (depth x len(terms)). width/depth가 같은 sketch끼리는 같다."""
+    h1, h2 = term_hashes(terms)
+    rows = np.arange(depth, dtype=np.uint64)[:, None]
+    return ((h1[None, :] + rows * h2[None, :]) % np.uint64(width)).astype(np.int64)
+
+
+class CountMinSketch:
+    """
+    depth x width 카운터 표로 term 빈도를 근사하는 Count-Min sketch.
+
+    - 크기는 고정이라 들어온 term 수와 상관없이 메모리가 depth * width * 4 바이트다.
+    - 추정값은 실제 빈도보다 작지 않고, 전체 합이 N이면 확률 1 - e^-depth 로 실제 + e * N / width 이하다.
+    - conservative update: 칸마다 무조건 더하지 않고 (지금 추정값 + 더할 값)까지만 올려서 과대 추정을 줄인다.
+    """
+    def __init__(self, width: int = 2048, depth: int = 4, table: Optional[np.ndarray] = None) -> None:
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.uint32)
+
+    def columns(self, terms: List[str]) -> np.ndarray:
+        return sketch_columns(terms, self.width, self.depth)
+
+    def add(self, terms: Union[Iterable[str], Mapping[str, int]],
+            columns: Optional[np.ndarray] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        terms를 센다 (같은 term이 여러 번 있으면 그만큼, {term: 횟수}도 받는다).
+        columns는 서로 다른 term 순서대로 미리 계산한 칸 번호 (여러 sketch에 같은 term을 넣을 때 해시를 한 번만 하려고).
+        서로 다른 term 목록과 더한 뒤의 추정값을 돌려준다.
+        """
+        counter = terms if isinstance(terms, Mapping) else Counter(terms)
+        unique = list(counter)
+        if columns is None:
+            columns = self.columns(unique)
+        rows = np.arange(self.depth)[:, None]
+        target = self.table[rows, columns].min(axis=0) + np.fromiter(counter.values(), np.uint32, len(unique))
+        for row in range(self.depth):
+            # 같은 칸에 걸린 term이 여럿이면 그중 가장 큰 값으로 올린다
+            np.maximum.at(self.table[row], columns[row], target)
+        return unique, self.table[rows, columns].min(axis=0)
+
+    def estimate(self, terms: List[str]) -> np.ndarray:
+        if not terms:
+            return np.zeros(0, dtype=np.uint32)
+        columns = self.columns(terms)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+
+class HeavyHitters:
+    """
+    Count-Min sketch + 상위 k개 term의 min-heap. 메모리는 sketch 크기 + k 개 term으로 고정이다.
+
+    heap은 (추정값, term)을 지연 삭제 방식으로 들고 있어서, 항목이 2k 개를 넘으면 top에서 다시 만든다.
+    """
+    def __init__(self, k: int = 100, width: int = 2048, depth: int = 4, sketch: Optional[CountMinSketch] = None,
+                 top: Optional[Dict[str, int]] = None) -> None:
+        self.k = k
+        self.sketch = sketch if sketch is not None else CountMinSketch(width, depth)
+        self.top: Dict[str, int] = dict(top or {})
+        self._heap: List[Tuple[int, str]] = []
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, term) for term, count in self.top.items()]
+        heapq.heapify(self._heap)
+
+    def _minimum(self) -> Tuple[int, str]:
+        # 값이 바뀌었거나 이미 빠진 term의 오래된 항목은 버린다
+        while self._heap and self.top.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def add(self, terms: Union[Iterable[str], Mapping[str, int]], columns: Optional[np.ndarray] = None) -> None:
+        unique, estimates = self.sketch.add(terms, columns)
+        if not unique:
+            return
+        if len(self.top) >= self.k:
+            # heap의 최솟값은 줄어들지 않으므로 그보다 크지 않은 term은 미리 걸러 낸다.
+            # 이번에 센 top term은 추정값이 이전 값보다 커졌으므로 걸러지지 않는다
+            keep = np.flatnonzero(estimates > self._minimum()[0]).tolist()
+            unique, estimates = [unique[i] for i in keep], estimates[keep]
+        for term, count in zip(unique, estimates.tolist()):
+            if term in self.top or len(self.top) < self.k:
+                self.top[term] = count
+                heapq.heappush(self._heap, (count, term))
+            elif count > self._minimum()[0]:
+                del self.top[self._minimum()[1]]
+                self.top[term] = count
+                heapq.heappush(self._heap, (count, term))
+        if len(self._heap) > 2 * self.k:
+            self._rebuild_heap()
+
+    def most_common(self, k: Optional[int] = None) -> List[Tuple[str, int]]:
+        """추정 빈도가 큰 term부터 (term, 추정 빈도). 같은 빈도는 term 순서."""
+        return sorted(self.top.items(), key=lambda item: (-item[1], item[0]))[:k]
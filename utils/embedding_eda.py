@@ -1,24 +1,27 @@
 # utils/embedding_eda.py
-import matplotlib.pyplot as plt
-
-for f in ["AppleGothic", "NanumGothic", "Malgun Gothic"]:
-    try:
-        plt.rcParams["font.family"] = f
-        break
-    except Exception:
-        pass
-plt.rcParams["axes.unicode_minus"] = False
-
 import argparse
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
-from sklearn.metrics.pairwise import cosine_similarity
+
+
+@lru_cache(maxsize=None)
+def pyplot():
+    # matplotlib은 import와 폰트 탐색이 무거워서, 처음 그림을 그릴 때 한 번만 불러오고 한글 폰트를 고른다
+    import matplotlib.pyplot as plt
+
+    for f in ["AppleGothic", "NanumGothic", "Malgun Gothic"]:
+        try:
+            plt.rcParams["font.family"] = f
+            break
+        except Exception:
+            pass
+    plt.rcParams["axes.unicode_minus"] = False
+    return plt
 
 
 def safe_name(path: str) -> str:
@@ -49,6 +52,7 @@ def top_terms(df: pd.DataFrame, k: int = 20):
 
 
 def plot_bar(series: pd.Series, title: str, out_path: str, xlabel: str):
+    plt = pyplot()
     plt.figure(figsize=(10, 5))
     series.sort_values(ascending=True).plot(kind="barh")
     plt.title(title)
@@ -66,9 +70,12 @@ def pca_scatter(df: pd.DataFrame, title: str, out_path: str, max_rows: int = 200
         idx = np.random.choice(X.shape[0], max_rows, replace=False)
         X = X[idx]
 
+    from sklearn.decomposition import PCA
+
     pca = PCA(n_components=2, random_state=42)
     Z = pca.fit_transform(X)
 
+    plt = pyplot()
     plt.figure(figsize=(7, 6))
     plt.scatter(Z[:, 0], Z[:, 1], s=10)
     plt.title(f"{title}\nPCA 2D (explained var: {pca.explained_variance_ratio_.sum():.2f})")
@@ -0,0 +1,281 @@
+# utils/inverted_index.py
+import heapq
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 전처리의 TfidfVectorizer 기본 토크나이저와 같은 규칙 (소문자 + 2글자 이상 단어)
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# BM25 파라미터
+K1 = 1.2
+B = 0.75
+
+# skip pointer 간격: posting list를 이 개수씩 블록으로 나눠 블록마다 시작 위치와 최대 doc id를 적어 둔다
+BLOCK_SIZE = 128
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_postings(postings: Iterable[Tuple[int, int]], base: int = 0) -> bytes:
+    """(doc id 오름차순, tf) 목록을 doc id 차이값 + tf 의 varint 바이트열로 압축한다. 첫 차이값은 base에서 잰다."""
+    out = bytearray()
+    prev = base
+    for doc, tf in postings:
+        _write_varint(out, doc - prev)
+        _write_varint(out, tf)
+        prev = doc
+    return bytes(out)
+
+
+def decode_postings(data: bytes, base: int = 0) -> Tuple[List[int], List[int]]:
+    docs: List[int] = []
+    tfs: List[int] = []
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value)
+        value = shift = 0
+    doc = base
+    for i in range(0, len(values), 2):
+        doc += values[i]
+        docs.append(doc)
+        tfs.append(values[i + 1])
+    return docs, tfs
+
+
+def _match(docs: np.ndarray, out: np.ndarray, posting_docs: List[int], posting_tfs: List[int]) -> None:
+    """오름차순 docs 중 posting list에 있는 doc의 tf를 out(같은 길이의 view)에 쓴다."""
+    posting_docs = np.asarray(posting_docs, dtype=np.int64)
+    at = np.minimum(np.searchsorted(posting_docs, docs), len(posting_docs) - 1)
+    hit = posting_docs[at] == docs
+    out[hit] = np.asarray(posting_tfs, dtype=np.int64)[at[hit]]
+
+
+class InvertedIndex:
+    """
+    term -> 압축된 posting list (doc id, tf) 역색인과 BM25 검색.
+
+    posting list들은 하나의 바이트 배열(blob)에 이어 붙여 두고 term i의 posting list는 blob[offsets[i]:offsets[i + 1]] 구간이다.
+    posting list는 BLOCK_SIZE 개씩 블록으로 나뉘고, term i의 블록은 term_blocks[i]:term_blocks[i + 1] 이다.
+    블록 j는 blob[block_offsets[j]:block_offsets[j + 1]] 이고 최대 doc id가 block_max[j] 이다 (skip pointer).
+    질의는 문서 빈도가 가장 작은 term의 posting list만 모두 풀고, 나머지 term은 후보 doc id가 들어 있는
+    블록만 block_max에서 searchsorted로 찾아서 푼다. 후보가 없는 블록은 건너뛴다.
+    저장 후에 add()로 들어온 문서는 압축하지 않은 delta posting list에 따로 쌓고, 질의할 때 합친다.
+    """
+    def __init__(self, terms: Sequence[str], offsets: np.ndarray, doc_freq: np.ndarray, blob: bytes,
+                 doc_len: np.ndarray, term_blocks: np.ndarray, block_offsets: np.ndarray, block_max: np.ndarray,
+                 fingerprint: str = "") -> None:
+        self.terms = list(terms)
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.terms)}
+        self.offsets = offsets
+        self.doc_freq = doc_freq
+        self.blob = blob
+        self.term_blocks = term_blocks
+        self.block_offsets = block_offsets
+        self.block_max = block_max
+        self.doc_len = doc_len
+        self.fingerprint = fingerprint
+        self.total_len = int(doc_len.sum())
+        self.delta: Dict[str, List[Tuple[int, int]]] = {}
+        self.delta_len: List[int] = []
+
+    @classmethod
+    def build(cls, documents: Iterable[str], fingerprint: str = "") -> "InvertedIndex":
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_len = []
+        for doc, text in enumerate(documents):
+            tokens = tokenize(text)
+            doc_len.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        terms = sorted(postings)
+        blob = bytearray()
+        offsets = [0]
+        term_blocks = [0]
+        block_offsets: List[int] = []
+        block_max: List[int] = []
+        for term in terms:
+            plist = postings[term]
+            # 블록마다 따로 압축해도 차이값은 이전 블록의 마지막 doc id에서 이어지므로 바이트열은 통째로 압축한 것과 같다
+            prev = 0
+            for start in range(0, len(plist), BLOCK_SIZE):
+                block = plist[start:start + BLOCK_SIZE]
+                block_offsets.append(len(blob))
+                blob += encode_postings(block, prev)
+                prev = block[-1][0]
+                block_max.append(prev)
+            offsets.append(len(blob))
+            term_blocks.append(len(block_offsets))
+        # 마지막 블록의 끝
+        block_offsets.append(len(blob))
+        return cls(
+            terms,
+            np.array(offsets, dtype=np.int64),
+            np.array([len(postings[term]) for term in terms], dtype=np.int32),
+            bytes(blob),
+            np.array(doc_len, dtype=np.int32),
+            np.array(term_blocks, dtype=np.int64),
+            np.array(block_offsets, dtype=np.int64),
+            np.array(block_max, dtype=np.int64),
+            fingerprint,
+        )
+
+    def __len__(self) -> int:
+        return len(self.doc_len) + len(self.delta_len)
+
+    def add(self, documents: Iterable[str]) -> None:
+        """새 문서를 id len(self), len(self) + 1, ... 로 추가한다. 비용은 추가하는 문서 수에만 비례한다."""
+        for text in documents:
+            doc = len(self)
+            tokens = tokenize(text)
+            self.delta_len.append(len(tokens))
+            self.total_len += len(tokens)
+            for term, tf in Counter(tokens).items():
+                self.delta.setdefault(term, []).append((doc, tf))
+
+    def document_frequency(self, term: str) -> int:
+        i = self.term_ids.get(term)
+        return (0 if i is None else int(self.doc_freq[i])) + len(self.delta.get(term, ()))
+
+    def document_length(self, doc: int) -> int:
+        base = len(self.doc_len)
+        return int(self.doc_len[doc]) if doc < base else self.delta_len[doc - base]
+
+    def _document_lengths(self, docs: np.ndarray) -> np.ndarray:
+        base = len(self.doc_len)
+        lengths = self.doc_len[np.minimum(docs, base - 1)] if base else np.zeros(len(docs), np.int32)
+        if len(docs) and docs[-1] >= base:
+            # 후보는 오름차순이므로 add()로 들어온 문서는 뒤쪽에 몰려 있다
+            start = int(np.searchsorted(docs, base))
+            lengths = lengths.astype(np.int64)
+            lengths[start:] = [self.delta_len[doc - base] for doc in docs[start:].tolist()]
+        return lengths
+
+    def postings(self, term: str) -> Tuple[List[int], List[int]]:
+        i = self.term_ids.get(term)
+        docs, tfs = ([], []) if i is None else decode_postings(self.blob[self.offsets[i]:self.offsets[i + 1]])
+        for doc, tf in self.delta.get(term, ()):
+            docs.append(doc)
+            tfs.append(tf)
+        return docs, tfs
+
+    def lookup(self, term: str, docs: np.ndarray) -> np.ndarray:
+        """
+        오름차순 doc id 배열 docs 각각에서 term의 tf (없으면 0).
+        후보가 들어 있는 블록만 풀고, 나머지 블록은 block_max만 보고 건너뛴다.
+        """
+        tfs = np.zeros(len(docs), dtype=np.int64)
+        i = self.term_ids.get(term)
+        if i is not None and len(docs):
+            first, last = int(self.term_blocks[i]), int(self.term_blocks[i + 1])
+            # 후보마다 최대 doc id가 그 후보 이상인 첫 블록 (last - first 이면 이 term의 마지막 doc보다 뒤)
+            blocks = np.searchsorted(self.block_max[first:last], docs)
+            starts = np.r_[0, np.flatnonzero(np.diff(blocks)) + 1]
+            if 2 * len(starts) > last - first:
+                # 후보가 블록 대부분에 흩어져 있으면 블록마다 나눠 푸는 것보다 한 번에 푸는 편이 싸다
+                _match(docs, tfs, *decode_postings(self.blob[self.offsets[i]:self.offsets[i + 1]]))
+            else:
+                for start, end in zip(starts.tolist(), np.r_[starts[1:], len(docs)].tolist()):
+                    b = int(blocks[start])
+                    if b == last - first:
+                        break
+                    j = first + b
+                    base = int(self.block_max[j - 1]) if b else 0
+                    _match(docs[start:end], tfs[start:end],
+                           *decode_postings(self.blob[self.block_offsets[j]:self.block_offsets[j + 1]], base))
+        delta = self.delta.get(term)
+        if delta and len(docs) and docs[-1] >= delta[0][0]:
+            start = int(np.searchsorted(docs, delta[0][0]))
+            found = dict(delta)
+            tfs[start:] = [found.get(doc, 0) for doc in docs[start:].tolist()]
+        return tfs
+
+    def search(self, query: str, k: int = 10, allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        query의 모든 term을 포함하는 문서를 BM25 점수 순으로 최대 k 개 (doc id, score) 돌려준다.
+        allowed(bool 비트맵)가 주어지면 그 문서만 남긴다.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or any(term not in self.term_ids and term not in self.delta for term in terms):
+            return []
+        # 짧은 posting list부터 교집합하면 후보가 빨리 줄어든다
+        terms.sort(key=self.document_frequency)
+        n = len(self)
+        avg_len = self.total_len / n
+        candidates: Optional[np.ndarray] = None
+        scores = np.zeros(0)
+        for term in terms:
+            df = self.document_frequency(term)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            if candidates is None:
+                # 가장 짧은 posting list만 모두 푼다
+                docs, tfs = self.postings(term)
+                candidates, tf = np.asarray(docs, dtype=np.int64), np.asarray(tfs, dtype=np.int64)
+                if allowed is not None:
+                    keep = allowed[candidates]
+                    candidates, tf = candidates[keep], tf[keep]
+                scores = np.zeros(len(candidates))
+            else:
+                tf = self.lookup(term, candidates)
+                keep = tf > 0
+                candidates, tf, scores = candidates[keep], tf[keep], scores[keep]
+            if not len(candidates):
+                return []
+            norm = tf + K1 * (1 - B + B * self._document_lengths(candidates) / avg_len)
+            scores = scores + idf * tf * (K1 + 1) / norm
+        top = heapq.nlargest(k, zip(candidates.tolist(), scores.tolist()), key=lambda item: (item[1], -item[0]))
+        return [(doc, float(score)) for doc, score in top]
+
+    def save(self, path: str) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 바꿔서 읽는 쪽이 반쯤 쓴 파일을 보지 않게 한다."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                # 고정 폭 유니코드 배열은 가장 긴 term 기준으로 칸을 잡으므로 줄바꿈으로 이은 UTF-8로 저장
+                terms=np.frombuffer("\n".join(self.terms).encode("utf-8"), dtype=np.uint8),
+                offsets=self.offsets,
+                doc_freq=self.doc_freq,
+                blob=np.frombuffer(self.blob, dtype=np.uint8),
+                doc_len=self.doc_len,
+                term_blocks=self.term_blocks,
+                block_offsets=self.block_offsets,
+                block_max=self.block_max,
+                fingerprint=np.array(self.fingerprint),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["terms"].tobytes().decode("utf-8").split("\n") if data["terms"].size else [],
+                data["offsets"],
+                data["doc_freq"],
+                data["blob"].tobytes(),
+                data["doc_len"],
+                # skip pointer가 없는 예전 파일이면 KeyError (읽는 쪽이 다시 만든다)
+                data["term_blocks"],
+                data["block_offsets"],
+                data["block_max"],
+                str(data["fingerprint"]),
+            )